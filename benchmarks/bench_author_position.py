@@ -0,0 +1,47 @@
+"""Benchmark author position detection on consortium-sized author lists.
+
+Compares the first/last fast path with the full author-list scan on a
+PubmedArticle with 5,000 authors.
+
+Usage:
+    python benchmarks/bench_author_position.py
+"""
+
+import timeit
+import xml.etree.ElementTree as ET
+
+from uindex.names import AuthorNameMatcher
+from uindex.pubmed import PubMedClient
+
+
+NUM_AUTHORS = 5000
+REPEAT = 200
+
+
+def build_article(num_authors: int) -> ET.Element:
+    """Build an Article element with ``num_authors`` authors."""
+    authors = "".join(
+        f"<Author><LastName>Member{i}</LastName><ForeName>Consortium</ForeName></Author>"
+        for i in range(num_authors)
+    )
+    return ET.fromstring(f"<Article><AuthorList>{authors}</AuthorList></Article>")
+
+
+def main():
+    article = build_article(NUM_AUTHORS)
+    client = PubMedClient()
+    # Worst case for the full scan: the queried author is not on the paper
+    matcher = AuthorNameMatcher("Outsider Someone")
+
+    for label, classify_middle in [("first/last only", False), ("full scan", True)]:
+        seconds = timeit.timeit(
+            lambda: client._get_author_position(article, matcher, classify_middle),
+            number=REPEAT,
+        )
+        print(f"{label:>16}: {seconds / REPEAT * 1e6:10.1f} us per article ({NUM_AUTHORS} authors)")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
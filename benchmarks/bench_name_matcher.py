@@ -0,0 +1,71 @@
+"""Benchmark the precompiled author name matcher against per-article matching.
+
+The legacy logic re-lowercases and re-splits the queried name for every
+article and uses substring checks; the matcher is built once per query.
+
+Usage:
+    python benchmarks/bench_name_matcher.py
+"""
+
+import timeit
+import xml.etree.ElementTree as ET
+
+from uindex.names import AuthorNameMatcher
+
+
+NUM_ARTICLES = 2000
+AUTHORS_PER_ARTICLE = 12
+QUERY = "Smith John"
+
+
+def build_articles() -> list[ET.Element]:
+    """Build articles where the queried author is the last of several authors."""
+    articles = []
+    for n in range(NUM_ARTICLES):
+        authors = "".join(
+            f"<Author><LastName>Author{n}x{i}</LastName><ForeName>Jane</ForeName></Author>"
+            for i in range(AUTHORS_PER_ARTICLE - 1)
+        )
+        authors += "<Author><LastName>Smith</LastName><ForeName>John</ForeName></Author>"
+        articles.append(ET.fromstring(f"<Article><AuthorList>{authors}</AuthorList></Article>"))
+    return articles
+
+
+def legacy_match_all(articles: list[ET.Element], author_name: str) -> int:
+    """Per-article matching as done before the matcher existed."""
+    found = 0
+    for article in articles:
+        name_parts = author_name.lower().split()
+        for author in article.find("AuthorList"):
+            last_name = (author.findtext("LastName") or "").lower()
+            fore_name = (author.findtext("ForeName") or "").lower()
+            if all(part in f"{last_name} {fore_name}" for part in name_parts):
+                found += 1
+                break
+    return found
+
+
+def matcher_match_all(articles: list[ET.Element], author_name: str) -> int:
+    """Matching with one AuthorNameMatcher reused across articles."""
+    matcher = AuthorNameMatcher(author_name)
+    found = 0
+    for article in articles:
+        for author in article.find("AuthorList"):
+            if matcher.matches_element(author):
+                found += 1
+                break
+    return found
+
+
+def main():
+    articles = build_articles()
+    assert legacy_match_all(articles, QUERY) == matcher_match_all(articles, QUERY) == NUM_ARTICLES
+
+    for label, fn in [("per-article", legacy_match_all), ("matcher", matcher_match_all)]:
+        seconds = min(timeit.repeat(lambda: fn(articles, QUERY), number=1, repeat=5))
+        print(f"{label:>12}: {seconds * 1e3:8.1f} ms for {NUM_ARTICLES} articles "
+              f"x {AUTHORS_PER_ARTICLE} authors")
+
+
+if __name__ == "__main__":
+    main()
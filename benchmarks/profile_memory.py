@@ -0,0 +1,226 @@
+"""Profile memory of the fetch-and-parse pipeline per phase.
+
+Records the PubMed and OpenAlex responses for a prolific synthetic author
+(960 papers, consortium author lists of up to 3,000 names) from the
+local stand-in to a cassette (see :mod:`uindex.cassette`), then replays it
+in-process while tracing allocations with tracemalloc, so only the client
+side is measured; ``--cassette`` keeps the recording between runs. Two
+flows are run:
+
+* ``PubMedClient.fetch_author_papers`` alone
+* the ``uindex`` CLI (``cli.main``) end to end, uncached
+
+For every phase (esearch, efetch and parsing, OpenAlex lookups, report) the
+harness prints the number of calls, the peak traced memory above the
+phase's starting point and the memory still held when the phase returns. With ``--rss`` a sampling thread also records peak
+resident set size per phase; pass ``--no-trace`` with it, since tracemalloc's
+own bookkeeping inflates RSS.
+
+Usage:
+    python benchmarks/profile_memory.py [--cassette PATH] [--rss [--no-trace]]
+"""
+
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import click
+import httpx
+from click.testing import CliRunner
+
+from uindex import api, cli
+from uindex.cassette import CassetteTransport
+from uindex.corpus import SyntheticCorpus
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from uindex.standin import StandInServer
+from uindex.transport import build_transport
+
+
+PROFILE = {
+    "name": "Dr. Prolific",
+    "h": 120,
+    "u": 60,
+    "years": 40,
+    "h_base_rate": 6,
+    "collab_bonus": 6,
+}  # 960 papers, within the single esearch page of 1,000 PMIDs
+RSS_INTERVAL = 0.005  # seconds between RSS samples
+
+
+class RssSampler:
+    """Samples resident set size in a background thread."""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def current(self) -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * resource.getpagesize()
+        except OSError:
+            # No /proc (macOS): lifetime peak only, in KiB on Linux and bytes on macOS
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return rss if sys.platform == "darwin" else rss * 1024
+
+    def take_peak(self) -> int:
+        """Peak since the last call, then restart from the current RSS."""
+        peak, self.peak = max(self.peak, self.current()), self.current()
+        return peak
+
+    def _run(self) -> None:
+        while not self._stop.wait(RSS_INTERVAL):
+            self.peak = max(self.peak, self.current())
+
+    def start(self) -> None:
+        self.peak = self.current()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class PhaseProfiler:
+    """Attributes traced-memory and RSS peaks to named, possibly nested, phases."""
+
+    def __init__(self, trace: bool = True, rss: RssSampler | None = None):
+        self.trace = trace
+        self.rss = rss
+        self.phases: dict[str, dict] = {}
+        self._stack: list[dict] = []
+
+    def _sample(self) -> tuple[int, int, int]:
+        current, peak = tracemalloc.get_traced_memory() if self.trace else (0, 0)
+        rss_peak = self.rss.take_peak() if self.rss else 0
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+            frame["rss_peak"] = max(frame["rss_peak"], rss_peak)
+        if self.trace:
+            tracemalloc.reset_peak()
+        return current, peak, rss_peak
+
+    @contextmanager
+    def phase(self, name: str):
+        current, _, _ = self._sample()
+        self._stack.append({"start": current, "peak": current, "rss_peak": 0})
+        try:
+            yield
+        finally:
+            after, _, _ = self._sample()
+            frame = self._stack.pop()
+            stats = self.phases.setdefault(name, {"calls": 0, "peak": 0, "retained": 0, "rss_peak": 0})
+            stats["calls"] += 1
+            stats["peak"] = max(stats["peak"], frame["peak"] - frame["start"])
+            stats["retained"] += after - frame["start"]
+            stats["rss_peak"] = max(stats["rss_peak"], frame["rss_peak"])
+
+    def wrap(self, owner, attr: str, name: str):
+        """Patch ``owner.attr`` so that every call runs in phase ``name``."""
+        original = getattr(owner, attr)
+
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return original(*args, **kwargs)
+
+        return mock.patch.object(owner, attr, wrapper)
+
+    def report(self, title: str) -> None:
+        click.echo(f"\n{title}")
+        header = f"{'phase':>22} {'calls':>6} {'peak MiB':>9} {'retained MiB':>13}"
+        click.echo(header + (f" {'peak RSS MiB':>13}" if self.rss else ""))
+        for name, stats in self.phases.items():
+            line = (f"{name:>22} {stats['calls']:>6} {stats['peak'] / 2**20:>9.1f} "
+                    f"{stats['retained'] / 2**20:>13.1f}")
+            click.echo(line + (f" {stats['rss_peak'] / 2**20:>13.1f}" if self.rss else ""))
+
+
+def record(corpus: SyntheticCorpus, author: str, path: Path) -> None:
+    """Run the CLI once against the stand-in, recording its responses to ``path``."""
+    standin = StandInServer(("127.0.0.1", 0), corpus)
+    threading.Thread(target=standin.serve_forever, daemon=True).start()
+    env = {"UINDEX_PUBMED_URL": standin.pubmed_url, "UINDEX_OPENALEX_URL": standin.openalex_url,
+           "UINDEX_CASSETTE": str(path)}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result = CliRunner(env=env).invoke(cli.main, [author, "--no-cache", "--cache-dir", cache_dir])
+    standin.shutdown()
+    standin.server_close()
+    if result.exit_code != 0:
+        raise click.ClickException(f"recording failed: {result.output}")
+
+
+def replay_env(cassette: CassetteTransport) -> dict[str, str]:
+    """Point the clients at the host the cassette was recorded from."""
+    base = str(httpx.URL(cassette.records[0]["url"]).copy_with(path="", query=None)).rstrip("/")
+    return {"UINDEX_PUBMED_URL": f"{base}/entrez/eutils", "UINDEX_OPENALEX_URL": base}
+
+
+def profile_fetch(profiler: PhaseProfiler, cassette: CassetteTransport, author: str) -> None:
+    pubmed = PubMedClient(transport=build_transport("pubmed", pool=cassette),
+                          base_url=replay_env(cassette)["UINDEX_PUBMED_URL"])
+    with profiler.wrap(PubMedClient, "_search_author", "esearch"), \
+            profiler.wrap(PubMedClient, "_fetch_batch", "efetch + parse"):
+        with profiler.phase("fetch_author_papers"):
+            papers = pubmed.fetch_author_papers(author)
+    pubmed.close()
+    click.echo(f"fetch_author_papers: {len(papers)} papers")
+
+
+def profile_cli(profiler: PhaseProfiler, cassette: CassetteTransport, author: str) -> None:
+    # The cassette is loaded up front so that reading it is not traced
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            mock.patch.object(api, "_connection_pool", lambda *args: cassette), \
+            profiler.wrap(PubMedClient, "_search_author", "esearch"), \
+            profiler.wrap(PubMedClient, "_fetch_batch", "efetch + parse"), \
+            profiler.wrap(OpenAlexClient, "get_citations_by_dois", "openalex by DOI"), \
+            profiler.wrap(OpenAlexClient, "get_citations_by_pmids", "openalex by PMID"), \
+            profiler.wrap(cli, "write_report", "report"):
+        with profiler.phase("cli.main"):
+            result = CliRunner(env=replay_env(cassette)).invoke(
+                cli.main, [author, "--no-cache", "--cache-dir", cache_dir])
+    if result.exit_code != 0:
+        raise click.ClickException(f"replay failed: {result.output}")
+    click.echo(next(line for line in result.output.splitlines() if line.startswith("U-index")))
+
+
+@click.command()
+@click.option("--cassette", type=click.Path(dir_okay=False, path_type=Path),
+              help="Replay this cassette, recording it first if it does not exist")
+@click.option("--rss", is_flag=True, help="Also sample peak resident set size per phase")
+@click.option("--no-trace", is_flag=True, help="Disable tracemalloc (use with --rss)")
+def main(cassette: Path | None, rss: bool, no_trace: bool) -> None:
+    corpus = SyntheticCorpus(profiles=[PROFILE])
+    author = corpus.researchers[0]["name"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = cassette or Path(tmp) / "cassette.jsonl.gz"
+        if not path.exists():
+            start = time.perf_counter()
+            record(corpus, author, path)
+            click.echo(f"Recorded {path} in {time.perf_counter() - start:.1f}s")
+
+        for title, flow in [("fetch_author_papers", profile_fetch), ("cli.main", profile_cli)]:
+            replay = CassetteTransport(path, mode="replay")
+            sampler = RssSampler() if rss else None
+            profiler = PhaseProfiler(trace=not no_trace, rss=sampler)
+            if sampler:
+                sampler.start()
+            if not no_trace:
+                tracemalloc.start()
+            flow(profiler, replay, author)
+            if not no_trace:
+                tracemalloc.stop()
+            if sampler:
+                sampler.stop()
+            profiler.report(title)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""pytest-benchmark suite for the hot paths.
+
+Covers U-index calculation, article parsing and author position detection,
+efetch parsing of a 10k-article payload, the SQLite cache under thread
+contention and the full CLI against the local stand-in server. Payloads
+come from :class:`~uindex.corpus.SyntheticCorpus`, so runs are comparable.
+
+Results are kept as JSON under benchmarks/baselines, per platform and
+Python version. Save a baseline on the commit to compare against, then
+compare a change with it and fail on regressions::
+
+    pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-save=baseline
+    pytest benchmarks --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+Needs pytest-benchmark (a dev dependency); the regular test run does not
+collect this directory.
+"""
+
+import random
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from uindex.cache import Cache
+from uindex.cli import main
+from uindex.core import PaperRecord, calculate_u_index
+from uindex.corpus import SyntheticCorpus, article_xml
+from uindex.names import AuthorNameMatcher
+from uindex.pubmed import PubMedClient
+from uindex.standin import StandInServer
+
+
+CONSORTIUM_AUTHORS = 5000
+EFETCH_ARTICLES = 10_000
+CACHE_THREADS = 8
+CACHE_OPS = 200  # per thread
+
+
+def build_article(num_authors: int, author_index: int) -> ET.Element:
+    """A PubmedArticle with the queried author ("Smith John") at ``author_index``."""
+    authors = [(f"Member{i}", "Consortium") for i in range(num_authors)]
+    authors[author_index] = ("Smith", "John")
+    xml = article_xml("12345678", "A consortium paper", authors, "10.1000/bench", "2020")
+    return ET.fromstring(xml)
+
+
+@pytest.fixture
+def client():
+    client = PubMedClient()
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("n", [10, 1_000, 100_000])
+def test_calculate_u_index(benchmark, n):
+    rng = random.Random(0)
+    papers = [PaperRecord(str(i), "", None, "", "first", int(rng.paretovariate(1.2))) for i in range(n)]
+
+    benchmark(calculate_u_index, papers)
+
+
+@pytest.mark.parametrize("num_authors", [6, CONSORTIUM_AUTHORS], ids=["small", "consortium"])
+def test_parse_article(benchmark, client, num_authors):
+    article = build_article(num_authors, author_index=-1)
+    matcher = AuthorNameMatcher("Smith John")
+
+    paper = benchmark(client._parse_article, article, matcher)
+
+    assert paper.position == "last"
+
+
+@pytest.mark.parametrize("num_authors", [6, CONSORTIUM_AUTHORS], ids=["small", "consortium"])
+@pytest.mark.parametrize("classify_middle", [False, True], ids=["ends", "full-scan"])
+def test_get_author_position(benchmark, client, num_authors, classify_middle):
+    # Worst case for the full scan: the author is just before the last entry
+    article = build_article(num_authors, author_index=num_authors - 2).find(".//Article")
+    matcher = AuthorNameMatcher("Smith John")
+
+    position = benchmark(client._get_author_position, article, matcher, classify_middle)
+
+    assert position == ("middle" if classify_middle else None)
+
+
+def test_efetch_parse_10k(benchmark):
+    corpus = SyntheticCorpus(background_papers=EFETCH_ARTICLES, profiles=[], consortium_size=(20, 30))
+    pmids = list(corpus.pmids())
+    payload = (
+        '<?xml version="1.0" encoding="UTF-8"?><PubmedArticleSet>'
+        + "".join(corpus.iter_articles())
+        + "</PubmedArticleSet>"
+    ).encode()
+    client = PubMedClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=payload)))
+    matcher = AuthorNameMatcher("Smith John")
+
+    papers = benchmark(client._fetch_batch, pmids, matcher, True)
+
+    assert len(papers) == EFETCH_ARTICLES
+    client.close()
+
+
+@pytest.mark.parametrize("op", ["get", "set"])
+def test_cache_contention(benchmark, tmp_path, op):
+    cache = Cache(tmp_path / "cache.db")
+    value = {"author": "Smith John", "u_index": 12, "qualifying_papers": [{"pmid": "1"}] * 50}
+    for key in range(CACHE_OPS):
+        cache.set(f"author:{key}", value)
+    start = threading.Barrier(CACHE_THREADS)
+
+    def worker():
+        start.wait()
+        for key in range(CACHE_OPS):
+            if op == "get":
+                cache.get(f"author:{key}")
+            else:
+                cache.set(f"author:{key}", value)
+
+    def run():
+        with ThreadPoolExecutor(CACHE_THREADS) as pool:
+            for future in [pool.submit(worker) for _ in range(CACHE_THREADS)]:
+                future.result()
+
+    benchmark.pedantic(run, rounds=5)
+
+
+@pytest.fixture
+def standin():
+    corpus = SyntheticCorpus(doi_missing_rate=0.2, consortium_size=(200, 300))
+    server = StandInServer(("127.0.0.1", 0), corpus)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cli_end_to_end(benchmark, standin, monkeypatch, tmp_path):
+    monkeypatch.setenv("UINDEX_PUBMED_URL", standin.pubmed_url)
+    monkeypatch.setenv("UINDEX_OPENALEX_URL", standin.openalex_url)
+    researcher = max(standin.corpus.researchers, key=lambda r: r["lead_papers"] + r["middle_papers"])
+    runner = CliRunner()
+
+    result = benchmark.pedantic(
+        runner.invoke, (main, [researcher["name"], "--no-cache", "--cache-dir", str(tmp_path)]), rounds=10)
+
+    assert result.exit_code == 0
+    assert f"U-index: {researcher['u']}" in result.output
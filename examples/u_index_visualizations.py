@@ -19,6 +19,8 @@ import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from uindex.corpus import RESEARCHERS
+
 
 def hex_to_rgba(hex_color: str, alpha: float) -> str:
     """Convert hex color to rgba string."""
@@ -27,91 +29,6 @@ def hex_to_rgba(hex_color: str, alpha: float) -> str:
     return f"rgba({r}, {g}, {b}, {alpha})"
 
 
-# Researcher profiles with synthetic data
-RESEARCHERS = [
-    {
-        "name": "Dr. Early",
-        "archetype": "Career Stage",
-        "description": "5 years post-PhD, primarily first-author experimental work",
-        "h": 12,
-        "u": 10,
-        "years": 5,
-        "h_base_rate": 2.4,
-        "collab_bonus": 0.4,
-    },
-    {
-        "name": "Dr. Midcareer",
-        "archetype": "Career Stage",
-        "description": "12 years in, mix of independent and supervised research",
-        "h": 25,
-        "u": 18,
-        "years": 12,
-        "h_base_rate": 1.5,
-        "collab_bonus": 0.58,
-    },
-    {
-        "name": "Dr. Senior",
-        "archetype": "Career Stage",
-        "description": "25 years experience, leads large lab with heavy supervision",
-        "h": 45,
-        "u": 22,
-        "years": 25,
-        "h_base_rate": 0.88,
-        "collab_bonus": 0.92,
-    },
-    {
-        "name": "Dr. Independent",
-        "archetype": "Leadership Style",
-        "description": "Runs small lab, still does own experiments",
-        "h": 20,
-        "u": 18,
-        "years": 15,
-        "h_base_rate": 1.2,
-        "collab_bonus": 0.13,
-    },
-    {
-        "name": "Dr. Collaborative",
-        "archetype": "Leadership Style",
-        "description": "Hub in large consortiums, many middle-author papers",
-        "h": 35,
-        "u": 8,
-        "years": 15,
-        "h_base_rate": 0.53,
-        "collab_bonus": 1.8,
-    },
-    {
-        "name": "Dr. Balanced",
-        "archetype": "Leadership Style",
-        "description": "Equal leadership and collaboration contributions",
-        "h": 28,
-        "u": 14,
-        "years": 15,
-        "h_base_rate": 0.93,
-        "collab_bonus": 0.93,
-    },
-    {
-        "name": "Dr. Consortium",
-        "archetype": "Edge Case",
-        "description": "Almost entirely middle-author consortium positions",
-        "h": 40,
-        "u": 3,
-        "years": 20,
-        "h_base_rate": 0.15,
-        "collab_bonus": 1.85,
-    },
-    {
-        "name": "Dr. Solo",
-        "archetype": "Edge Case",
-        "description": "Single-author theoretician, all papers are first/last",
-        "h": 15,
-        "u": 15,
-        "years": 20,
-        "h_base_rate": 0.75,
-        "collab_bonus": 0.0,
-    },
-]
-
-
 def generate_trajectory(researcher: dict, seed: int = 42) -> list[tuple[int, int, int]]:
     """
     Generate a career trajectory showing h and U values over time.
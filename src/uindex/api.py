@@ -0,0 +1,158 @@
+"""Python API for computing U-index results.
+
+A :class:`UIndexSession` owns the PubMed and OpenAlex clients, their shared
+connection pool and the cache, so that repeated calls from a notebook or a
+service reuse warm connections and cached results::
+
+    with UIndexSession() as session:
+        result = session.compute("Smith John")
+        print(result.u_index, result.qualifying_papers[0].title)
+        results = session.compute_many(["Smith John", "Doe Jane"])
+
+Async code can use :meth:`UIndexSession.acompute` and
+:meth:`UIndexSession.acompute_many`, which run the same work in threads.
+"""
+
+import asyncio
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from uindex.cache import Cache
+from uindex.cassette import CassetteTransport
+from uindex.checkpoint import Checkpoint
+from uindex.core import UIndexResult
+from uindex.index import AuthorshipIndex, CitationIndex
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from uindex.server import UIndexService
+from uindex.store import ResultStore
+from uindex.transport import build_transport, connection_pool
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "uindex"
+
+
+class UIndexSession:
+    """Clients, connection pool and cache for computing U-index results.
+
+    Args:
+        cache_dir: Directory of the results cache.
+        use_cache: Read and store results in the cache. Computed results are
+            also written to a normalized :class:`~uindex.store.ResultStore`
+            in the same database, for cohort queries.
+        pubmed_index: Local authorship index (see ``uindex ingest-pubmed``)
+            answering PubMed lookups without network calls.
+        openalex_index: Local citation index (see ``uindex ingest-openalex``)
+            answering citation lookups without network calls.
+        max_connections: Size of the keep-alive pool shared by both APIs.
+        http2: Use HTTP/2 upstream (needs ``uindex[http2]``).
+        checkpoint: Checkpoint for resumable batch runs.
+        pubmed: PubMed client to use instead of building one.
+        openalex: OpenAlex client (or citation index) to use instead of building one.
+
+    ``UINDEX_PUBMED_URL``, ``UINDEX_OPENALEX_URL`` and ``UINDEX_CASSETTE``
+    (see the README) apply to the clients the session builds.
+
+    Raises:
+        ImportError: If ``http2`` is requested and ``h2`` is not installed.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, use_cache: bool = True,
+                 pubmed_index: Path | None = None, openalex_index: Path | None = None,
+                 max_connections: int = 20, http2: bool = False,
+                 checkpoint: Checkpoint | None = None, pubmed=None, openalex=None):
+        self.cache = Cache(cache_dir / "cache.db") if use_cache else None
+        self.store = ResultStore(cache_dir / "cache.db") if use_cache else None
+        pool = None
+        if pubmed is None or openalex is None:
+            pool = _connection_pool(max_connections, http2)
+        if pubmed is None:
+            pubmed = _pubmed_client(pubmed_index, checkpoint, pool)
+        if openalex is None:
+            openalex = _openalex_client(openalex_index, checkpoint, pool)
+        self.service = UIndexService(pubmed, openalex, self.cache, self.store)
+
+    @property
+    def pubmed(self):
+        return self.service.pubmed
+
+    @property
+    def openalex(self):
+        return self.service.openalex
+
+    def compute(self, author: str, refresh: bool = False, full_refresh: bool = False) -> UIndexResult:
+        """Results for an author, from the cache when available.
+
+        ``refresh`` updates cached results incrementally (new PMIDs and stale
+        citation counts only); ``full_refresh`` refetches everything.
+
+        Raises:
+            httpx.HTTPError: If an upstream request fails.
+        """
+        return self.service.compute(author, refresh=refresh, full_refresh=full_refresh)
+
+    def compute_many(self, authors: Iterable[str], refresh: bool = False, full_refresh: bool = False,
+                     max_workers: int = 4) -> list[UIndexResult]:
+        """Results for several authors, in order, computed ``max_workers`` at a time.
+
+        Raises:
+            httpx.HTTPError: If an upstream request fails.
+        """
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(
+                lambda author: self.compute(author, refresh=refresh, full_refresh=full_refresh), authors))
+
+    async def acompute(self, author: str, refresh: bool = False,
+                       full_refresh: bool = False) -> UIndexResult:
+        """Async :meth:`compute`; runs in a worker thread over the shared clients."""
+        return await asyncio.to_thread(self.compute, author, refresh, full_refresh)
+
+    async def acompute_many(self, authors: Iterable[str], refresh: bool = False,
+                            full_refresh: bool = False, max_concurrency: int = 4) -> list[UIndexResult]:
+        """Async :meth:`compute_many`, with at most ``max_concurrency`` authors in flight."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def compute(author: str) -> UIndexResult:
+            async with semaphore:
+                return await self.acompute(author, refresh, full_refresh)
+
+        return list(await asyncio.gather(*(compute(author) for author in authors)))
+
+    def close(self) -> None:
+        """Close the clients and their connection pool."""
+        self.service.close()
+
+    def __enter__(self) -> "UIndexSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _connection_pool(max_connections: int = 20, http2: bool = False) -> httpx.BaseTransport:
+    pool = connection_pool(max_connections, max_keepalive_connections=max_connections, http2=http2)
+    # Record upstream responses on the first run and replay them afterwards
+    cassette = os.environ.get("UINDEX_CASSETTE")
+    if cassette:
+        latency = float(os.environ.get("UINDEX_CASSETTE_LATENCY", 0))
+        return CassetteTransport(Path(cassette), pool, latency=latency)
+    return pool
+
+
+def _pubmed_client(pubmed_index: Path | None, checkpoint: Checkpoint | None = None,
+                   pool: httpx.BaseTransport | None = None) -> PubMedClient:
+    index = AuthorshipIndex(pubmed_index) if pubmed_index else None
+    return PubMedClient(transport=build_transport("pubmed", pool=pool), checkpoint=checkpoint, index=index,
+                        base_url=os.environ.get("UINDEX_PUBMED_URL"))
+
+
+def _openalex_client(openalex_index: Path | None, checkpoint: Checkpoint | None = None,
+                     pool: httpx.BaseTransport | None = None) -> OpenAlexClient | CitationIndex:
+    if openalex_index:
+        return CitationIndex(openalex_index)
+    return OpenAlexClient(transport=build_transport("openalex", pool=pool), checkpoint=checkpoint,
+                          base_url=os.environ.get("UINDEX_OPENALEX_URL"))
@@ -0,0 +1,134 @@
+"""Batch U-index computation over a list of authors."""
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TextIO
+
+import httpx
+
+from uindex.checkpoint import Checkpoint
+from uindex.server import UIndexService
+
+
+def read_authors(path: Path) -> list[str]:
+    """Read author names, one per line, skipping blanks, comments and duplicates."""
+    authors = []
+    seen = set()
+    for line in path.read_text().splitlines():
+        name = line.strip()
+        if name and not name.startswith("#") and name not in seen:
+            seen.add(name)
+            authors.append(name)
+    return authors
+
+
+def shard_of(author: str, num_shards: int) -> int:
+    """Stable 1-based shard number of an author, independent of input order and host."""
+    digest = hashlib.sha1(author.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards + 1
+
+
+def select_shard(authors: Iterable[str], shard: int, num_shards: int) -> list[str]:
+    """Authors assigned to ``shard`` (1-based) of ``num_shards``."""
+    return [a for a in authors if shard_of(a, num_shards) == shard]
+
+
+def job_id_for(authors: Iterable[str]) -> str:
+    """Derive a stable job id from the author list."""
+    return hashlib.sha1("\n".join(sorted(authors)).encode()).hexdigest()[:16]
+
+
+def run_batch(service: UIndexService, authors: Iterable[str], out: TextIO,
+              refresh: bool = False, full_refresh: bool = False,
+              checkpoint: Checkpoint | None = None) -> dict[str, int]:
+    """Compute each author and write one NDJSON record per author to ``out``.
+
+    Failures (upstream errors, malformed responses, database errors) are
+    recorded as ``{"author": ..., "error": ...}`` lines so that one bad author
+    does not abort the run. With a ``checkpoint``, authors
+    already completed by the job are skipped and newly written ones recorded;
+    once a run finishes without failures the job's checkpoint is cleared.
+
+    Returns:
+        Counts of ``computed``, ``failed`` and ``skipped`` authors.
+    """
+    completed = checkpoint.completed_authors() if checkpoint else set()
+    summary = {"computed": 0, "failed": 0, "skipped": 0}
+    for author in authors:
+        if author in completed:
+            summary["skipped"] += 1
+            continue
+        try:
+            record = service.compute(author, refresh=refresh, full_refresh=full_refresh).to_dict()
+            summary["computed"] += 1
+        except Exception as e:
+            # Upstream failures, but also malformed bodies or a locked cache database
+            error = str(e) if isinstance(e, httpx.HTTPError) else f"{type(e).__name__}: {e}"
+            record = {"author": author, "error": error, "created_at": time.time()}
+            summary["failed"] += 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        if checkpoint and "error" not in record:
+            checkpoint.mark_author_done(author)
+    if checkpoint and not summary["failed"]:
+        # Nothing left to resume; drop the stored fetch units (full efetch payloads)
+        checkpoint.clear()
+    return summary
+
+
+def drop_superseded_errors(path: Path) -> int:
+    """Remove error records of authors with a later successful record from an NDJSON file.
+
+    Resumed runs append to their output, so authors that failed and were
+    retried appear twice. Other records keep their order.
+
+    Returns:
+        Number of error records removed.
+    """
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    last_success = {r["author"]: i for i, r in enumerate(records) if "error" not in r}
+    kept = [r for i, r in enumerate(records)
+            if "error" not in r or last_success.get(r["author"], -1) < i]
+    if len(kept) == len(records):
+        return 0
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "w") as f:
+        f.writelines(json.dumps(r) + "\n" for r in kept)
+    os.replace(partial, path)
+    return len(records) - len(kept)
+
+
+def merge_ndjson(inputs: Iterable[Path], out: TextIO) -> dict[str, int]:
+    """Combine batch outputs, keeping one record per author.
+
+    Successful records win over error records; among equals the one with the
+    newest ``created_at`` is kept.
+
+    Returns:
+        Counts of ``read`` records and ``written`` authors.
+    """
+    best: dict[str, dict] = {}
+    read = 0
+    for path in inputs:
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                read += 1
+                current = best.get(record["author"])
+                if current is None or _merge_rank(record) > _merge_rank(current):
+                    best[record["author"]] = record
+
+    for record in best.values():
+        out.write(json.dumps(record) + "\n")
+    return {"read": read, "written": len(best)}
+
+
+def _merge_rank(record: dict) -> tuple[bool, float]:
+    return ("error" not in record, record.get("created_at", 0.0))
@@ -3,9 +3,16 @@
 import json
 import sqlite3
 import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
+from uindex.metrics import CACHE_REQUESTS
+from uindex.singleflight import SingleFlight
+
+# Marks a missing or expired entry (a cached value may itself be None)
+_MISSING = object()
+
 
 class Cache:
     """Simple key-value cache backed by SQLite."""
@@ -15,6 +22,7 @@ class Cache:
     def __init__(self, db_path: Path, ttl_seconds: int | None = None):
         self.db_path = db_path
         self.ttl_seconds = ttl_seconds if ttl_seconds is not None else self.DEFAULT_TTL
+        self._flight = SingleFlight()
         self._init_db()
 
     def _init_db(self) -> None:
@@ -28,7 +36,39 @@ class Cache:
                 )
             """)
 
-    def get(self, key: str) -> Any | None:
+    def get(self, key: str, allow_expired: bool = False) -> Any | None:
+        """Get a value, or None if missing or expired.
+
+        With ``allow_expired``, expired entries are returned instead of deleted
+        (e.g. as the starting point of an incremental refresh).
+        """
+        value = self._lookup(key, allow_expired)
+        if value is _MISSING:
+            CACHE_REQUESTS.inc(result="miss")
+            return None
+        CACHE_REQUESTS.inc(result="hit")
+        return value
+
+    def get_or_set(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Get a value, computing and storing it with ``fn`` on a miss.
+
+        Concurrent misses for one key wait for a single call to ``fn`` and
+        share its value.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._flight.do(key, lambda: self._fill(key, fn))
+
+    def _fill(self, key: str, fn: Callable[[], Any]) -> Any:
+        # A fill that finished between our miss and taking the lead has stored the value
+        value = self._lookup(key)
+        if value is _MISSING or value is None:
+            value = fn()
+            self.set(key, value)
+        return value
+
+    def _lookup(self, key: str, allow_expired: bool = False) -> Any:
         with sqlite3.connect(self.db_path) as conn:
             row = conn.execute(
                 "SELECT value, created_at FROM cache WHERE key = ?",
@@ -36,12 +76,12 @@ class Cache:
             ).fetchone()
 
         if row is None:
-            return None
+            return _MISSING
 
         value, created_at = row
-        if time.time() - created_at > self.ttl_seconds:
+        if time.time() - created_at > self.ttl_seconds and not allow_expired:
             self.delete(key)
-            return None
+            return _MISSING
 
         return json.loads(value)
 
@@ -58,3 +98,24 @@ class Cache:
     def delete(self, key: str) -> None:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def merge_from(self, other_db: Path) -> int:
+        """Copy entries from another cache database, keeping the newest per key.
+
+        Returns:
+            Number of entries inserted or updated.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("ATTACH DATABASE ? AS other", (str(other_db),))
+            cursor = conn.execute("""
+                INSERT INTO cache (key, value, created_at)
+                SELECT key, value, created_at FROM other.cache WHERE true
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value,
+                    created_at = excluded.created_at
+                WHERE excluded.created_at > cache.created_at
+            """)
+            changed = cursor.rowcount
+            conn.commit()
+            conn.execute("DETACH DATABASE other")
+        return changed
@@ -0,0 +1,153 @@
+"""Record and replay upstream HTTP responses for reproducible runs.
+
+A :class:`CassetteTransport` sits where the connection pool would (see
+:func:`~uindex.transport.build_transport`), so one cassette serves both
+clients. It records responses on the first run and replays them afterwards::
+
+    cassette = CassetteTransport(Path("author.jsonl.gz"), connection_pool(), latency=0.05)
+    pubmed = PubMedClient(transport=build_transport("pubmed", pool=cassette))
+    openalex = OpenAlexClient(transport=build_transport("openalex", pool=cassette))
+
+The cassette is a gzipped JSON-lines file with one response per line, in
+request order. Requests are matched on method, URL and a hash of the body.
+Repeated identical requests replay their recorded responses in order, and
+the last one once they run out. That includes retried 429s.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Literal
+
+import httpx
+
+
+Mode = Literal["auto", "record", "replay"]
+
+# Set by the transport that recorded the body, not by the cassette
+_DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request the cassette has no response for."""
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """Transport that records upstream responses to a file and replays them.
+
+    Args:
+        path: Cassette file (``.jsonl.gz``).
+        transport: Transport for requests that are not replayed (default: a
+            new ``httpx.HTTPTransport``).
+        mode: ``"auto"`` replays recorded requests and records new ones;
+            ``"record"`` always forwards and rewrites the cassette;
+            ``"replay"`` never forwards and raises :class:`CassetteMissError`
+            for unknown requests.
+        latency: Seconds to wait before each replayed response, to simulate
+            the upstream round trip.
+        sleep: Sleep function (injectable for tests).
+    """
+
+    def __init__(self, path: Path, transport: httpx.BaseTransport | None = None, mode: Mode = "auto",
+                 latency: float = 0.0, sleep: Callable[[float], None] = time.sleep):
+        self.path = Path(path)
+        self.transport = transport
+        self.mode = mode
+        self.latency = latency
+        self.sleep = sleep
+        # Recorded responses in request order
+        self.records: list[dict] = []
+        self._replay: dict[tuple[str, str, str], list[dict]] = {}
+        self._played: dict[tuple[str, str, str], int] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if mode != "record" and self.path.exists():
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"No cassette at {self.path}")
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self.records.append(record)
+                self._replay.setdefault(_key(record), []).append(record)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, str(request.url), _body_hash(request.read()))
+        with self._lock:
+            recorded = self._replay.get(key)
+            if recorded:
+                played = self._played.get(key, 0)
+                self._played[key] = played + 1
+                record = recorded[min(played, len(recorded) - 1)]
+        if recorded:
+            if self.latency:
+                self.sleep(self.latency)
+            return _response(record)
+        if self.mode == "replay":
+            raise CassetteMissError(f"{request.method} {request.url} is not in {self.path}")
+
+        if self.transport is None:
+            self.transport = httpx.HTTPTransport()
+        response = self.transport.handle_request(request)
+        content = response.read()
+        response.close()
+        record = {
+            "method": key[0],
+            "url": key[1],
+            "body": key[2],
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            **_encode(content),
+        }
+        with self._lock:
+            self.records.append(record)
+            self._dirty = True
+        return _response(record)
+
+    def save(self) -> None:
+        """Write the cassette if anything was recorded since it was loaded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(self.path.name + ".partial")
+            with gzip.open(partial, "wt", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.records)
+            os.replace(partial, self.path)
+            self._dirty = False
+
+    def close(self) -> None:
+        self.save()
+        if self.transport is not None:
+            self.transport.close()
+
+
+def _key(record: dict) -> tuple[str, str, str]:
+    return record["method"], record["url"], record["body"]
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:16] if body else ""
+
+
+def _encode(content: bytes) -> dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _response(record: dict) -> httpx.Response:
+    if "text" in record:
+        content = record["text"].encode("utf-8")
+    else:
+        content = base64.b64decode(record["base64"])
+    return httpx.Response(record["status"], headers=record["headers"], content=content)
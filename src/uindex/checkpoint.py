@@ -0,0 +1,83 @@
+"""SQLite-backed progress checkpoints for resumable batch jobs."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+
+def unit_key(kind: str, *parts: str | Iterable[str]) -> str:
+    """Build a stable checkpoint unit key, hashing list parts (e.g. PMIDs)."""
+    rendered = []
+    for part in parts:
+        if isinstance(part, str):
+            rendered.append(part)
+        else:
+            rendered.append(hashlib.sha1("\n".join(part).encode()).hexdigest())
+    return ":".join([kind, *rendered])
+
+
+class Checkpoint:
+    """Completed work units of one batch job.
+
+    Units are authors (``author:<name>``) and upstream fetch units such as
+    efetch chunks and OpenAlex batches, so an interrupted job can resume
+    without repeating finished work. Stored in a ``checkpoints`` table that
+    can share the cache database.
+    """
+
+    def __init__(self, db_path: Path, job_id: str):
+        self.db_path = db_path
+        self.job_id = job_id
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    job TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (job, unit)
+                )
+            """)
+
+    def completed_authors(self) -> set[str]:
+        """Authors whose results were written by this job."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT unit FROM checkpoints WHERE job = ? AND unit LIKE 'author:%'",
+                (self.job_id,)
+            ).fetchall()
+        return {unit.removeprefix("author:") for (unit,) in rows}
+
+    def mark_author_done(self, author: str) -> None:
+        self.set(f"author:{author}", True)
+
+    def get(self, unit: str) -> Any | None:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value FROM checkpoints WHERE job = ? AND unit = ?",
+                (self.job_id, unit)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, unit: str, value: Any) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO checkpoints (job, unit, value, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (self.job_id, unit, json.dumps(value), time.time())
+            )
+
+    def clear(self) -> None:
+        """Forget all progress of this job."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM checkpoints WHERE job = ?", (self.job_id,))
@@ -4,143 +4,294 @@ from pathlib import Path
 
 import click
 
+from uindex.api import DEFAULT_CACHE_DIR, UIndexSession
+from uindex.batch import (
+    drop_superseded_errors,
+    job_id_for,
+    merge_ndjson,
+    read_authors,
+    run_batch,
+    select_shard,
+)
 from uindex.cache import Cache
-from uindex.core import calculate_u_index
-from uindex.openalex import OpenAlexClient
-from uindex.pubmed import PubMedClient
+from uindex.checkpoint import Checkpoint
+from uindex.export import default_format, export_results, read_ndjson_results
+from uindex.index import AuthorshipIndex, CitationIndex, ingest_openalex, ingest_pubmed
+from uindex.metrics import REGISTRY
+from uindex.report import FORMATS, write_report
+from uindex.server import UIndexServer
+from uindex.store import ResultStore
 
 
-DEFAULT_CACHE_DIR = Path.home() / ".cache" / "uindex"
+class DefaultGroup(click.Group):
+    """Command group that falls back to a default command.
 
+    Keeps ``uindex "Smith John"`` working next to subcommands like ``uindex serve``.
+    """
 
-@click.command()
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup, default_command="compute")
+def main() -> None:
+    """Calculate the U-index for researchers using PubMed data.
+
+    Runs the compute command when called with just an author name.
+    """
+
+
+@main.command()
 @click.argument("author_name")
 @click.option("--no-cache", is_flag=True, help="Skip cache, fetch fresh data")
-@click.option("--refresh", is_flag=True, help="Force refresh cached data")
+@click.option("--refresh", is_flag=True,
+              help="Refresh cached data incrementally (new papers, stale citation counts)")
+@click.option("--full-refresh", is_flag=True, help="Refetch all data, ignoring the cache")
 @click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
               help="Cache directory path")
-def main(author_name: str, no_cache: bool, refresh: bool, cache_dir: Path) -> None:
+@click.option("--pubmed-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer PubMed lookups from a local index built with ingest-pubmed")
+@click.option("--openalex-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer citation lookups from a local index built with ingest-openalex")
+@click.option("--format", "format_", type=click.Choice(FORMATS), default="text", show_default=True,
+              help="Output format: a readable report, the JSON result, or one NDJSON/CSV row per paper")
+@click.option("--top", type=click.IntRange(min=0),
+              help="List only the N most cited papers (and N papers without citation data)")
+def compute(author_name: str, no_cache: bool, refresh: bool, full_refresh: bool,
+            cache_dir: Path, pubmed_index: Path | None, openalex_index: Path | None,
+            format_: str, top: int | None) -> None:
     """Calculate U-index for AUTHOR_NAME using PubMed data."""
-    cache = None if no_cache else Cache(cache_dir / "cache.db")
-    cache_key = f"author:{author_name}"
+    with _session(cache_dir, no_cache, pubmed_index, openalex_index) as session:
+        result = session.compute(author_name, refresh=refresh, full_refresh=full_refresh)
 
-    # Check cache
-    if cache and not refresh:
-        cached = cache.get(cache_key)
-        if cached:
-            _print_results(cached)
-            return
+    with click.open_file("-", "w") as out:
+        write_report(result, out, format_, top)
 
-    # Fetch data
-    pubmed = PubMedClient()
-    openalex = OpenAlexClient()
 
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", default=8000, show_default=True, help="Port to listen on")
+@click.option("--no-cache", is_flag=True, help="Skip cache, always fetch fresh data")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory path")
+@click.option("--pubmed-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer PubMed lookups from a local index built with ingest-pubmed")
+@click.option("--openalex-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer citation lookups from a local index built with ingest-openalex")
+@click.option("--max-connections", default=20, show_default=True,
+              help="Size of the keep-alive connection pool shared by both APIs")
+@click.option("--http2", is_flag=True, help="Use HTTP/2 upstream (needs uindex[http2])")
+def serve(host: str, port: int, no_cache: bool, cache_dir: Path, pubmed_index: Path | None,
+          openalex_index: Path | None, max_connections: int, http2: bool) -> None:
+    """Serve U-index results over HTTP/JSON with warm clients and cache.
+
+    \b
+    GET  /u-index?author=NAME[&refresh=1]
+    POST /u-index  {"authors": [NAME, ...], "refresh": false}
+    GET  /metrics  (Prometheus text format)
+    """
+    session = _session(cache_dir, no_cache, pubmed_index, openalex_index, max_connections, http2)
+    server = UIndexServer((host, port), session.service)
+
+    click.echo(f"Serving U-index on http://{host}:{server.server_port}/u-index")
     try:
-        papers = pubmed.fetch_author_papers(author_name)
-
-        # Filter to first/last authored
-        qualifying = [p for p in papers if p["position"] in ("first", "last")]
-
-        # Get DOIs for citation lookup
-        dois = [p["doi"] for p in qualifying if p["doi"]]
-        citations = openalex.get_citations_by_dois(dois)
-
-        # Build results
-        results = {
-            "author": author_name,
-            "total_papers": len(papers),
-            "qualifying_count": len(qualifying),
-            "qualifying_papers": [],
-            "unmatched_count": 0,
-            "unmatched_papers": [],
-        }
-
-        for paper in qualifying:
-            doi = paper.get("doi")
-            # Normalize DOI to lowercase for matching (OpenAlex returns lowercase)
-            doi_key = doi.lower() if doi else None
-            if doi_key and doi_key in citations:
-                results["qualifying_papers"].append({
-                    "title": paper["title"],
-                    "year": paper["year"],
-                    "position": paper["position"],
-                    "citations": citations[doi_key],
-                    "doi": doi,
-                    "pmid": paper.get("pmid"),
-                })
-            else:
-                results["unmatched_count"] += 1
-                results["unmatched_papers"].append({
-                    "title": paper["title"],
-                    "year": paper["year"],
-                    "position": paper["position"],
-                    "pmid": paper.get("pmid"),
-                    "doi": doi,
-                })
-
-        # Sort by citations descending
-        results["qualifying_papers"].sort(key=lambda p: p["citations"], reverse=True)
-
-        # Calculate U-index
-        results["u_index"] = calculate_u_index(results["qualifying_papers"])
-
-        # Cache results
-        if cache:
-            cache.set(cache_key, results)
-
-        _print_results(results)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        session.close()
+
 
+def _parse_shard(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    try:
+        shard, num_shards = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise click.BadParameter("expected i/N, e.g. 1/4")
+    if not 1 <= shard <= num_shards:
+        raise click.BadParameter("shard i must be between 1 and N")
+    return shard, num_shards
+
+
+@main.command()
+@click.argument("authors_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path),
+              help="NDJSON output file (default: stdout)")
+@click.option("--no-cache", is_flag=True, help="Skip cache, fetch fresh data")
+@click.option("--refresh", is_flag=True,
+              help="Refresh cached data incrementally (new papers, stale citation counts)")
+@click.option("--full-refresh", is_flag=True, help="Refetch all data, ignoring the cache")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory path")
+@click.option("--metrics-file", type=click.Path(dir_okay=False, path_type=Path),
+              help="Write Prometheus metrics to this file when the run ends")
+@click.option("--resume", is_flag=True,
+              help="Skip authors and fetch units completed by an interrupted run")
+@click.option("--job-id", help="Checkpoint job id (default: derived from the author list)")
+@click.option("--shard", callback=_parse_shard, metavar="i/N",
+              help="Only process shard i of N (1-based), partitioned by a stable hash of the name")
+@click.option("--pubmed-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer PubMed lookups from a local index built with ingest-pubmed")
+@click.option("--openalex-index", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Answer citation lookups from a local index built with ingest-openalex")
+@click.option("--max-connections", default=20, show_default=True,
+              help="Size of the keep-alive connection pool shared by both APIs")
+@click.option("--http2", is_flag=True, help="Use HTTP/2 upstream (needs uindex[http2])")
+def batch(authors_file: Path, output: Path | None, no_cache: bool, refresh: bool,
+          full_refresh: bool, cache_dir: Path, metrics_file: Path | None, resume: bool, job_id: str | None,
+          shard: tuple[int, int] | None, pubmed_index: Path | None,
+          openalex_index: Path | None, max_connections: int, http2: bool) -> None:
+    """Calculate U-index for every author listed in AUTHORS_FILE (one per line).
+
+    Progress is checkpointed in the cache database so that --resume can pick
+    up an interrupted run, appending to the same output file. With --shard,
+    several machines can split one roster; combine their outputs and caches
+    with "uindex merge".
+    """
+    authors = read_authors(authors_file)
+    if shard:
+        authors = select_shard(authors, *shard)
+    checkpoint = Checkpoint(cache_dir / "cache.db", job_id or job_id_for(authors))
+    if not resume:
+        checkpoint.clear()
+    session = _session(cache_dir, no_cache, pubmed_index, openalex_index, max_connections, http2,
+                       checkpoint)
+
+    try:
+        with click.open_file(str(output) if output else "-", "a" if resume else "w") as out:
+            summary = run_batch(session.service, authors, out, refresh=refresh,
+                                full_refresh=full_refresh, checkpoint=checkpoint)
     finally:
-        pubmed.close()
-        openalex.close()
-
-
-def _print_results(results: dict) -> None:
-    """Print formatted results."""
-    # Summary upfront
-    click.echo(f"Author: {results['author']}")
-    qualifying_total = results.get('qualifying_count', len(results['qualifying_papers']) + results['unmatched_count'])
-    click.echo(f"Qualifying papers (first/last author): {qualifying_total}")
-    click.echo()
-
-    # Main result
-    click.echo(f"U-index: {results['u_index']}")
-    click.echo()
-
-    matched_count = len(results['qualifying_papers'])
-    click.echo(f"Papers with citation data: {matched_count}")
-    click.echo(f"Unmatched (no DOI or not in OpenAlex): {results['unmatched_count']}")
-    click.echo()
-
-    # Full list of qualifying papers with links
-    if results['qualifying_papers']:
-        click.echo("=" * 80)
-        click.echo("QUALIFYING PAPERS (sorted by citations)")
-        click.echo("=" * 80)
-        for i, paper in enumerate(results['qualifying_papers'], 1):
-            click.echo()
-            click.echo(f"{i}. {paper['title']}")
-            click.echo(f"   Year: {paper['year']} | Position: {paper['position']} author | Citations: {paper['citations']}")
-            if paper.get('pmid'):
-                click.echo(f"   PubMed:   https://pubmed.ncbi.nlm.nih.gov/{paper['pmid']}/")
-            if paper.get('doi'):
-                click.echo(f"   OpenAlex: https://openalex.org/works/https://doi.org/{paper['doi']}")
-
-    # Unmatched papers
-    unmatched = results.get('unmatched_papers', [])
-    if unmatched:
-        click.echo()
-        click.echo("=" * 80)
-        click.echo("UNMATCHED PAPERS (no citation data)")
-        click.echo("=" * 80)
-        for i, paper in enumerate(unmatched, 1):
-            click.echo()
-            click.echo(f"{i}. {paper['title']}")
-            click.echo(f"   Year: {paper['year']} | Position: {paper['position']} author")
-            if paper.get('pmid'):
-                click.echo(f"   PubMed: https://pubmed.ncbi.nlm.nih.gov/{paper['pmid']}/")
-            if paper.get('doi'):
-                click.echo(f"   DOI: {paper['doi']} (not found in OpenAlex)")
+        session.close()
+        if metrics_file:
+            REGISTRY.write(metrics_file)
+    if resume and output:
+        drop_superseded_errors(output)
+
+    click.echo(
+        f"Computed {summary['computed']} authors "
+        f"({summary['failed']} failed, {summary['skipped']} already done)",
+        err=True,
+    )
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path),
+              help="Merged NDJSON output file (default: stdout)")
+@click.option("--cache-db", "cache_dbs", multiple=True,
+              type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Shard cache database to merge into --cache-dir (repeatable)")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory receiving merged cache entries")
+def merge(inputs: tuple[Path, ...], output: Path | None, cache_dbs: tuple[Path, ...],
+          cache_dir: Path) -> None:
+    """Merge per-shard batch outputs (INPUTS) and cache databases.
+
+    Keeps one record per author, preferring the newest created_at. Merging
+    cache databases also merges their result stores, so that ``uindex
+    export`` covers every shard.
+    """
+    if inputs:
+        with click.open_file(str(output) if output else "-", "w") as out:
+            summary = merge_ndjson(inputs, out)
+        click.echo(f"Merged {summary['read']} records into {summary['written']} authors", err=True)
+
+    if cache_dbs:
+        cache = Cache(cache_dir / "cache.db")
+        store = ResultStore(cache_dir / "cache.db")
+        updated = sum(cache.merge_from(db) for db in cache_dbs)
+        authors = sum(store.merge_from(db) for db in cache_dbs)
+        click.echo(f"Merged {updated} cache entries and {authors} stored authors into {cache.db_path}",
+                   err=True)
+
+
+@main.command()
+@click.argument("out_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--from-ndjson", "inputs", multiple=True,
+              type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Export results from batch NDJSON output instead of the result store (repeatable)")
+@click.option("--format", "format_", type=click.Choice(["parquet", "arrow", "csv"]),
+              help="Table format (default: parquet when pyarrow is installed, else csv)")
+@click.option("--row-group-size", default=10_000, show_default=True,
+              help="Rows buffered per row group before writing")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory holding the result store")
+def export(out_dir: Path, inputs: tuple[Path, ...], format_: str | None, row_group_size: int,
+           cache_dir: Path) -> None:
+    """Export per-author metrics and per-paper records to OUT_DIR.
+
+    Writes authors and papers tables for every author computed with the
+    cache enabled, or for the records in --from-ndjson files.
+    """
+    results = read_ndjson_results(inputs) if inputs else ResultStore(cache_dir / "cache.db").results()
+    try:
+        paths = export_results(results, out_dir, format_ or default_format(), row_group_size)
+    except ImportError as e:
+        raise click.UsageError(str(e))
+    for path in paths.values():
+        click.echo(f"Wrote {path}", err=True)
+
+
+@main.command("ingest-pubmed")
+@click.argument("files", nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--index", "index_path", type=click.Path(dir_okay=False, path_type=Path),
+              help="Index database (default: pubmed-index.db in --cache-dir)")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory path")
+def ingest_pubmed_command(files: tuple[Path, ...], index_path: Path | None, cache_dir: Path) -> None:
+    """Build a local authorship index from PubMed baseline/update FILES.
+
+    Accepts the .xml.gz files from ftp.ncbi.nlm.nih.gov/pubmed/baseline and
+    /updatefiles; give update files after the baseline so revisions and
+    deletions apply in order. Use the index with --pubmed-index.
+    """
+    index = AuthorshipIndex(index_path or cache_dir / "pubmed-index.db")
+    for path in files:
+        count = ingest_pubmed(index, [path])
+        click.echo(f"Ingested {count} articles from {path.name}", err=True)
+    click.echo(f"Index {index.db_path} holds {len(index)} articles", err=True)
+
+
+@main.command("ingest-openalex")
+@click.argument("files", nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--index", "index_path", type=click.Path(dir_okay=False, path_type=Path),
+              help="Index database (default: openalex-index.db in --cache-dir)")
+@click.option("--cache-dir", type=click.Path(path_type=Path), default=DEFAULT_CACHE_DIR,
+              help="Cache directory path")
+def ingest_openalex_command(files: tuple[Path, ...], index_path: Path | None, cache_dir: Path) -> None:
+    """Build a local DOI citation index from OpenAlex works snapshot FILES.
+
+    Accepts the gzipped JSONL parts under data/works/ of the OpenAlex
+    snapshot; give them oldest updated_date first so newer counts win. Use
+    the index with --openalex-index.
+    """
+    index = CitationIndex(index_path or cache_dir / "openalex-index.db")
+    for path in files:
+        count = ingest_openalex(index, [path])
+        click.echo(f"Ingested {count} works from {path}", err=True)
+    click.echo(f"Index {index.db_path} holds {len(index)} DOIs", err=True)
+
+
+def _session(cache_dir: Path, no_cache: bool, pubmed_index: Path | None, openalex_index: Path | None,
+             max_connections: int = 20, http2: bool = False,
+             checkpoint: Checkpoint | None = None) -> UIndexSession:
+    try:
+        return UIndexSession(cache_dir, use_cache=not no_cache, pubmed_index=pubmed_index,
+                             openalex_index=openalex_index, max_connections=max_connections, http2=http2,
+                             checkpoint=checkpoint)
+    except ImportError:
+        raise click.UsageError("--http2 needs the h2 package: pip install 'uindex[http2]'")
 
 
 if __name__ == "__main__":
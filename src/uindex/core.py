@@ -1,21 +1,149 @@
 """Core U-index calculation logic."""
 
-from typing import TypedDict
+import time
 
+from uindex.doi import normalize_doi
+from uindex.metrics import AUTHOR_DURATION, AUTHORS_COMPUTED
 
-class Paper(TypedDict):
-    """A paper with citation count."""
 
-    citations: int
+CITATION_MAX_AGE = 7 * 24 * 60 * 60  # 7 days in seconds
 
 
-def calculate_u_index(papers: list[Paper]) -> int:
+class PaperRecord:
+    """A paper and the queried author's position on it.
+
+    Uses ``__slots__`` instead of a per-paper dict to keep large result sets
+    compact. Records are used end to end and converted with :meth:`to_dict`
+    and :meth:`from_dict` only at serialization boundaries (cache, JSON).
+    """
+
+    __slots__ = ("pmid", "title", "doi", "year", "position", "citations", "cited_at")
+
+    def __init__(self, pmid: str, title: str, doi: str | None, year: str,
+                 position: str | None, citations: int | None = None,
+                 cited_at: float | None = None):
+        self.pmid = pmid
+        self.title = title
+        self.doi = doi
+        self.year = year
+        self.position = position
+        self.citations = citations
+        # When ``citations`` was fetched (epoch seconds)
+        self.cited_at = cited_at
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PaperRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"PaperRecord(pmid={self.pmid!r}, position={self.position!r}, citations={self.citations!r})"
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-ready dict; unknown ``citations``/``cited_at`` are omitted."""
+        data = {
+            "pmid": self.pmid,
+            "title": self.title,
+            "doi": self.doi,
+            "year": self.year,
+            "position": self.position,
+        }
+        if self.citations is not None:
+            data["citations"] = self.citations
+        if self.cited_at is not None:
+            data["cited_at"] = self.cited_at
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PaperRecord":
+        return cls(
+            data.get("pmid"),
+            data.get("title", ""),
+            data.get("doi"),
+            data.get("year", ""),
+            data.get("position"),
+            data.get("citations"),
+            data.get("cited_at"),
+        )
+
+
+class UIndexResult:
+    """U-index results of one author.
+
+    ``qualifying_papers`` are the first/last-author papers with citation
+    data, most cited first; ``unmatched_papers`` the ones without. Like
+    PaperRecords, results are converted with :meth:`to_dict` only for the
+    cache, NDJSON and HTTP responses.
+    """
+
+    __slots__ = ("author", "u_index", "total_papers", "qualifying_count", "unmatched_count",
+                 "qualifying_papers", "unmatched_papers", "pmids", "created_at", "synced_on")
+
+    def __init__(self, author: str, u_index: int, total_papers: int, qualifying_count: int,
+                 unmatched_count: int, qualifying_papers: list[PaperRecord],
+                 unmatched_papers: list[PaperRecord], pmids: list[str],
+                 created_at: float | None = None, synced_on: str | None = None):
+        self.author = author
+        self.u_index = u_index
+        self.total_papers = total_papers
+        self.qualifying_count = qualifying_count
+        self.unmatched_count = unmatched_count
+        self.qualifying_papers = qualifying_papers
+        self.unmatched_papers = unmatched_papers
+        self.pmids = pmids
+        self.created_at = created_at
+        self.synced_on = synced_on
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UIndexResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"UIndexResult(author={self.author!r}, u_index={self.u_index!r}, "
+                f"qualifying_count={self.qualifying_count!r})")
+
+    def to_dict(self) -> dict:
+        """Convert to the JSON-ready dict stored in the cache and written by batch runs."""
+        return {
+            "author": self.author,
+            "total_papers": self.total_papers,
+            "qualifying_count": self.qualifying_count,
+            "qualifying_papers": [p.to_dict() for p in self.qualifying_papers],
+            "unmatched_count": self.unmatched_count,
+            "unmatched_papers": [p.to_dict() for p in self.unmatched_papers],
+            "u_index": self.u_index,
+            "pmids": self.pmids,
+            "created_at": self.created_at,
+            "synced_on": self.synced_on,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UIndexResult":
+        qualifying = [PaperRecord.from_dict(p) for p in data["qualifying_papers"]]
+        unmatched = [PaperRecord.from_dict(p) for p in data.get("unmatched_papers", [])]
+        return cls(
+            data["author"],
+            data["u_index"],
+            data.get("total_papers", 0),
+            # Results cached before qualifying_count existed
+            data.get("qualifying_count", len(qualifying) + data["unmatched_count"]),
+            data["unmatched_count"],
+            qualifying,
+            unmatched,
+            data.get("pmids", []),
+            data.get("created_at"),
+            data.get("synced_on"),
+        )
+
+
+def calculate_u_index(papers: list[PaperRecord]) -> int:
     """Calculate U-index from a list of papers with citation counts.
 
     U-index is the largest U where U papers have >= U citations each.
 
     Args:
-        papers: List of papers, each with a 'citations' key.
+        papers: Papers with known ``citations``.
 
     Returns:
         The U-index value.
@@ -23,13 +151,128 @@ def calculate_u_index(papers: list[Paper]) -> int:
     if not papers:
         return 0
 
-    sorted_papers = sorted(papers, key=lambda p: p["citations"], reverse=True)
+    sorted_papers = sorted(papers, key=lambda p: p.citations, reverse=True)
 
     u_index = 0
     for i, paper in enumerate(sorted_papers, start=1):
-        if paper["citations"] >= i:
+        if paper.citations >= i:
             u_index = i
         else:
             break
 
     return u_index
+
+
+def compute_author(author_name: str, pubmed, openalex) -> UIndexResult:
+    """Fetch an author's papers and citations and build the U-index results.
+
+    Args:
+        author_name: Author name as accepted by PubMed ("LastName FirstName").
+        pubmed: Client providing ``fetch_author_papers`` (returning PaperRecords).
+        openalex: Client providing ``get_citations_by_dois`` and
+            ``get_citations_by_pmids``.
+
+    Returns:
+        Results with qualifying/unmatched PaperRecords and the U-index.
+    """
+    with AUTHOR_DURATION.time():
+        papers = pubmed.fetch_author_papers(author_name)
+
+        # Filter to first/last authored
+        qualifying = [p for p in papers if p.position in ("first", "last")]
+
+        result = _build_result(author_name, [p.pmid for p in papers], qualifying, openalex)
+    AUTHORS_COMPUTED.inc()
+    return result
+
+
+def refresh_author(previous: UIndexResult, pubmed, openalex,
+                   max_citation_age: float = CITATION_MAX_AGE) -> UIndexResult:
+    """Incrementally update earlier results for an author.
+
+    Only PMIDs entered into PubMed since the last sync are fetched, and
+    citation counts are re-fetched only for papers whose counts are older
+    than ``max_citation_age`` seconds or still unknown. Falls back to
+    :func:`compute_author` for results without sync information.
+
+    Args:
+        previous: Earlier results; their PaperRecords are updated in place.
+        pubmed: Client providing ``fetch_author_papers`` with ``since``/``exclude``.
+        openalex: Client providing ``get_citations_by_dois`` and
+            ``get_citations_by_pmids``.
+        max_citation_age: Age in seconds after which citation counts are stale.
+
+    Returns:
+        Updated results with the U-index recomputed.
+    """
+    author_name = previous.author
+    if not previous.synced_on or not previous.pmids:
+        return compute_author(author_name, pubmed, openalex)
+
+    with AUTHOR_DURATION.time():
+        known = previous.pmids
+        new_papers = pubmed.fetch_author_papers(
+            author_name, since=previous.synced_on, exclude=set(known))
+
+        qualifying = [
+            *previous.qualifying_papers,
+            *previous.unmatched_papers,
+            *(p for p in new_papers if p.position in ("first", "last")),
+        ]
+        pmids = [*known, *(p.pmid for p in new_papers)]
+
+        result = _build_result(author_name, pmids, qualifying, openalex, max_citation_age)
+    AUTHORS_COMPUTED.inc()
+    return result
+
+
+def _build_result(author_name: str, pmids: list[str], qualifying: list[PaperRecord],
+                  openalex, max_citation_age: float = 0) -> UIndexResult:
+    now = time.time()
+
+    # Get citations for papers whose counts are unknown or stale
+    stale = [p for p in qualifying if p.cited_at is None or now - p.cited_at > max_citation_age]
+
+    # Canonical DOI -> papers; PubMed spellings vary and a DOI may repeat across PMIDs
+    by_doi: dict[str, list[PaperRecord]] = {}
+    for p in stale:
+        doi = normalize_doi(p.doi)
+        if doi:
+            by_doi.setdefault(doi, []).append(p)
+    doi_citations = openalex.get_citations_by_dois(list(by_doi)) if by_doi else {}
+    for doi, papers in by_doi.items():
+        if doi in doi_citations:
+            for paper in papers:
+                paper.citations = doi_citations[doi]
+                paper.cited_at = now
+
+    # Second pass by PMID for papers without a DOI or whose DOI OpenAlex lacks
+    by_pmid = {
+        p.pmid: p for p in stale
+        if p.pmid and normalize_doi(p.doi) not in doi_citations
+    }
+    pmid_citations = openalex.get_citations_by_pmids(list(by_pmid)) if by_pmid else {}
+    for pmid, count in pmid_citations.items():
+        if pmid in by_pmid:
+            by_pmid[pmid].citations = count
+            by_pmid[pmid].cited_at = now
+
+    cited = [p for p in qualifying if p.citations is not None]
+    unmatched = [p for p in qualifying if p.citations is None]
+
+    # Sort by citations descending
+    cited.sort(key=lambda p: p.citations, reverse=True)
+
+    return UIndexResult(
+        author_name,
+        calculate_u_index(cited),
+        len(pmids),
+        len(qualifying),
+        len(unmatched),
+        cited,
+        unmatched,
+        pmids,
+        created_at=now,
+        # PubMed entry dates have day precision; the next refresh re-searches this day
+        synced_on=time.strftime("%Y/%m/%d", time.gmtime(now)),
+    )
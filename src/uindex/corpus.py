@@ -0,0 +1,437 @@
+"""Synthetic PubMed/OpenAlex corpora generated from researcher archetypes.
+
+Expands the :data:`RESEARCHERS` profiles into papers whose citation counts
+give each researcher exactly the profile's h-index and U-index, mixed with
+background papers by other authors. Articles are derived from their PMID
+and the seed on demand, so corpora of millions of papers need no memory
+beyond the researcher list. A :class:`SyntheticCorpus` can be served by
+:class:`~uindex.standin.StandInServer` or written out as PubMed baseline
+and OpenAlex snapshot files::
+
+    python -m uindex.corpus out/ --researchers-per-profile 100 --background-papers 1000000
+"""
+
+import functools
+import gzip
+import json
+import random
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import click
+
+from uindex.doi import normalize_doi
+from uindex.names import AuthorNameMatcher, fold, name_tokens
+
+
+# Researcher profiles with synthetic data
+RESEARCHERS = [
+    {
+        "name": "Dr. Early",
+        "archetype": "Career Stage",
+        "description": "5 years post-PhD, primarily first-author experimental work",
+        "h": 12,
+        "u": 10,
+        "years": 5,
+        "h_base_rate": 2.4,
+        "collab_bonus": 0.4,
+    },
+    {
+        "name": "Dr. Midcareer",
+        "archetype": "Career Stage",
+        "description": "12 years in, mix of independent and supervised research",
+        "h": 25,
+        "u": 18,
+        "years": 12,
+        "h_base_rate": 1.5,
+        "collab_bonus": 0.58,
+    },
+    {
+        "name": "Dr. Senior",
+        "archetype": "Career Stage",
+        "description": "25 years experience, leads large lab with heavy supervision",
+        "h": 45,
+        "u": 22,
+        "years": 25,
+        "h_base_rate": 0.88,
+        "collab_bonus": 0.92,
+    },
+    {
+        "name": "Dr. Independent",
+        "archetype": "Leadership Style",
+        "description": "Runs small lab, still does own experiments",
+        "h": 20,
+        "u": 18,
+        "years": 15,
+        "h_base_rate": 1.2,
+        "collab_bonus": 0.13,
+    },
+    {
+        "name": "Dr. Collaborative",
+        "archetype": "Leadership Style",
+        "description": "Hub in large consortiums, many middle-author papers",
+        "h": 35,
+        "u": 8,
+        "years": 15,
+        "h_base_rate": 0.53,
+        "collab_bonus": 1.8,
+    },
+    {
+        "name": "Dr. Balanced",
+        "archetype": "Leadership Style",
+        "description": "Equal leadership and collaboration contributions",
+        "h": 28,
+        "u": 14,
+        "years": 15,
+        "h_base_rate": 0.93,
+        "collab_bonus": 0.93,
+    },
+    {
+        "name": "Dr. Consortium",
+        "archetype": "Edge Case",
+        "description": "Almost entirely middle-author consortium positions",
+        "h": 40,
+        "u": 3,
+        "years": 20,
+        "h_base_rate": 0.15,
+        "collab_bonus": 1.85,
+    },
+    {
+        "name": "Dr. Solo",
+        "archetype": "Edge Case",
+        "description": "Single-author theoretician, all papers are first/last",
+        "h": 15,
+        "u": 15,
+        "years": 20,
+        "h_base_rate": 0.75,
+        "collab_bonus": 0.0,
+    },
+]
+
+FIRST_PMID = 20_000_000
+CURRENT_YEAR = 2025
+# Papers per unit of yearly h_base_rate/collab_bonus
+PAPERS_PER_RATE = 2
+
+# Researcher and background surnames start from disjoint syllables, so
+# searching a researcher never matches a background author
+_RESEARCHER_SYLLABLES = ["ka", "lo", "mi", "re", "tu", "va", "so", "ne", "di", "ga", "pe", "ro"]
+_BACKGROUND_SYLLABLES = ["ba", "co", "fe", "hu", "ji", "ly", "mo", "ny", "qu", "sa", "te", "wi"]
+_FORE_NAMES = ["Anna", "Ben", "Chiara", "David", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+               "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Ravi", "Sofia", "Tomas", "Yuki"]
+_TITLE_WORDS = ["analysis", "cellular", "clinical", "cohort", "dynamics", "effects", "genomic",
+                "imaging", "immune", "long-term", "model", "network", "novel", "outcomes",
+                "patients", "protein", "response", "signaling", "study", "therapy", "tumor"]
+
+
+class Corpus:
+    """In-memory corpus of hand-picked articles.
+
+    Corpora served by :class:`~uindex.standin.StandInServer` provide
+    ``search``, ``article_xml``, ``work_by_doi`` and ``work_by_pmid``, like
+    this class and :class:`SyntheticCorpus`.
+    """
+
+    def __init__(self):
+        self._articles: dict[str, tuple[str, list[tuple[str, str]], str | None, str, int]] = {}
+        self._by_last_name: dict[str, list[str]] = {}
+        self._by_doi: dict[str, str] = {}
+
+    def add(self, pmid: str, title: str, authors: list[tuple[str, str]], doi: str | None,
+            year: str, cited_by_count: int = 0) -> None:
+        """Add an article; ``authors`` are ``(last_name, fore_name)`` pairs in order."""
+        self._articles[pmid] = (title, authors, doi, year, cited_by_count)
+        for last_name, _ in authors:
+            for token in name_tokens(last_name)[:1]:
+                self._by_last_name.setdefault(token, []).append(pmid)
+        if normalize_doi(doi):
+            self._by_doi[normalize_doi(doi)] = pmid
+
+    def search(self, author_name: str) -> list[str]:
+        """PMIDs with an author matching ``author_name``, as esearch ``[full]`` would."""
+        matcher = AuthorNameMatcher(author_name)
+        candidates = dict.fromkeys(
+            pmid for token in matcher.tokens for pmid in self._by_last_name.get(token, ()))
+        return [
+            pmid for pmid in candidates
+            if any(matcher.matches(last, fore) for last, fore in self._articles[pmid][1])
+        ]
+
+    def article_xml(self, pmid: str) -> str | None:
+        article = self._articles.get(pmid)
+        if article is None:
+            return None
+        title, authors, doi, year, _ = article
+        return article_xml(pmid, title, authors, doi, year)
+
+    def work_by_doi(self, doi: str) -> dict | None:
+        pmid = self._by_doi.get(doi)
+        return self.work_by_pmid(pmid) if pmid else None
+
+    def work_by_pmid(self, pmid: str) -> dict | None:
+        article = self._articles.get(pmid)
+        if article is None:
+            return None
+        return work_record(pmid, article[2], article[4])
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+
+def article_xml(pmid: str, title: str, authors: list[tuple[str, str]], doi: str | None,
+                year: str) -> str:
+    """Render a ``PubmedArticle`` element as efetch returns it."""
+    author_list = "".join(
+        f"<Author><LastName>{escape(last)}</LastName><ForeName>{escape(fore)}</ForeName>"
+        f"<Initials>{escape(''.join(t[0].upper() for t in name_tokens(fore)))}</Initials></Author>"
+        for last, fore in authors
+    )
+    eloc = f'<ELocationID EIdType="doi">{escape(doi)}</ELocationID>' if doi else ""
+    return (
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+        f"<ArticleTitle>{escape(title)}</ArticleTitle><AuthorList>{author_list}</AuthorList>{eloc}"
+        f"</Article><DateCompleted><Year>{year}</Year></DateCompleted></MedlineCitation></PubmedArticle>"
+    )
+
+
+def work_record(pmid: str, doi: str | None, cited_by_count: int) -> dict:
+    """Render an OpenAlex work with the fields the clients select."""
+    return {
+        "doi": f"https://doi.org/{normalize_doi(doi)}" if normalize_doi(doi) else None,
+        "ids": {"pmid": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}"},
+        "cited_by_count": cited_by_count,
+    }
+
+
+class SyntheticCorpus:
+    """Deterministic synthetic corpus of researcher and background papers.
+
+    Args:
+        researchers_per_profile: Researchers generated per profile.
+        background_papers: Papers by non-researcher authors.
+        doi_missing_rate: Fraction of papers without a DOI.
+        consortium_rate: Chance that a middle-author paper of a strongly
+            collaborative profile has a consortium-sized author list.
+        consortium_size: Range of authors on consortium papers.
+        coauthors: Range of authors on other papers.
+        seed: Seed for all generated content.
+        profiles: Researcher profiles (default :data:`RESEARCHERS`).
+    """
+
+    def __init__(self, researchers_per_profile: int = 1, background_papers: int = 0,
+                 doi_missing_rate: float = 0.1, consortium_rate: float = 0.3,
+                 consortium_size: tuple[int, int] = (200, 3000), coauthors: tuple[int, int] = (2, 12),
+                 seed: int = 0, profiles: list[dict] | None = None):
+        self.doi_missing_rate = doi_missing_rate
+        self.consortium_rate = consortium_rate
+        self.consortium_size = consortium_size
+        self.coauthors = coauthors
+        self.seed = seed
+        self.profiles = RESEARCHERS if profiles is None else profiles
+
+        self.researchers: list[dict] = []
+        self._researcher_profiles: list[dict] = []
+        self._by_name: dict[str, int] = {}
+        next_pmid = FIRST_PMID
+        for profile in self.profiles:
+            lead = max(profile["u"], round(profile["years"] * profile["h_base_rate"] * PAPERS_PER_RATE))
+            middle = max(profile["h"] - profile["u"],
+                         round(profile["years"] * profile["collab_bonus"] * PAPERS_PER_RATE))
+            for _ in range(researchers_per_profile):
+                index = len(self.researchers)
+                name = f"{_surname(_RESEARCHER_SYLLABLES, index)} {_FORE_NAMES[index % len(_FORE_NAMES)]}"
+                self.researchers.append({
+                    "name": name,
+                    "profile": profile["name"],
+                    "h": profile["h"],
+                    "u": profile["u"],
+                    "first_pmid": next_pmid,
+                    "lead_papers": lead,
+                    "middle_papers": middle,
+                })
+                self._researcher_profiles.append(profile)
+                self._by_name[fold(name)] = index
+                next_pmid += lead + middle
+        self._background_start = next_pmid
+        self._end = next_pmid + background_papers
+        self._plan = functools.lru_cache(maxsize=4096)(self._build_plan)
+
+    def __len__(self) -> int:
+        return self._end - FIRST_PMID
+
+    def pmids(self) -> Iterator[str]:
+        return map(str, range(FIRST_PMID, self._end))
+
+    def search(self, author_name: str) -> list[str]:
+        """PMIDs of a generated researcher; background authors are not searchable."""
+        index = self._by_name.get(fold(" ".join(author_name.split())))
+        if index is None:
+            return []
+        researcher = self.researchers[index]
+        start = researcher["first_pmid"]
+        return [str(p) for p in range(start, start + researcher["lead_papers"] + researcher["middle_papers"])]
+
+    def article_xml(self, pmid: str) -> str | None:
+        paper = self._paper(pmid)
+        if paper is None:
+            return None
+        return article_xml(pmid, paper["title"], paper["authors"], paper["doi"], paper["year"])
+
+    def work_by_doi(self, doi: str) -> dict | None:
+        # Generated DOIs end in the PMID
+        pmid = doi.rpartition(".")[2]
+        paper = self._paper(pmid) if pmid.isdigit() else None
+        if paper is None or normalize_doi(paper["doi"]) != doi:
+            return None
+        return work_record(pmid, paper["doi"], paper["citations"])
+
+    def work_by_pmid(self, pmid: str) -> dict | None:
+        paper = self._paper(pmid)
+        if paper is None:
+            return None
+        return work_record(pmid, paper["doi"], paper["citations"])
+
+    def iter_articles(self) -> Iterator[str]:
+        """``PubmedArticle`` XML of every paper, in PMID order."""
+        return map(self.article_xml, self.pmids())
+
+    def iter_works(self) -> Iterator[dict]:
+        """OpenAlex work records of every paper, in PMID order."""
+        return map(self.work_by_pmid, self.pmids())
+
+    def write_pubmed(self, out_dir: Path, articles_per_file: int = 30_000) -> list[Path]:
+        """Write gzipped PubmedArticleSet files like the PubMed baseline."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        articles = self.iter_articles()
+        while chunk := list(islice(articles, articles_per_file)):
+            path = out_dir / f"synthetic{len(paths) + 1:04d}.xml.gz"
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write('<?xml version="1.0" encoding="UTF-8"?>\n<PubmedArticleSet>\n')
+                for article in chunk:
+                    f.write(article + "\n")
+                f.write("</PubmedArticleSet>\n")
+            paths.append(path)
+        return paths
+
+    def write_openalex(self, out_dir: Path, works_per_file: int = 100_000) -> list[Path]:
+        """Write gzipped JSONL work files like the OpenAlex snapshot."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        works = self.iter_works()
+        while chunk := list(islice(works, works_per_file)):
+            path = out_dir / f"part_{len(paths):03d}.gz"
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.writelines(json.dumps(work) + "\n" for work in chunk)
+            paths.append(path)
+        return paths
+
+    def _paper(self, pmid: str) -> dict | None:
+        number = int(pmid) if pmid.isdigit() else -1
+        if not FIRST_PMID <= number < self._end:
+            return None
+        rng = random.Random((self.seed << 32) ^ number)
+        title = " ".join(rng.choices(_TITLE_WORDS, k=rng.randint(5, 12))).capitalize()
+        doi = None if rng.random() < self.doi_missing_rate else f"10.5555/synthetic.{number}"
+
+        if number >= self._background_start:
+            authors = [_background_author(rng) for _ in range(rng.randint(*self.coauthors))]
+            citations = min(int(rng.paretovariate(1.2)) - 1, 5000)
+            year = str(rng.randint(CURRENT_YEAR - 30, CURRENT_YEAR))
+            return {"title": title, "authors": authors, "doi": doi, "year": year, "citations": citations}
+
+        index = self._researcher_index(number)
+        researcher = self.researchers[index]
+        role, citations, year = self._plan(index)[number - researcher["first_pmid"]]
+        last_name, fore_name = researcher["name"].split(" ", 1)
+        me = (last_name, fore_name)
+        profile = self._researcher_profiles[index]
+
+        if role == "lead" and profile["collab_bonus"] == 0:
+            authors = [me]
+        elif role == "lead":
+            others = [_background_author(rng) for _ in range(max(1, rng.randint(*self.coauthors) - 1))]
+            authors = [me, *others] if rng.random() < 0.5 else [*others, me]
+        else:
+            consortium = rng.random() < self.consortium_rate * min(1.0, profile["collab_bonus"] / 1.5)
+            size = rng.randint(*self.consortium_size) if consortium else rng.randint(*self.coauthors)
+            authors = [_background_author(rng) for _ in range(max(2, size - 1))]
+            authors.insert(rng.randint(1, len(authors) - 1), me)
+        return {"title": title, "authors": authors, "doi": doi, "year": str(year), "citations": citations}
+
+    def _researcher_index(self, pmid: int) -> int:
+        low, high = 0, len(self.researchers) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.researchers[mid]["first_pmid"] <= pmid:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    def _build_plan(self, index: int) -> list[tuple[str, int, int]]:
+        """Role, citations and year of each paper of a researcher.
+
+        The top ``u`` lead papers and ``h - u`` middle papers get at least
+        ``h`` citations and all others fewer than ``u``, so the researcher's
+        h-index is exactly ``h`` and their U-index exactly ``u``.
+        """
+        researcher = self.researchers[index]
+        profile = self._researcher_profiles[index]
+        rng = random.Random((self.seed << 32) ^ (index + 1) ^ 0x5EED)
+        h, u = researcher["h"], researcher["u"]
+
+        def cited(high: bool) -> int:
+            return rng.randint(h, 3 * h + 10) if high else rng.randint(0, max(u - 1, 0))
+
+        plan = [("lead", cited(i < u)) for i in range(researcher["lead_papers"])]
+        plan += [("middle", cited(i < h - u)) for i in range(researcher["middle_papers"])]
+        rng.shuffle(plan)
+        first_year = CURRENT_YEAR - profile["years"]
+        return [(role, citations, rng.randint(first_year, CURRENT_YEAR)) for role, citations in plan]
+
+
+def _surname(syllables: list[str], index: int) -> str:
+    # Distinct indexes give distinct names: the index in base len(syllables)
+    parts = [syllables[index % len(syllables)]]
+    index //= len(syllables)
+    while len(parts) < 3 or index:
+        parts.append(syllables[index % len(syllables)])
+        index //= len(syllables)
+    return "".join(parts).capitalize()
+
+
+def _background_author(rng: random.Random) -> tuple[str, str]:
+    return _surname(_BACKGROUND_SYLLABLES, rng.randrange(len(_BACKGROUND_SYLLABLES) ** 4)), rng.choice(_FORE_NAMES)
+
+
+@click.command()
+@click.argument("out_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--researchers-per-profile", default=10, show_default=True)
+@click.option("--background-papers", default=100_000, show_default=True)
+@click.option("--doi-missing-rate", default=0.1, show_default=True)
+@click.option("--consortium-rate", default=0.3, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+def main(out_dir: Path, researchers_per_profile: int, background_papers: int,
+         doi_missing_rate: float, consortium_rate: float, seed: int) -> None:
+    """Write a synthetic corpus to OUT_DIR as PubMed baseline and OpenAlex snapshot files.
+
+    Also writes researchers.ndjson with each researcher's expected h and U,
+    usable as a batch roster.
+    """
+    corpus = SyntheticCorpus(researchers_per_profile, background_papers, doi_missing_rate,
+                             consortium_rate, seed=seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / "researchers.ndjson", "w") as f:
+        for researcher in corpus.researchers:
+            f.write(json.dumps(researcher) + "\n")
+    pubmed = corpus.write_pubmed(out_dir / "pubmed")
+    openalex = corpus.write_openalex(out_dir / "openalex")
+    click.echo(f"Wrote {len(corpus)} papers by {len(corpus.researchers)} researchers "
+               f"({len(pubmed)} PubMed files, {len(openalex)} OpenAlex files)", err=True)
+
+
+if __name__ == "__main__":
+    main()
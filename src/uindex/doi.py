@@ -0,0 +1,31 @@
+"""DOI canonicalization shared by every citation lookup path."""
+
+import re
+
+
+_PREFIX = re.compile(r"^(?:doi:\s*|(?:https?://)?(?:dx\.)?doi\.org/)+", re.IGNORECASE)
+_TRAILING = ".,;:'\""
+
+
+def normalize_doi(doi: str | None) -> str | None:
+    """Canonical form of a DOI for matching, or None if it is not a DOI.
+
+    Lowercases (DOIs are case-insensitive) and strips ``doi:`` prefixes,
+    ``doi.org`` URL forms, surrounding whitespace and trailing punctuation,
+    e.g. ``"doi: 10.1000/ABC."`` and ``"https://doi.org/10.1000/abc"`` both
+    become ``"10.1000/abc"``.
+    """
+    if not doi:
+        return None
+    canonical = _PREFIX.sub("", doi.strip()).strip().lower()
+    while canonical and (canonical[-1] in _TRAILING or _unbalanced_close(canonical)):
+        canonical = canonical[:-1]
+    return canonical if canonical.startswith("10.") and "/" in canonical else None
+
+
+def _unbalanced_close(text: str) -> bool:
+    # A closing bracket is part of DOIs like 10.1002/(sici)...(199603); only drop strays
+    for opening, closing in ("()", "[]"):
+        if text[-1] == closing:
+            return text.count(closing) > text.count(opening)
+    return False
@@ -0,0 +1,191 @@
+"""Columnar export of U-index results for analysis tools.
+
+Writes two tables to a directory:
+
+* ``authors``: one row per author with the summary metrics
+* ``papers``: one row per first/last-author paper, keyed by author and PMID
+
+Parquet (or the Arrow IPC file format, which tools can memory-map without
+copying) needs the optional ``pyarrow`` package (``pip install
+uindex[parquet]``); CSV works everywhere. Rows are written in row groups of
+``row_group_size`` as results stream in, so exporting a large cohort holds
+at most one group per table in memory::
+
+    export_results(ResultStore(db_path).results(), Path("cohort"))
+    export_results(read_ndjson_results([Path("batch.ndjson")]), Path("cohort"), "csv")
+
+    pandas.read_parquet("cohort/papers.parquet")
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Literal
+
+from uindex.core import UIndexResult
+
+
+Format = Literal["parquet", "arrow", "csv"]
+
+# Column names and Arrow types (pyarrow type factory names)
+AUTHOR_COLUMNS = (
+    ("author", "string"),
+    ("u_index", "int64"),
+    ("total_papers", "int64"),
+    ("qualifying_count", "int64"),
+    ("unmatched_count", "int64"),
+    ("leadership_share", "float64"),
+    ("created_at", "float64"),
+    ("synced_on", "string"),
+)
+PAPER_COLUMNS = (
+    ("author", "string"),
+    ("pmid", "string"),
+    ("title", "string"),
+    ("doi", "string"),
+    ("year", "string"),
+    ("position", "string"),
+    ("citations", "int64"),
+    ("cited_at", "float64"),
+)
+
+_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def default_format() -> Format:
+    """Parquet when ``pyarrow`` is installed, CSV otherwise."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "csv"
+    return "parquet"
+
+
+def export_results(results: Iterable[UIndexResult], out_dir: Path, format: Format | None = None,
+                   row_group_size: int = 10_000) -> dict[str, Path]:
+    """Write authors and papers tables for ``results`` to ``out_dir``.
+
+    Returns:
+        Paths of the ``authors`` and ``papers`` tables.
+
+    Raises:
+        ImportError: If Parquet or Arrow output is requested and ``pyarrow``
+            is not installed.
+    """
+    format = format or default_format()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {name: out_dir / f"{name}{_SUFFIXES[format]}" for name in ("authors", "papers")}
+    with _writer(paths["authors"], AUTHOR_COLUMNS, format, row_group_size) as authors, \
+            _writer(paths["papers"], PAPER_COLUMNS, format, row_group_size) as papers:
+        for result in results:
+            authors.write(author_row(result))
+            for row in paper_rows(result):
+                papers.write(row)
+    return paths
+
+
+def author_row(result: UIndexResult) -> tuple:
+    """Row of the ``authors`` table, in ``AUTHOR_COLUMNS`` order."""
+    share = result.qualifying_count / result.total_papers if result.total_papers else None
+    return (result.author, result.u_index, result.total_papers, result.qualifying_count,
+            result.unmatched_count, share, result.created_at, result.synced_on)
+
+
+def paper_rows(result: UIndexResult, top: int | None = None) -> Iterator[tuple]:
+    """Rows of the ``papers`` table, in ``PAPER_COLUMNS`` order: cited papers first.
+
+    ``top`` keeps only the first ``top`` cited and uncited papers.
+    """
+    for paper in [*result.qualifying_papers[:top], *result.unmatched_papers[:top]]:
+        yield (result.author, paper.pmid, paper.title, paper.doi, paper.year, paper.position,
+               paper.citations, paper.cited_at)
+
+
+def read_ndjson_results(paths: Iterable[Path]) -> Iterator[UIndexResult]:
+    """Results from batch NDJSON outputs, skipping error records."""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if "error" not in record:
+                        yield UIndexResult.from_dict(record)
+
+
+def _writer(path: Path, columns: tuple, format: Format, row_group_size: int):
+    if format == "csv":
+        return _CsvWriter(path, columns, row_group_size)
+    return _ArrowWriter(path, columns, format, row_group_size)
+
+
+class _CsvWriter:
+    """Writes rows to CSV, flushing every ``row_group_size`` rows."""
+
+    def __init__(self, path: Path, columns: tuple, row_group_size: int):
+        self.row_group_size = row_group_size
+        self._rows: list[tuple] = []
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(name for name, _ in columns)
+
+    def write(self, row: tuple) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._csv.writerows(self._rows)
+        self._rows.clear()
+
+    def __enter__(self) -> "_CsvWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._flush()
+        self._file.close()
+
+
+class _ArrowWriter:
+    """Writes rows to Parquet or Arrow IPC, one record batch per ``row_group_size`` rows."""
+
+    def __init__(self, path: Path, columns: tuple, format: Format, row_group_size: int):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(f"{format} export needs pyarrow: pip install 'uindex[parquet]'") from None
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in columns])
+        self._columns: list[list] = [[] for _ in columns]
+        self._count = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, row: tuple) -> None:
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self._count += 1
+        if self._count >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._count:
+            return
+        import pyarrow as pa
+        self._writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(self._columns, self.schema)],
+            schema=self.schema,
+        ))
+        for column in self._columns:
+            column.clear()
+        self._count = 0
+
+    def __enter__(self) -> "_ArrowWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._flush()
+        self._writer.close()
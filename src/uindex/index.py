@@ -0,0 +1,279 @@
+"""Local SQLite indexes built from offline PubMed and OpenAlex dumps."""
+
+import gzip
+import json
+import sqlite3
+import xml.etree.ElementTree as ET
+from collections.abc import Collection, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from uindex.core import PaperRecord
+from uindex.doi import normalize_doi
+from uindex.names import AuthorNameMatcher, name_tokens
+from uindex.openalex import normalize_pmid
+from uindex.pubmed import parse_article_metadata
+
+
+class AuthorshipIndex:
+    """Local authorship index built from PubMed baseline/update files.
+
+    Maps author names to PMIDs with the author's position, DOI, title and
+    year, so :class:`~uindex.pubmed.PubMedClient` can answer
+    ``fetch_author_papers`` without network calls. Authorships are keyed by
+    the first token of the folded last name and then checked with
+    :class:`~uindex.names.AuthorNameMatcher`.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    pmid TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    doi TEXT,
+                    year TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS authorships (
+                    last_key TEXT NOT NULL,
+                    last_name TEXT NOT NULL,
+                    fore_name TEXT NOT NULL,
+                    initials TEXT NOT NULL,
+                    pmid TEXT NOT NULL,
+                    position TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS authorships_last_key ON authorships (last_key);
+                CREATE INDEX IF NOT EXISTS authorships_pmid ON authorships (pmid);
+            """)
+
+    def ingest(self, path: Path) -> int:
+        """Stream a PubMed ``.xml`` or ``.xml.gz`` file into the index.
+
+        Articles already in the index are replaced (update files revise
+        records), and ``DeleteCitation`` entries are removed.
+
+        Returns:
+            Number of articles ingested.
+        """
+        opener = gzip.open if path.suffix == ".gz" else open
+        count = 0
+        with opener(path, "rb") as f, sqlite3.connect(self.db_path) as conn:
+            root = None
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if root is None:
+                    root = elem
+                if event != "end":
+                    continue
+                if elem.tag == "PubmedArticle":
+                    self._insert_article(conn, elem)
+                    count += 1
+                elif elem.tag == "DeleteCitation":
+                    self._delete(conn, [pmid.text for pmid in elem.iter("PMID") if pmid.text])
+                else:
+                    continue
+                # Drop finished records so memory stays flat on multi-GB files
+                root.clear()
+        return count
+
+    def _insert_article(self, conn: sqlite3.Connection, article: ET.Element) -> None:
+        article_elem, paper = parse_article_metadata(article)
+        self._delete(conn, [paper.pmid])
+        conn.execute(
+            "INSERT INTO articles (pmid, title, doi, year) VALUES (?, ?, ?, ?)",
+            (paper.pmid, paper.title, paper.doi, paper.year)
+        )
+
+        author_list = article_elem.find("AuthorList")
+        authors = list(author_list) if author_list is not None else []
+        rows = []
+        for i, author in enumerate(authors):
+            last_name = author.findtext("LastName") or ""
+            tokens = name_tokens(last_name)
+            if not tokens:
+                continue  # CollectiveName entries
+            if i == 0:
+                position = "first"
+            elif i == len(authors) - 1:
+                position = "last"
+            else:
+                position = "middle"
+            rows.append((
+                tokens[0],
+                last_name,
+                author.findtext("ForeName") or "",
+                author.findtext("Initials") or "",
+                paper.pmid,
+                position,
+            ))
+        conn.executemany(
+            """
+            INSERT INTO authorships (last_key, last_name, fore_name, initials, pmid, position)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+
+    def _delete(self, conn: sqlite3.Connection, pmids: list[str]) -> None:
+        conn.executemany("DELETE FROM articles WHERE pmid = ?", [(p,) for p in pmids])
+        conn.executemany("DELETE FROM authorships WHERE pmid = ?", [(p,) for p in pmids])
+
+    def author_papers(self, author_name: str, classify_middle: bool = False,
+                      exclude: Collection[str] = ()) -> list[PaperRecord]:
+        """Papers of an author, with positions as PubMedClient reports them.
+
+        Unlike PubMed's ``[full]`` author search, which the live client trusts
+        for the paper list, the index only knows an authorship when the name
+        matcher accepts it. So ``total_papers`` counts matched authorships
+        here, while the live client counts every esearch hit, including hits
+        where no author matches the name. Leadership shares computed from the
+        index are therefore slightly higher for authors with such hits.
+        """
+        matcher = AuthorNameMatcher(author_name)
+        keys = list(matcher.tokens)
+        if not keys:
+            return []
+
+        placeholders = ",".join("?" * len(keys))
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT a.last_name, a.fore_name, a.initials, a.position,
+                       p.pmid, p.title, p.doi, p.year
+                FROM authorships a JOIN articles p ON p.pmid = a.pmid
+                WHERE a.last_key IN ({placeholders})
+                ORDER BY p.pmid
+                """,
+                keys
+            ).fetchall()
+
+        papers: dict[str, PaperRecord] = {}
+        for last_name, fore_name, initials, position, pmid, title, doi, year in rows:
+            if pmid in exclude or not matcher.matches(last_name, fore_name, initials):
+                continue
+            if position == "middle" and not classify_middle:
+                position = None
+            current = papers.get(pmid)
+            # Prefer a leading position if the name matches several authors
+            if current is None or (current.position not in ("first", "last") and position):
+                papers[pmid] = PaperRecord(pmid, title, doi, year, position)
+        return list(papers.values())
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def ingest_pubmed(index: AuthorshipIndex, paths: Iterable[Path]) -> int:
+    """Ingest several PubMed baseline/update files in order."""
+    return sum(index.ingest(path) for path in paths)
+
+
+class CitationIndex:
+    """Local citation index built from an OpenAlex works snapshot.
+
+    Maps canonical DOIs (:func:`~uindex.doi.normalize_doi`) and PMIDs to
+    ``cited_by_count`` and implements ``get_citations_by_dois`` and
+    ``get_citations_by_pmids`` like :class:`~uindex.openalex.OpenAlexClient`,
+    so it can stand in for the live API in bulk runs.
+    """
+
+    INSERT_BATCH_SIZE = 10_000
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS citations (
+                    doi TEXT PRIMARY KEY,
+                    cited_by_count INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS pmid_citations (
+                    pmid TEXT PRIMARY KEY,
+                    cited_by_count INTEGER NOT NULL
+                ) WITHOUT ROWID;
+            """)
+
+    def ingest(self, path: Path) -> int:
+        """Stream an OpenAlex works ``.gz`` (or plain) JSONL file into the index.
+
+        Works already in the index are overwritten, so snapshot partitions
+        should be ingested oldest ``updated_date`` first.
+
+        Returns:
+            Number of works with a DOI or PMID ingested.
+        """
+        opener = gzip.open if path.suffix == ".gz" else open
+        count = 0
+        with opener(path, "rt", encoding="utf-8") as f, sqlite3.connect(self.db_path) as conn:
+            rows = self._rows(f)
+            while chunk := list(islice(rows, self.INSERT_BATCH_SIZE)):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO citations (doi, cited_by_count) VALUES (?, ?)",
+                    [(doi, cited) for doi, _, cited in chunk if doi]
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pmid_citations (pmid, cited_by_count) VALUES (?, ?)",
+                    [(pmid, cited) for _, pmid, cited in chunk if pmid]
+                )
+                count += len(chunk)
+        return count
+
+    def _rows(self, lines: Iterable[str]) -> Iterator[tuple[str | None, str | None, int]]:
+        for line in lines:
+            if not line.strip():
+                continue
+            work = json.loads(line)
+            doi = normalize_doi(work.get("doi"))
+            pmid = normalize_pmid((work.get("ids") or {}).get("pmid"))
+            if doi or pmid:
+                yield doi, pmid, work.get("cited_by_count") or 0
+
+    def get_citations_by_dois(self, dois: list[str]) -> dict[str, int]:
+        """Get citation counts for a list of DOIs.
+
+        Returns a dict mapping canonical DOI -> citation count.
+        DOIs not in the index are omitted from the result.
+        """
+        keys = list(dict.fromkeys(filter(None, map(normalize_doi, dois))))
+        return self._lookup("SELECT doi, cited_by_count FROM citations WHERE doi", keys)
+
+    def get_citations_by_pmids(self, pmids: list[str]) -> dict[str, int]:
+        """Get citation counts for a list of PMIDs.
+
+        Returns a dict mapping PMID -> citation count.
+        PMIDs not in the index are omitted from the result.
+        """
+        keys = list(dict.fromkeys(filter(None, map(normalize_pmid, pmids))))
+        return self._lookup("SELECT pmid, cited_by_count FROM pmid_citations WHERE pmid", keys)
+
+    def _lookup(self, query: str, keys: list[str]) -> dict[str, int]:
+        results = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for i in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+                batch = keys[i:i + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                results.update(conn.execute(f"{query} IN ({placeholders})", batch).fetchall())
+        return results
+
+    def close(self) -> None:
+        """Nothing to release; connections are opened per call."""
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM citations").fetchone()[0]
+
+
+def ingest_openalex(index: CitationIndex, paths: Iterable[Path]) -> int:
+    """Ingest several OpenAlex works snapshot files in order."""
+    return sum(index.ingest(path) for path in paths)
+
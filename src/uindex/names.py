@@ -0,0 +1,82 @@
+"""Author name normalization and matching."""
+
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Case-fold text and strip diacritics (NFKD), e.g. "Müller" -> "muller"."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def name_tokens(text: str) -> list[str]:
+    """Split a name into folded word tokens, dropping punctuation and hyphens."""
+    return _TOKEN.findall(fold(text))
+
+
+class AuthorNameMatcher:
+    """Matches PubMed ``Author`` elements against a queried author name.
+
+    Built once per query and reused for every article. Each query token must
+    match a token of the author's last or fore name exactly, or as an
+    initial: a single-letter query token matches a name starting with it, a
+    fore name written as initials ("J", "J A") matches query tokens starting
+    with them, and a query token may equal the author's initials (e.g.
+    "Smith JA"). The initials of a full fore name do not stand in for other
+    fore names: "Smith John" does not match "Smith, Jane (J)". At least one
+    multi-letter query token (usually the surname) must match exactly.
+    """
+
+    __slots__ = ("name", "tokens", "_words", "_prefilter")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.tokens = tuple(dict.fromkeys(name_tokens(name)))
+        self._words = frozenset(t for t in self.tokens if len(t) > 1)
+        # Cheap rejection before tokenizing: most authors on a paper are someone else
+        self._prefilter = re.compile("|".join(map(re.escape, self._words))) if self._words else None
+
+    def matches(self, last_name: str, fore_name: str, initials: str = "") -> bool:
+        """Check whether an author with these name parts matches the query."""
+        text = fold(f"{last_name} {fore_name}")
+        if self._prefilter is not None and self._prefilter.search(text) is None:
+            return False
+        return self._matches_tokens(text, fore_name, initials)
+
+    def matches_element(self, author: ET.Element) -> bool:
+        """Check whether a PubMed ``Author`` element matches the query."""
+        last_name = author.findtext("LastName") or ""
+        fore_name = author.findtext("ForeName") or ""
+        text = fold(f"{last_name} {fore_name}")
+        if self._prefilter is not None and self._prefilter.search(text) is None:
+            return False
+        return self._matches_tokens(text, fore_name, author.findtext("Initials") or "")
+
+    def _matches_tokens(self, text: str, fore_name: str, initials: str) -> bool:
+        candidate = set(_TOKEN.findall(text))
+        if self._words and candidate.isdisjoint(self._words):
+            return False
+
+        fore = name_tokens(fore_name)
+        initials = fold(initials) if initials else "".join(t[0] for t in fore)
+        # Only a fore name written as initials ("J", "J A") stands for any name with those letters
+        fore_initials = [t for t in fore if len(t) == 1] if all(len(t) == 1 for t in fore) else []
+
+        for token in self.tokens:
+            if token in candidate:
+                continue
+            if len(token) == 1 and any(c.startswith(token) for c in candidate):
+                continue
+            if len(token) > 1 and token == initials:
+                continue
+            if any(token.startswith(c) for c in fore_initials):
+                continue
+            return False
+        return True
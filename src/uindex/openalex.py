@@ -1,57 +1,145 @@
 """OpenAlex API client for citation data."""
 
+from collections.abc import Iterator
+
 import httpx
 
+from uindex.checkpoint import Checkpoint, unit_key
+from uindex.doi import normalize_doi
+from uindex.metrics import BYTES_PARSED
+from uindex.singleflight import SingleFlight
+from uindex.transport import DEFAULT_HEADERS, MAX_URL_LENGTH, build_transport, split_batches
+
+
+def normalize_pmid(pmid: str | None) -> str | None:
+    """PMID from an OpenAlex ``ids.pmid`` URL (or a bare PMID), or None."""
+    if not pmid:
+        return None
+    pmid = pmid.rstrip("/").rsplit("/", 1)[-1].strip()
+    return pmid if pmid.isdigit() else None
+
 
 class OpenAlexClient:
     """Client for fetching citation counts from OpenAlex."""
 
     BASE_URL = "https://api.openalex.org"
     BATCH_SIZE = 50
-
-    def __init__(self, timeout: float = 30.0):
-        self.client = httpx.Client(timeout=timeout)
+    # URL room kept for everything but the filter values, including a page cursor
+    URL_OVERHEAD = 512
+
+    def __init__(self, timeout: float = 30.0, transport: httpx.BaseTransport | None = None,
+                 checkpoint: Checkpoint | None = None, base_url: str | None = None):
+        self.client = httpx.Client(timeout=timeout, transport=transport or build_transport("openalex"),
+                                   headers=DEFAULT_HEADERS)
+        self.checkpoint = checkpoint
+        # Coalesces identical batch lookups from concurrent threads
+        self._flight = SingleFlight()
+        self.base_url = base_url.rstrip("/") if base_url else self.BASE_URL
 
     def get_citations_by_dois(self, dois: list[str]) -> dict[str, int]:
         """Get citation counts for a list of DOIs.
 
-        Returns a dict mapping DOI -> citation count.
+        Returns a dict mapping canonical DOI (see
+        :func:`~uindex.doi.normalize_doi`) -> citation count.
         DOIs not found in OpenAlex are omitted from the result.
         """
-        if not dois:
+        # Spelling variants of one DOI share a slot in the batch
+        canonical = list(dict.fromkeys(filter(None, map(normalize_doi, dois))))
+        if not canonical:
             return {}
 
         results = {}
 
-        # Process in batches of 50
-        for i in range(0, len(dois), self.BATCH_SIZE):
-            batch = dois[i:i + self.BATCH_SIZE]
+        # Process in batches of 50, fewer if long DOIs would overflow the URL
+        for batch in self._batches(canonical):
             batch_results = self._fetch_batch(batch)
             results.update(batch_results)
 
         return results
 
+    def get_citations_by_pmids(self, pmids: list[str]) -> dict[str, int]:
+        """Get citation counts for a list of PubMed IDs.
+
+        Fallback for papers without a DOI, or whose DOI OpenAlex does not
+        know. Returns a dict mapping PMID -> citation count; PMIDs not found
+        in OpenAlex are omitted from the result.
+        """
+        pmids = list(dict.fromkeys(filter(None, map(normalize_pmid, pmids))))
+        results = {}
+        for batch in self._batches(pmids):
+            results.update(self._fetch_pmid_batch(batch))
+        return results
+
+    def _batches(self, values: list[str]) -> Iterator[list[str]]:
+        return split_batches(values, self.BATCH_SIZE, MAX_URL_LENGTH - self.URL_OVERHEAD)
+
     def _fetch_batch(self, dois: list[str]) -> dict[str, int]:
-        """Fetch citation counts for a batch of DOIs."""
+        """Fetch citation counts for a batch of DOIs, reusing checkpointed batches."""
+        unit = unit_key("openalex", dois)
+        if self.checkpoint:
+            done = self.checkpoint.get(unit)
+            if done is not None:
+                return done
+        return self._flight.do(unit, lambda: self._fetch_dois(unit, dois))
+
+    def _fetch_dois(self, unit: str, dois: list[str]) -> dict[str, int]:
+        results = {}
         # OpenAlex filter format: doi:10.1000/x|10.1000/y
-        doi_filter = "|".join(dois)
-        url = f"{self.BASE_URL}/works?filter=doi:{doi_filter}&select=doi,cited_by_count"
+        for work in self._works(f"doi:{'|'.join(dois)}", "doi,cited_by_count"):
+            # OpenAlex returns full URLs
+            doi = normalize_doi(work.get("doi"))
+            if doi:
+                results[doi] = work.get("cited_by_count", 0)
 
-        response = self.client.get(url)
-        response.raise_for_status()
+        if self.checkpoint:
+            self.checkpoint.set(unit, results)
 
-        data = response.json()
+        return results
+
+    def _fetch_pmid_batch(self, pmids: list[str]) -> dict[str, int]:
+        """Fetch citation counts for a batch of PMIDs, reusing checkpointed batches."""
+        unit = unit_key("openalex-pmid", pmids)
+        if self.checkpoint:
+            done = self.checkpoint.get(unit)
+            if done is not None:
+                return done
+        return self._flight.do(unit, lambda: self._fetch_pmids(unit, pmids))
+
+    def _fetch_pmids(self, unit: str, pmids: list[str]) -> dict[str, int]:
         results = {}
+        for work in self._works(f"ids.pmid:{'|'.join(pmids)}", "ids,cited_by_count"):
+            pmid = normalize_pmid((work.get("ids") or {}).get("pmid"))
+            if pmid:
+                results[pmid] = work.get("cited_by_count", 0)
 
-        for work in data.get("results", []):
-            doi = work.get("doi", "")
-            if doi:
-                # OpenAlex returns full URL, normalize to just the DOI
-                normalized_doi = doi.replace("https://doi.org/", "")
-                results[normalized_doi] = work.get("cited_by_count", 0)
+        if self.checkpoint:
+            self.checkpoint.set(unit, results)
 
         return results
 
+    def _works(self, works_filter: str, select: str) -> Iterator[dict]:
+        """Yield all works matching a filter, following cursor pagination."""
+        cursor = "*"
+        seen = 0
+        while cursor:
+            # Encoded by httpx, as split_batches assumes when budgeting the filter
+            response = self.client.get(f"{self.base_url}/works", params={
+                "filter": works_filter, "select": select, "per-page": self.BATCH_SIZE, "cursor": cursor,
+            })
+            response.raise_for_status()
+
+            BYTES_PARSED.inc(len(response.content), upstream="openalex")
+            data = response.json()
+            works = data.get("results", [])
+            yield from works
+
+            seen += len(works)
+            meta = data.get("meta") or {}
+            # The last page still carries a cursor; stop once everything was seen
+            if not works or seen >= meta.get("count", seen):
+                break
+            cursor = meta.get("next_cursor")
+
     def close(self) -> None:
         """Close the HTTP client."""
         self.client.close()
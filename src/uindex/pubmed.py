@@ -1,111 +1,201 @@
 """PubMed E-utilities API client."""
 
+import copy
 import xml.etree.ElementTree as ET
-from typing import Literal
+from collections.abc import Collection
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import quote
 
 import httpx
 
+from uindex.checkpoint import Checkpoint, unit_key
+from uindex.core import PaperRecord
+from uindex.metrics import BYTES_PARSED
+from uindex.names import AuthorNameMatcher
+from uindex.singleflight import SingleFlight
+from uindex.transport import DEFAULT_HEADERS, MAX_URL_LENGTH, build_transport
+
+if TYPE_CHECKING:
+    from uindex.index import AuthorshipIndex
+
 
 Position = Literal["first", "last", "middle"] | None
 
 
+def parse_article_metadata(article: ET.Element) -> tuple[ET.Element, PaperRecord]:
+    """Parse PMID, title, DOI and year of a ``PubmedArticle`` element.
+
+    Returns:
+        The ``Article`` element (holding the author list) and a PaperRecord
+        without author position.
+    """
+    citation = article.find(".//MedlineCitation")
+    article_elem = citation.find(".//Article")
+
+    pmid = citation.findtext(".//PMID", "")
+    title = article_elem.findtext(".//ArticleTitle", "")
+
+    # Get DOI
+    doi = None
+    for eloc in article_elem.findall(".//ELocationID"):
+        if eloc.get("EIdType") == "doi":
+            doi = eloc.text
+            break
+
+    # Get year
+    year = citation.findtext(".//DateCompleted/Year", "")
+    if not year:
+        year = citation.findtext(".//PubDate/Year", "")
+
+    return article_elem, PaperRecord(pmid, title, doi, year, None)
+
+
 class PubMedClient:
     """Client for fetching author publications from PubMed."""
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
-
-    def __init__(self, timeout: float = 30.0):
-        self.client = httpx.Client(timeout=timeout)
-
-    def fetch_author_papers(self, author_name: str) -> list[dict]:
-        """Fetch all papers for an author and determine their position on each."""
-        pmids = self._search_author(author_name)
+    EFETCH_BATCH_SIZE = 200
+
+    def __init__(self, timeout: float = 30.0, transport: httpx.BaseTransport | None = None,
+                 checkpoint: Checkpoint | None = None, index: "AuthorshipIndex | None" = None,
+                 base_url: str | None = None):
+        self.client = httpx.Client(timeout=timeout, transport=transport or build_transport("pubmed"),
+                                   headers=DEFAULT_HEADERS)
+        self.checkpoint = checkpoint
+        self.index = index
+        # Coalesces identical esearch/efetch calls from concurrent threads
+        self._flight = SingleFlight()
+        self.base_url = base_url.rstrip("/") if base_url else self.BASE_URL
+
+    def fetch_author_papers(self, author_name: str, classify_middle: bool = False,
+                            since: str | None = None,
+                            exclude: Collection[str] = ()) -> list[PaperRecord]:
+        """Fetch all papers for an author and determine their position on each.
+
+        Only the first and last authors are inspected unless ``classify_middle``
+        is set, in which case the full author list is scanned and middle
+        authorships are reported as ``"middle"`` instead of ``None``.
+
+        For incremental updates, ``since`` ("YYYY/MM/DD") limits the search to
+        papers entered into PubMed on or after that date, and PMIDs in
+        ``exclude`` are not fetched.
+
+        With a local ``index`` (see :class:`~uindex.index.AuthorshipIndex`) the
+        papers are answered from it without network calls; ``since`` is then
+        ignored since the index holds whatever was ingested.
+        """
+        if self.index is not None:
+            return self.index.author_papers(author_name, classify_middle, exclude)
+
+        pmids = self._search_author(author_name, since)
+        if exclude:
+            pmids = [pmid for pmid in pmids if pmid not in exclude]
         if not pmids:
             return []
 
-        return self._fetch_papers(pmids, author_name)
+        return self._fetch_papers(pmids, AuthorNameMatcher(author_name), classify_middle)
+
+    def _search_author(self, author_name: str, since: str | None = None) -> list[str]:
+        """Search PubMed for author's papers, return PMIDs.
 
-    def _search_author(self, author_name: str) -> list[str]:
-        """Search PubMed for author's papers, return PMIDs."""
+        With ``since``, only papers whose Entrez date is on or after it are returned.
+        """
+        return self._flight.do(("esearch", author_name, since), lambda: self._esearch(author_name, since))
+
+    def _esearch(self, author_name: str, since: str | None) -> list[str]:
         query = quote(f"{author_name}[full]")
-        url = f"{self.BASE_URL}/esearch.fcgi?db=pubmed&term={query}&retmax=1000&retmode=xml"
+        url = f"{self.base_url}/esearch.fcgi?db=pubmed&term={query}&retmax=1000&retmode=xml"
+        if since:
+            url += f"&datetype=edat&mindate={quote(since, safe='')}&maxdate=3000"
 
         response = self.client.get(url)
         response.raise_for_status()
 
+        BYTES_PARSED.inc(len(response.content), upstream="pubmed")
         root = ET.fromstring(response.text)
         return [id_elem.text for id_elem in root.findall(".//Id") if id_elem.text]
 
-    def _fetch_papers(self, pmids: list[str], author_name: str) -> list[dict]:
-        """Fetch paper details for given PMIDs."""
-        ids = ",".join(pmids)
-        url = f"{self.BASE_URL}/efetch.fcgi?db=pubmed&id={ids}&retmode=xml"
+    def _fetch_papers(self, pmids: list[str], matcher: AuthorNameMatcher,
+                      classify_middle: bool = False) -> list[PaperRecord]:
+        """Fetch paper details for given PMIDs in efetch batches."""
+        papers = []
+        for i in range(0, len(pmids), self.EFETCH_BATCH_SIZE):
+            batch = pmids[i:i + self.EFETCH_BATCH_SIZE]
+            papers.extend(self._fetch_batch(batch, matcher, classify_middle))
+        return papers
 
-        response = self.client.get(url)
+    def _fetch_batch(self, pmids: list[str], matcher: AuthorNameMatcher,
+                     classify_middle: bool = False) -> list[PaperRecord]:
+        """Fetch one efetch batch, reusing it from the checkpoint when available."""
+        unit = unit_key("efetch", matcher.name, "all" if classify_middle else "ends", pmids)
+        if self.checkpoint:
+            done = self.checkpoint.get(unit)
+            if done is not None:
+                return [PaperRecord.from_dict(p) for p in done]
+
+        # Callers fill in citation counts, so waiters get their own records
+        return self._flight.do(unit, lambda: self._efetch(unit, pmids, matcher, classify_middle),
+                               share=lambda papers: [copy.copy(p) for p in papers])
+
+    def _efetch(self, unit: str, pmids: list[str], matcher: AuthorNameMatcher,
+                classify_middle: bool) -> list[PaperRecord]:
+        ids = ",".join(pmids)
+        url = f"{self.base_url}/efetch.fcgi?db=pubmed&id={ids}&retmode=xml"
+
+        if len(url) <= MAX_URL_LENGTH:
+            response = self.client.get(url)
+        else:
+            # efetch takes the same parameters as a form body, without a length limit
+            response = self.client.post(
+                f"{self.base_url}/efetch.fcgi", data={"db": "pubmed", "id": ids, "retmode": "xml"})
         response.raise_for_status()
 
+        BYTES_PARSED.inc(len(response.content), upstream="pubmed")
         root = ET.fromstring(response.text)
         papers = []
 
         for article in root.findall(".//PubmedArticle"):
-            paper = self._parse_article(article, author_name)
+            paper = self._parse_article(article, matcher, classify_middle)
             papers.append(paper)
 
+        if self.checkpoint:
+            self.checkpoint.set(unit, [p.to_dict() for p in papers])
+
         return papers
 
-    def _parse_article(self, article: ET.Element, author_name: str) -> dict:
+    def _parse_article(self, article: ET.Element, matcher: AuthorNameMatcher,
+                       classify_middle: bool = False) -> PaperRecord:
         """Parse a PubMed article XML element."""
-        citation = article.find(".//MedlineCitation")
-        article_elem = citation.find(".//Article")
-
-        pmid = citation.findtext(".//PMID", "")
-        title = article_elem.findtext(".//ArticleTitle", "")
-
-        # Get DOI
-        doi = None
-        for eloc in article_elem.findall(".//ELocationID"):
-            if eloc.get("EIdType") == "doi":
-                doi = eloc.text
-                break
-
-        # Get year
-        year = citation.findtext(".//DateCompleted/Year", "")
-        if not year:
-            year = citation.findtext(".//PubDate/Year", "")
+        article_elem, paper = parse_article_metadata(article)
 
         # Get author position
-        position = self._get_author_position(article_elem, author_name)
-
-        return {
-            "pmid": pmid,
-            "title": title,
-            "doi": doi,
-            "year": year,
-            "position": position,
-        }
-
-    def _get_author_position(self, article_elem: ET.Element, author_name: str) -> Position:
-        """Determine author's position in the author list."""
-        authors = article_elem.findall(".//Author")
-        if not authors:
+        paper.position = self._get_author_position(article_elem, matcher, classify_middle)
+
+        return paper
+
+    def _get_author_position(self, article_elem: ET.Element, matcher: AuthorNameMatcher,
+                             classify_middle: bool = False) -> Position:
+        """Determine author's position in the author list.
+
+        The U-index only needs to know whether the author is first or last, so
+        by default only those two entries are inspected; this keeps consortium
+        papers with thousands of authors cheap. With ``classify_middle`` the
+        remaining authors are scanned too.
+        """
+        authors = article_elem.find("AuthorList")
+        if authors is None:
+            authors = article_elem.findall(".//Author")
+        if not len(authors):
             return None
 
-        name_parts = author_name.lower().split()
-
-        for i, author in enumerate(authors):
-            last_name = (author.findtext("LastName") or "").lower()
-            fore_name = (author.findtext("ForeName") or "").lower()
-
-            # Check if this author matches
-            matches = all(part in f"{last_name} {fore_name}" for part in name_parts)
+        if matcher.matches_element(authors[0]):
+            return "first"
+        if len(authors) > 1 and matcher.matches_element(authors[-1]):
+            return "last"
 
-            if matches:
-                if i == 0:
-                    return "first"
-                elif i == len(authors) - 1:
-                    return "last"
-                else:
+        if classify_middle:
+            for i in range(1, len(authors) - 1):
+                if matcher.matches_element(authors[i]):
                     return "middle"
 
         return None
@@ -0,0 +1,124 @@
+"""Render an author's results for the terminal or for downstream tools.
+
+Formats:
+
+* ``text``: the human-readable report
+* ``json``: the result as one JSON document (the cache/batch record)
+* ``ndjson``: one JSON object per paper
+* ``csv``: one row per paper, with the columns of ``uindex export``
+
+Output goes through a buffer that writes to the stream in large chunks,
+so reports on authors with thousands of papers do not pay for one write
+per line.
+"""
+
+import csv
+import json
+from typing import Literal, TextIO
+
+from uindex.core import UIndexResult
+from uindex.export import PAPER_COLUMNS, paper_rows
+
+
+Format = Literal["text", "json", "ndjson", "csv"]
+FORMATS = ("text", "json", "ndjson", "csv")
+
+_RULE = "=" * 80
+
+
+class _Buffer:
+    """Collects writes and passes them on to ``out`` in chunks of about ``size`` characters."""
+
+    def __init__(self, out: TextIO, size: int = 1 << 16):
+        self.out = out
+        self.size = size
+        self._parts: list[str] = []
+        self._length = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._length += len(text)
+        if self._length >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.out.write("".join(self._parts))
+            self._parts.clear()
+            self._length = 0
+        self.out.flush()
+
+
+def write_report(result: UIndexResult, out: TextIO, format: Format = "text", top: int | None = None) -> None:
+    """Write ``result`` to ``out`` in ``format``.
+
+    ``top`` limits the paper listings to the ``top`` most cited papers and
+    the first ``top`` papers without citation data. Summary counts always
+    cover all papers.
+    """
+    buffer = _Buffer(out)
+    _WRITERS[format](result, buffer, top)
+    buffer.flush()
+
+
+def _write_text(result: UIndexResult, out: _Buffer, top: int | None) -> None:
+    # Summary upfront
+    out.write(f"Author: {result.author}\n")
+    out.write(f"Qualifying papers (first/last author): {result.qualifying_count}\n\n")
+
+    # Main result
+    out.write(f"U-index: {result.u_index}\n\n")
+
+    out.write(f"Papers with citation data: {len(result.qualifying_papers)}\n")
+    out.write(f"Unmatched (no DOI or not in OpenAlex): {result.unmatched_count}\n")
+
+    # Full list of qualifying papers with links
+    if result.qualifying_papers:
+        out.write(f"\n{_RULE}\nQUALIFYING PAPERS (sorted by citations)\n{_RULE}\n")
+        for i, paper in enumerate(result.qualifying_papers[:top], 1):
+            out.write(f"\n{i}. {paper.title}\n"
+                      f"   Year: {paper.year} | Position: {paper.position} author | Citations: {paper.citations}\n")
+            if paper.pmid:
+                out.write(f"   PubMed:   https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/\n")
+            if paper.doi:
+                out.write(f"   OpenAlex: https://openalex.org/works/https://doi.org/{paper.doi}\n")
+        _write_more(out, len(result.qualifying_papers), top)
+
+    # Unmatched papers
+    if result.unmatched_papers:
+        out.write(f"\n{_RULE}\nUNMATCHED PAPERS (no citation data)\n{_RULE}\n")
+        for i, paper in enumerate(result.unmatched_papers[:top], 1):
+            out.write(f"\n{i}. {paper.title}\n   Year: {paper.year} | Position: {paper.position} author\n")
+            if paper.pmid:
+                out.write(f"   PubMed: https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/\n")
+            if paper.doi:
+                out.write(f"   DOI: {paper.doi} (not found in OpenAlex)\n")
+        _write_more(out, len(result.unmatched_papers), top)
+
+
+def _write_more(out: _Buffer, count: int, top: int | None) -> None:
+    if top is not None and count > top:
+        out.write(f"\n... and {count - top} more\n")
+
+
+def _write_json(result: UIndexResult, out: _Buffer, top: int | None) -> None:
+    data = result.to_dict()
+    data["qualifying_papers"] = data["qualifying_papers"][:top]
+    data["unmatched_papers"] = data["unmatched_papers"][:top]
+    json.dump(data, out, indent=2)
+    out.write("\n")
+
+
+def _write_ndjson(result: UIndexResult, out: _Buffer, top: int | None) -> None:
+    names = [name for name, _ in PAPER_COLUMNS]
+    for row in paper_rows(result, top):
+        out.write(json.dumps(dict(zip(names, row))) + "\n")
+
+
+def _write_csv(result: UIndexResult, out: _Buffer, top: int | None) -> None:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(name for name, _ in PAPER_COLUMNS)
+    writer.writerows(paper_rows(result, top))
+
+
+_WRITERS = {"text": _write_text, "json": _write_json, "ndjson": _write_ndjson, "csv": _write_csv}
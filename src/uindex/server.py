@@ -0,0 +1,183 @@
+"""Long-running HTTP/JSON service that keeps clients and cache warm."""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from uindex.cache import Cache
+from uindex.core import UIndexResult, compute_author, refresh_author
+from uindex.metrics import REGISTRY, SERVER_IN_FLIGHT
+from uindex.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from uindex.store import ResultStore
+
+
+class UIndexService:
+    """Computes U-index results using shared clients and cache.
+
+    Concurrent requests for the same author are coalesced so that only one
+    upstream fetch runs per author at a time.
+    """
+
+    def __init__(self, pubmed, openalex, cache: Cache | None = None, store: "ResultStore | None" = None):
+        self.pubmed = pubmed
+        self.openalex = openalex
+        self.cache = cache
+        self.store = store
+        self._flight = SingleFlight()
+
+    def compute(self, author_name: str, refresh: bool = False,
+                full_refresh: bool = False) -> UIndexResult:
+        """Return results for an author, from cache when available.
+
+        ``refresh`` updates cached results incrementally (new PMIDs and stale
+        citation counts only); ``full_refresh`` refetches everything.
+        """
+        cache_key = f"author:{author_name}"
+
+        def fetch() -> UIndexResult:
+            return self._fetch(author_name, cache_key, incremental=not full_refresh)
+
+        # Concurrent requests for one author share a single fetch and cache fill
+        if self.cache and not (refresh or full_refresh):
+            fetched: list[UIndexResult] = []
+
+            def fill() -> dict:
+                fetched.append(fetch())
+                return fetched[0].to_dict()
+
+            data = self.cache.get_or_set(cache_key, fill)
+            # The caller that fetched keeps its result; the others decode the cached one
+            return fetched[0] if fetched else UIndexResult.from_dict(data)
+        # An incremental refresh in flight is no substitute for a full one
+        return self._flight.do((cache_key, full_refresh), lambda: self._cache_result(cache_key, fetch()))
+
+    def _cache_result(self, cache_key: str, result: UIndexResult) -> UIndexResult:
+        if self.cache:
+            self.cache.set(cache_key, result.to_dict())
+        return result
+
+    def _fetch(self, author_name: str, cache_key: str, incremental: bool) -> UIndexResult:
+        previous = None
+        if self.cache and incremental:
+            previous = self.cache.get(cache_key, allow_expired=True)
+
+        if previous:
+            result = refresh_author(UIndexResult.from_dict(previous), self.pubmed, self.openalex)
+        else:
+            result = compute_author(author_name, self.pubmed, self.openalex)
+
+        if self.store is not None:
+            self.store.save(result)
+        return result
+
+    def close(self) -> None:
+        """Close the HTTP clients."""
+        self.pubmed.close()
+        self.openalex.close()
+
+
+class UIndexRequestHandler(BaseHTTPRequestHandler):
+    """Serves ``GET /u-index?author=...``, batch ``POST /u-index`` and ``GET /metrics``."""
+
+    server: "UIndexServer"
+
+    def handle_one_request(self) -> None:
+        with SERVER_IN_FLIGHT.track_in_progress():
+            super().handle_one_request()
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self._send_metrics()
+            return
+        if url.path != "/u-index":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        params = parse_qs(url.query)
+        author = params.get("author", [""])[0].strip()
+        if not author:
+            self._send_json(400, {"error": "missing 'author' parameter"})
+            return
+
+        refresh = params.get("refresh", ["0"])[0] in ("1", "true")
+        self._respond_with(lambda: self.server.service.compute(author, refresh=refresh).to_dict())
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/u-index":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            authors = payload["authors"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "expected JSON body {\"authors\": [...]}"})
+            return
+
+        if not isinstance(authors, list) or not all(isinstance(a, str) for a in authors):
+            self._send_json(400, {"error": "'authors' must be a list of names"})
+            return
+
+        refresh = bool(payload.get("refresh", False))
+        # One failing author leaves the others' results intact
+        self._send_json(200, {"results": [self._batch_entry(a, refresh) for a in authors]})
+
+    def _batch_entry(self, author: str, refresh: bool) -> dict:
+        try:
+            return self.server.service.compute(author, refresh=refresh).to_dict()
+        except Exception as e:
+            return {"author": author, **self._failure(e)[1]}
+
+    def _respond_with(self, compute) -> None:
+        try:
+            body = compute()
+        except Exception as e:
+            self._send_json(*self._failure(e))
+            return
+        self._send_json(200, body)
+
+    def _failure(self, e: Exception) -> tuple[int, dict]:
+        """Status and JSON error body for a failed computation."""
+        if isinstance(e, httpx.HTTPError):
+            return 502, {"error": f"upstream request failed: {e}"}
+        # E.g. a malformed upstream body or a database error: answer instead of dropping the connection
+        self.log_error("compute failed: %r", e)
+        return 500, {"error": f"internal error: {type(e).__name__}"}
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_metrics(self) -> None:
+        data = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class UIndexServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a :class:`UIndexService`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: UIndexService, quiet: bool = False):
+        super().__init__(address, UIndexRequestHandler)
+        self.service = service
+        self.quiet = quiet
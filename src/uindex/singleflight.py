@@ -0,0 +1,53 @@
+"""Coalescing of concurrent identical calls (single-flight)."""
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    """An in-progress call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], share: Callable[[Any], Any] | None = None) -> Any:
+        """Call ``fn`` unless a call for ``key`` is already running, then wait for it.
+
+        Exceptions raised by the leading call are re-raised in every waiter.
+        Waiters get ``share(result)`` when ``share`` is given, e.g. a copy of a
+        result that callers go on to modify.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return share(call.result) if share else call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -0,0 +1,237 @@
+"""Local stand-in for the PubMed E-utilities and OpenAlex APIs.
+
+Serves esearch/efetch and OpenAlex ``/works`` over an in-process corpus with
+configurable latency, error rate and rate limit, so throughput and backoff
+can be measured without network access::
+
+    server = StandInServer(("127.0.0.1", 0), corpus, latency=0.05, rate_limit=10)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    PubMedClient(base_url=server.pubmed_url), OpenAlexClient(base_url=server.openalex_url)
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from uindex.corpus import SyntheticCorpus
+from uindex.doi import normalize_doi
+from uindex.openalex import normalize_pmid
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second with bursts of up to ``rate``."""
+
+    def __init__(self, rate: float, clock=time.monotonic):
+        self.rate = rate
+        self.clock = clock
+        self._tokens = rate
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Serves ``/entrez/eutils/{esearch,efetch}.fcgi`` and ``/works``.
+
+    esearch ignores Entrez date filters (the corpus has no entry dates), and
+    ``/works`` supports the ``doi`` and ``ids.pmid`` filters with cursor
+    pagination.
+    """
+
+    server: "StandInServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        self._dispatch(url.path, parse_qs(url.query))
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        params = parse_qs(url.query)
+        params.update(parse_qs(self.rfile.read(length).decode()))
+        self._dispatch(url.path, params)
+
+    def _dispatch(self, path: str, params: dict[str, list[str]]) -> None:
+        endpoint = path.rsplit("/", 1)[-1]
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.bucket and not server.bucket.take():
+            self._send(endpoint, 429, b"Too Many Requests", "text/plain", {"Retry-After": "1"})
+            return
+        if server.error_rate and server.roll() < server.error_rate:
+            self._send(endpoint, 503, b"Service Unavailable", "text/plain")
+            return
+
+        def param(name: str) -> str:
+            return params.get(name, [""])[0]
+
+        if endpoint == "esearch.fcgi":
+            body = self._esearch(param("term"), int(param("retmax") or 20))
+            self._send(endpoint, 200, body.encode(), "text/xml")
+        elif endpoint == "efetch.fcgi":
+            body = self._efetch([p for p in param("id").split(",") if p])
+            self._send(endpoint, 200, body.encode(), "text/xml")
+        elif endpoint == "works":
+            body = self._works(param("filter"), int(param("per-page") or 25), param("cursor") or "*")
+            self._send(endpoint, 200, json.dumps(body).encode(), "application/json")
+        else:
+            self._send(endpoint, 404, b"Not Found", "text/plain")
+
+    def _esearch(self, term: str, retmax: int) -> str:
+        author = term.removesuffix("[full]")
+        pmids = self.server.corpus.search(author)
+        ids = "".join(f"<Id>{pmid}</Id>" for pmid in pmids[:retmax])
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f"<eSearchResult><Count>{len(pmids)}</Count><IdList>{ids}</IdList></eSearchResult>"
+        )
+
+    def _efetch(self, pmids: list[str]) -> str:
+        corpus = self.server.corpus
+        articles = "".join(filter(None, (corpus.article_xml(pmid) for pmid in pmids)))
+        return f'<?xml version="1.0" encoding="UTF-8"?><PubmedArticleSet>{articles}</PubmedArticleSet>'
+
+    def _works(self, works_filter: str, per_page: int, cursor: str) -> dict:
+        corpus = self.server.corpus
+        key, _, values = works_filter.partition(":")
+        if key == "doi":
+            works = [corpus.work_by_doi(d) for d in map(normalize_doi, values.split("|")) if d]
+        elif key in ("ids.pmid", "pmid"):
+            works = [corpus.work_by_pmid(p) for p in map(normalize_pmid, values.split("|")) if p]
+        else:
+            works = []
+        works = [w for w in works if w is not None]
+
+        offset = 0 if cursor == "*" else int(cursor)
+        page = works[offset:offset + per_page]
+        next_offset = offset + len(page)
+        return {
+            "meta": {"count": len(works), "next_cursor": str(next_offset) if page else None},
+            "results": page,
+        }
+
+    def _send(self, endpoint: str, status: int, body: bytes, content_type: str,
+              headers: dict[str, str] | None = None) -> None:
+        gzipped = status == 200 and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(endpoint, status, len(body))
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded stand-in for PubMed and OpenAlex.
+
+    Args:
+        address: ``(host, port)``; port 0 picks a free port.
+        corpus: Articles to serve (see :class:`~uindex.corpus.Corpus`).
+        latency: Seconds added to every request.
+        error_rate: Fraction of requests answered with 503.
+        rate_limit: Requests per second before answering 429, or None.
+        seed: Seed for the error roll, for reproducible runs.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], corpus, latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: float | None = None, seed: int = 0,
+                 quiet: bool = True):
+        super().__init__(address, StandInRequestHandler)
+        self.corpus = corpus
+        self.latency = latency
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.quiet = quiet
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def pubmed_url(self) -> str:
+        return f"{self.base_url}/entrez/eutils"
+
+    @property
+    def openalex_url(self) -> str:
+        return self.base_url
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def record(self, endpoint: str, status: int, size: int) -> None:
+        with self._lock:
+            self.requests[endpoint, status] += 1
+            self.bytes_sent += size
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", default=8001, show_default=True, help="Port to listen on")
+@click.option("--latency", default=0.0, show_default=True, help="Seconds added to every request")
+@click.option("--error-rate", default=0.0, show_default=True, help="Fraction of requests answered with 503")
+@click.option("--rate-limit", type=float, help="Requests per second before answering 429")
+@click.option("--researchers-per-profile", default=10, show_default=True,
+              help="Synthetic researchers per archetype")
+@click.option("--background-papers", default=100_000, show_default=True,
+              help="Synthetic papers by other authors")
+@click.option("--doi-missing-rate", default=0.1, show_default=True, help="Fraction of papers without a DOI")
+@click.option("--seed", default=0, show_default=True, help="Seed for errors and the corpus")
+def main(host: str, port: int, latency: float, error_rate: float, rate_limit: float | None,
+         researchers_per_profile: int, background_papers: int, doi_missing_rate: float,
+         seed: int) -> None:
+    """Run the PubMed/OpenAlex stand-in on a synthetic corpus."""
+    corpus = SyntheticCorpus(researchers_per_profile, background_papers, doi_missing_rate, seed=seed)
+    server = StandInServer((host, port), corpus, latency=latency, error_rate=error_rate,
+                           rate_limit=rate_limit, seed=seed, quiet=False)
+    click.echo(f"PubMed stand-in:   UINDEX_PUBMED_URL={server.pubmed_url}")
+    click.echo(f"OpenAlex stand-in: UINDEX_OPENALEX_URL={server.openalex_url}")
+    click.echo(f"{len(corpus)} papers; researchers include "
+               f"{', '.join(r['name'] for r in corpus.researchers[:3])}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
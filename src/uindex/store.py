@@ -0,0 +1,383 @@
+"""Normalized SQLite store of U-index results for cohort analytics.
+
+Where the cache keeps one JSON document per author, the store splits
+results into tables so that cohort queries and partial updates run in SQL:
+
+* ``authors``: one row per author with the summary metrics
+* ``papers``: PMID, title, DOI and year, shared between co-authors
+* ``authorships``: which author is on which paper, and in what position
+  (NULL for papers where the author is neither first nor last)
+* ``citations``: citation count per PMID with the time it was fetched
+
+The ``author_metrics`` view adds derived columns (leadership share, cited
+papers, citation totals) for :meth:`ResultStore.cohort`.
+"""
+
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from uindex.core import PaperRecord, UIndexResult
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    u_index INTEGER NOT NULL,
+    total_papers INTEGER NOT NULL,
+    qualifying_count INTEGER NOT NULL,
+    unmatched_count INTEGER NOT NULL,
+    created_at REAL,
+    synced_on TEXT
+);
+CREATE INDEX IF NOT EXISTS authors_u_index ON authors (u_index);
+
+CREATE TABLE IF NOT EXISTS papers (
+    pmid TEXT PRIMARY KEY,
+    title TEXT,
+    doi TEXT,
+    year TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS papers_doi ON papers (doi);
+
+CREATE TABLE IF NOT EXISTS authorships (
+    author_id INTEGER NOT NULL REFERENCES authors (id) ON DELETE CASCADE,
+    pmid TEXT NOT NULL REFERENCES papers (pmid),
+    position TEXT,
+    -- Order of the author's PMIDs as PubMed returned them
+    ordinal INTEGER NOT NULL,
+    PRIMARY KEY (author_id, pmid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS authorships_pmid ON authorships (pmid);
+
+CREATE TABLE IF NOT EXISTS citations (
+    pmid TEXT PRIMARY KEY REFERENCES papers (pmid),
+    count INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS citations_fetched_at ON citations (fetched_at);
+
+CREATE VIEW IF NOT EXISTS author_metrics AS
+SELECT
+    a.name,
+    a.u_index,
+    a.total_papers,
+    a.qualifying_count,
+    a.unmatched_count,
+    CAST(a.qualifying_count AS REAL) / NULLIF(a.total_papers, 0) AS leadership_share,
+    COUNT(c.pmid) AS cited_papers,
+    COALESCE(SUM(c.count), 0) AS total_citations,
+    MAX(c.count) AS max_citations,
+    a.created_at,
+    a.synced_on
+FROM authors a
+LEFT JOIN authorships s ON s.author_id = a.id AND s.position IN ('first', 'last')
+LEFT JOIN citations c ON c.pmid = s.pmid
+GROUP BY a.id;
+"""
+
+# U-index per author from stored citations: the largest rank whose paper has >= rank citations
+_U_INDEX = """
+SELECT author_id, COALESCE(MAX(CASE WHEN count >= rank THEN rank END), 0)
+FROM (
+    SELECT s.author_id, c.count,
+           ROW_NUMBER() OVER (PARTITION BY s.author_id ORDER BY c.count DESC) AS rank
+    FROM authorships s JOIN citations c ON c.pmid = s.pmid
+    WHERE s.position IN ('first', 'last') AND s.author_id IN ({ids})
+)
+GROUP BY author_id
+"""
+
+_AUTHOR_FIELDS = "id, name, u_index, total_papers, qualifying_count, unmatched_count, created_at, synced_on"
+
+_PAPER_ROWS = """
+SELECT s.author_id, s.pmid, p.title, p.doi, p.year, s.position, c.count, c.fetched_at
+FROM authorships s
+JOIN papers p ON p.pmid = s.pmid
+LEFT JOIN citations c ON c.pmid = s.pmid
+"""
+
+# Parameters per statement, below SQLite's default limit
+_CHUNK = 500
+
+
+class ResultStore:
+    """Normalized SQLite store of author results.
+
+    Can share the cache database (tables do not overlap).
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(_SCHEMA)
+
+    def save(self, result: UIndexResult) -> None:
+        """Store an author's results, replacing earlier results for the author."""
+        papers = {p.pmid: p for p in [*result.qualifying_papers, *result.unmatched_papers] if p.pmid}
+        pmids = list(dict.fromkeys([*result.pmids, *papers]))
+        with sqlite3.connect(self.db_path) as conn:
+            author_id = conn.execute(
+                """
+                INSERT INTO authors (name, u_index, total_papers, qualifying_count, unmatched_count,
+                                     created_at, synced_on)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    u_index = excluded.u_index,
+                    total_papers = excluded.total_papers,
+                    qualifying_count = excluded.qualifying_count,
+                    unmatched_count = excluded.unmatched_count,
+                    created_at = excluded.created_at,
+                    synced_on = excluded.synced_on
+                RETURNING id
+                """,
+                (result.author, result.u_index, result.total_papers, result.qualifying_count,
+                 result.unmatched_count, result.created_at, result.synced_on),
+            ).fetchone()[0]
+
+            # Papers known only by PMID (not first/last) keep details stored by co-authors
+            conn.executemany(
+                """
+                INSERT INTO papers (pmid, title, doi, year) VALUES (?, ?, ?, ?)
+                ON CONFLICT (pmid) DO UPDATE SET
+                    title = COALESCE(excluded.title, title),
+                    doi = COALESCE(excluded.doi, doi),
+                    year = COALESCE(excluded.year, year)
+                """,
+                [
+                    (pmid, p.title, p.doi, p.year) if (p := papers.get(pmid)) else (pmid, None, None, None)
+                    for pmid in pmids
+                ],
+            )
+            conn.execute("DELETE FROM authorships WHERE author_id = ?", (author_id,))
+            conn.executemany(
+                "INSERT INTO authorships (author_id, pmid, position, ordinal) VALUES (?, ?, ?, ?)",
+                [
+                    (author_id, pmid, p.position if (p := papers.get(pmid)) else None, ordinal)
+                    for ordinal, pmid in enumerate(pmids)
+                ],
+            )
+            conn.executemany(
+                """
+                INSERT INTO citations (pmid, count, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT (pmid) DO UPDATE SET count = excluded.count, fetched_at = excluded.fetched_at
+                WHERE excluded.fetched_at >= citations.fetched_at
+                """,
+                [
+                    (p.pmid, p.citations, p.cited_at or result.created_at or time.time())
+                    for p in papers.values() if p.citations is not None
+                ],
+            )
+            # Shared counts may have changed under co-authors stored earlier
+            _recompute_authors(conn, [p.pmid for p in papers.values() if p.citations is not None],
+                               exclude=author_id)
+
+    def load(self, author: str) -> UIndexResult | None:
+        """Rebuild an author's results, or None if the author is not stored."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(f"SELECT {_AUTHOR_FIELDS} FROM authors WHERE name = ?", (author,)).fetchone()
+            if row is None:
+                return None
+            rows = conn.execute(f"{_PAPER_ROWS} WHERE s.author_id = ? ORDER BY s.ordinal", (row[0],)).fetchall()
+        return _result(row, rows)
+
+    def results(self) -> Iterator[UIndexResult]:
+        """Every stored author's results, by name, one author in memory at a time."""
+        with sqlite3.connect(self.db_path) as conn:
+            authors = conn.execute(f"SELECT {_AUTHOR_FIELDS} FROM authors ORDER BY name")
+            papers = conn.execute(
+                f"{_PAPER_ROWS} JOIN authors a ON a.id = s.author_id ORDER BY a.name, s.ordinal")
+            grouped = groupby(papers, key=itemgetter(0))
+            author_id, rows = next(grouped, (None, ()))
+            for row in authors:
+                if row[0] == author_id:
+                    yield _result(row, rows)
+                    author_id, rows = next(grouped, (None, ()))
+                else:
+                    yield _result(row, ())
+
+    def cohort(self, where: str = "1", params: Iterable = (), order_by: str = "name") -> list[dict]:
+        """Rows of the ``author_metrics`` view matching an SQL condition.
+
+        ``where`` and ``order_by`` are SQL fragments (trusted input, not
+        user-supplied strings); values go in ``params``, e.g.
+        ``store.cohort("u_index >= ? AND leadership_share < ?", (10, 0.3))``.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"SELECT * FROM author_metrics WHERE {where} ORDER BY {order_by}", tuple(params)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stale_pmids(self, max_age: float) -> list[str]:
+        """First/last-author PMIDs whose citation counts are older than ``max_age`` seconds or missing."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT DISTINCT s.pmid FROM authorships s
+                LEFT JOIN citations c ON c.pmid = s.pmid
+                WHERE s.position IN ('first', 'last') AND (c.fetched_at IS NULL OR c.fetched_at < ?)
+                """,
+                (time.time() - max_age,),
+            ).fetchall()
+        return [pmid for (pmid,) in rows]
+
+    def update_citations(self, counts: dict[str, int], fetched_at: float | None = None) -> int:
+        """Store new citation counts and recompute the U-index of affected authors in SQL.
+
+        Returns:
+            Number of authors whose U-index was recomputed.
+        """
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        pmids = list(counts)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO citations (pmid, count, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT (pmid) DO UPDATE SET count = excluded.count, fetched_at = excluded.fetched_at
+                """,
+                [(pmid, count, fetched_at) for pmid, count in counts.items()],
+            )
+            ids = _recompute_authors(conn, pmids)
+        return len(ids)
+
+    def merge_from(self, other_db: Path) -> int:
+        """Copy results from another store database, e.g. a shard's cache.
+
+        Keeps the newest ``created_at`` per author (with its authorships) and
+        the newest ``fetched_at`` per PMID, then recomputes the U-index of
+        authors whose citations changed.
+
+        Returns:
+            Number of authors inserted or updated.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("ATTACH DATABASE ? AS other", (str(other_db),))
+            # Shard caches written before the store existed have no results to merge
+            if conn.execute("SELECT 1 FROM other.sqlite_master WHERE name = 'authors'").fetchone():
+                merged = self._merge_attached(conn)
+            else:
+                merged = 0
+            conn.commit()
+            conn.execute("DETACH DATABASE other")
+        return merged
+
+    @staticmethod
+    def _merge_attached(conn: sqlite3.Connection) -> int:
+        conn.execute("""
+            CREATE TEMP TABLE merged_authors AS
+            SELECT o.id AS other_id, o.name FROM other.authors o
+            LEFT JOIN main.authors a ON a.name = o.name
+            WHERE a.id IS NULL OR COALESCE(o.created_at, 0) > COALESCE(a.created_at, 0)
+        """)
+        merged = conn.execute("SELECT COUNT(*) FROM merged_authors").fetchone()[0]
+        conn.execute("""
+            INSERT INTO main.authors (name, u_index, total_papers, qualifying_count, unmatched_count,
+                                      created_at, synced_on)
+            SELECT name, u_index, total_papers, qualifying_count, unmatched_count, created_at, synced_on
+            FROM other.authors WHERE id IN (SELECT other_id FROM merged_authors)
+            ON CONFLICT (name) DO UPDATE SET
+                u_index = excluded.u_index,
+                total_papers = excluded.total_papers,
+                qualifying_count = excluded.qualifying_count,
+                unmatched_count = excluded.unmatched_count,
+                created_at = excluded.created_at,
+                synced_on = excluded.synced_on
+        """)
+        conn.execute("""
+            INSERT INTO main.papers (pmid, title, doi, year)
+            SELECT pmid, title, doi, year FROM other.papers WHERE true
+            ON CONFLICT (pmid) DO UPDATE SET
+                title = COALESCE(excluded.title, title),
+                doi = COALESCE(excluded.doi, doi),
+                year = COALESCE(excluded.year, year)
+        """)
+        conn.execute("""
+            DELETE FROM main.authorships WHERE author_id IN (
+                SELECT a.id FROM main.authors a JOIN merged_authors m ON m.name = a.name)
+        """)
+        conn.execute("""
+            INSERT INTO main.authorships (author_id, pmid, position, ordinal)
+            SELECT a.id, s.pmid, s.position, s.ordinal FROM other.authorships s
+            JOIN merged_authors m ON m.other_id = s.author_id
+            JOIN main.authors a ON a.name = m.name
+        """)
+
+        # Merged authors were computed against the shard's counts, others against ours
+        pmids = [pmid for (pmid,) in conn.execute("""
+            SELECT o.pmid FROM other.citations o LEFT JOIN main.citations c ON c.pmid = o.pmid
+            WHERE c.pmid IS NULL OR o.fetched_at > c.fetched_at
+            UNION
+            SELECT s.pmid FROM main.authorships s JOIN main.authors a ON a.id = s.author_id
+            JOIN merged_authors m ON m.name = a.name
+        """)]
+        conn.execute("""
+            INSERT INTO main.citations (pmid, count, fetched_at)
+            SELECT pmid, count, fetched_at FROM other.citations WHERE true
+            ON CONFLICT (pmid) DO UPDATE SET count = excluded.count, fetched_at = excluded.fetched_at
+            WHERE excluded.fetched_at > citations.fetched_at
+        """)
+        _recompute_authors(conn, pmids)
+        conn.execute("DROP TABLE temp.merged_authors")
+        return merged
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+
+
+def _result(author_row: tuple, paper_rows: Iterable[tuple]) -> UIndexResult:
+    _, author, u_index, total_papers, qualifying_count, unmatched_count, created_at, synced_on = author_row
+    pmids, qualifying, unmatched = [], [], []
+    for _, pmid, title, doi, year, position, count, fetched_at in paper_rows:
+        pmids.append(pmid)
+        if position in ("first", "last"):
+            paper = PaperRecord(pmid, title or "", doi, year or "", position, count, fetched_at)
+            (qualifying if count is not None else unmatched).append(paper)
+    qualifying.sort(key=lambda p: p.citations, reverse=True)
+    return UIndexResult(author, u_index, total_papers, qualifying_count, unmatched_count,
+                        qualifying, unmatched, pmids, created_at, synced_on)
+
+
+def _recompute_authors(conn: sqlite3.Connection, pmids: list[str], exclude: int | None = None) -> list[int]:
+    """Recompute U-index and unmatched count of authors with first/last authorships on ``pmids``."""
+    author_ids: set[int] = set()
+    for i in range(0, len(pmids), _CHUNK):
+        chunk = pmids[i:i + _CHUNK]
+        author_ids.update(author_id for (author_id,) in conn.execute(
+            f"SELECT DISTINCT author_id FROM authorships WHERE pmid IN ({','.join('?' * len(chunk))})"
+            " AND position IN ('first', 'last')",
+            chunk,
+        ))
+    author_ids.discard(exclude)
+    ids = sorted(author_ids)
+    for i in range(0, len(ids), _CHUNK):
+        chunk = ids[i:i + _CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        # Authors left without cited papers drop to 0
+        conn.execute(f"UPDATE authors SET u_index = 0 WHERE id IN ({placeholders})", chunk)
+        conn.executemany(
+            "UPDATE authors SET u_index = ? WHERE id = ?",
+            [(u_index, author_id) for author_id, u_index in
+             conn.execute(_U_INDEX.format(ids=placeholders), chunk).fetchall()],
+        )
+        # Cited papers of these authors changed; unmatched counts follow the citations table
+        conn.execute(
+            f"""
+            UPDATE authors SET unmatched_count = (
+                SELECT COUNT(*) FROM authorships s LEFT JOIN citations c ON c.pmid = s.pmid
+                WHERE s.author_id = authors.id AND s.position IN ('first', 'last') AND c.pmid IS NULL
+            ) WHERE id IN ({placeholders})
+            """,
+            chunk,
+        )
+    return ids
@@ -0,0 +1,250 @@
+"""HTTP transport layer shared by the PubMed and OpenAlex clients."""
+
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+
+import httpx
+
+from uindex.metrics import (
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_RATE_LIMITED,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+)
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# efetch XML and OpenAlex JSON compress ~5-10x; ask for it explicitly
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip"}
+
+# Longest request URL sent as GET; proxies and servers commonly cap at 2-8 KB
+MAX_URL_LENGTH = 2048
+
+
+def split_batches(values: list[str], max_items: int, max_length: int,
+                  separator: str = "|") -> Iterator[list[str]]:
+    """Split values into batches for a query parameter.
+
+    Each batch has at most ``max_items`` values, and joined with
+    ``separator`` and percent-encoded it is at most ``max_length``
+    characters long (a single longer value gets a batch of its own).
+    """
+    sep_length = len(quote(separator, safe=""))
+    batch: list[str] = []
+    length = 0
+    for value in values:
+        value_length = len(quote(value, safe=""))
+        added = value_length + (sep_length if batch else 0)
+        if batch and (len(batch) >= max_items or length + added > max_length):
+            yield batch
+            batch, length, added = [], 0, value_length
+        batch.append(value)
+        length += added
+    if batch:
+        yield batch
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting the upstream while its circuit is open."""
+
+
+def connection_pool(max_connections: int = 20, max_keepalive_connections: int = 10,
+                    keepalive_expiry: float = 30.0, http2: bool = False) -> httpx.HTTPTransport:
+    """Build a keep-alive connection pool that several clients can share.
+
+    HTTP/2 needs the optional ``h2`` package (``pip install uindex[http2]``).
+
+    Raises:
+        ImportError: If ``http2`` is requested and ``h2`` is not installed.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("HTTP/2 needs the h2 package: pip install 'uindex[http2]'") from None
+    return httpx.HTTPTransport(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """Transport that records request metrics for an upstream API."""
+
+    def __init__(self, upstream: str, transport: httpx.BaseTransport | None = None):
+        self.upstream = upstream
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        with UPSTREAM_IN_FLIGHT.track_in_progress(upstream=self.upstream):
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                UPSTREAM_REQUESTS.inc(upstream=self.upstream, status="error")
+                raise
+            finally:
+                UPSTREAM_LATENCY.observe(time.perf_counter() - start, upstream=self.upstream)
+
+        UPSTREAM_REQUESTS.inc(upstream=self.upstream, status=str(response.status_code))
+        if response.status_code == 429:
+            UPSTREAM_RATE_LIMITED.inc(upstream=self.upstream)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected for ``reset_timeout`` seconds. Then a single trial
+    request is let through: success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_request(self, request: httpx.Request) -> None:
+        """Raise :class:`CircuitOpenError` if the request may not be sent."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self.clock() - self._opened_at >= self.reset_timeout and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return
+        raise CircuitOpenError(f"Circuit open for {request.url.host}", request=request)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._trial_in_progress = False
+
+    def record_throttled(self) -> None:
+        """Throttling does not trip the circuit, but a throttled trial re-opens it."""
+        with self._lock:
+            if self._trial_in_progress:
+                self._opened_at = self.clock()
+                self._trial_in_progress = False
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Transport that retries throttled and failed requests.
+
+    Retries use jittered exponential backoff ("full jitter") and honor the
+    ``Retry-After`` header. Server errors and connection failures count
+    toward the circuit breaker; 429 responses are retried but do not trip it.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, upstream: str = "",
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 60.0,
+                 circuit_breaker: CircuitBreaker | None = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.transport = transport
+        self.upstream = upstream
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request(request)
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                self.circuit_breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.circuit_breaker.record_success()
+                    return response
+                if response.status_code == 429:
+                    self.circuit_breaker.record_throttled()
+                else:
+                    self.circuit_breaker.record_failure()
+                if attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                response.close()
+
+            UPSTREAM_RETRIES.inc(upstream=self.upstream)
+            self.sleep(delay)
+            attempt += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> float | None:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return min(max(delay, 0.0), self.backoff_max)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def build_transport(upstream: str, max_retries: int = 5,
+                    circuit_breaker: CircuitBreaker | None = None,
+                    sleep: Callable[[float], None] = time.sleep,
+                    pool: httpx.BaseTransport | None = None) -> httpx.BaseTransport:
+    """Build the standard client transport for an upstream API.
+
+    Every attempt, including retries, is recorded by the instrumentation layer.
+    Pass a :func:`connection_pool` as ``pool`` to share connections between
+    clients; otherwise each transport gets its own default pool.
+    """
+    return RetryTransport(
+        InstrumentedTransport(upstream, pool),
+        upstream=upstream,
+        max_retries=max_retries,
+        circuit_breaker=circuit_breaker,
+        sleep=sleep,
+    )
@@ -0,0 +1,84 @@
+"""Fakes and fixtures shared by the tests."""
+
+import pytest
+from uindex.core import PaperRecord, UIndexResult
+
+
+class FakePubMed:
+    """PubMed client serving ``papers``, copied per call since computing updates them.
+
+    Without ``papers`` every author gets a first-author paper with a DOI and
+    a last-author paper without one. Calls wait for ``gate`` when it is set.
+    """
+
+    def __init__(self):
+        self.papers = None
+        self.gate = None
+        self.calls = []
+        self.closed = False
+
+    def fetch_author_papers(self, author_name, since=None, exclude=()):
+        self.calls.append({"author": author_name, "since": since, "exclude": set(exclude)})
+        if self.gate:
+            self.gate.wait(timeout=5)
+        papers = self.papers if self.papers is not None else [
+            PaperRecord(f"{author_name}-1", "Paper One", f"10.1000/{len(author_name)}", "2023", "first"),
+            PaperRecord(f"{author_name}-2", "Paper Two", None, "2022", "last"),
+        ]
+        return [PaperRecord.from_dict(p.to_dict()) for p in papers if p.pmid not in exclude]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeOpenAlex:
+    """OpenAlex client answering from ``citations`` (by DOI) and ``pmid_citations``.
+
+    Without ``citations`` a DOI is cited as often as its last segment says
+    ("10.1000/7" has 7 citations). Requested batches are recorded.
+    """
+
+    def __init__(self):
+        self.citations = None
+        self.pmid_citations = {}
+        self.requested = []
+        self.requested_pmids = []
+
+    def get_citations_by_dois(self, dois):
+        self.requested.append(list(dois))
+        if self.citations is None:
+            return {doi: int(doi.rsplit("/", 1)[1]) for doi in dois}
+        return {d.lower(): self.citations[d.lower()] for d in dois if d.lower() in self.citations}
+
+    def get_citations_by_pmids(self, pmids):
+        self.requested_pmids.append(list(pmids))
+        return {p: self.pmid_citations[p] for p in pmids if p in self.pmid_citations}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pubmed():
+    return FakePubMed()
+
+
+@pytest.fixture
+def openalex():
+    return FakeOpenAlex()
+
+
+@pytest.fixture
+def make_result():
+    """Factory of results with two cited papers, one uncited and one middle-author PMID."""
+
+    def make(author="Smith John", u_index=2, created_at=100.0):
+        qualifying = [
+            PaperRecord("1", "Most cited", "10.1000/a", "2020", "first", 9, 100.0),
+            PaperRecord("2", "Less cited", "10.1000/b", "2021", "last", 2, 100.0),
+        ]
+        unmatched = [PaperRecord("3", "No DOI", None, "2022", "first")]
+        return UIndexResult(author, u_index, 4, 3, 1, qualifying, unmatched, ["4", "3", "2", "1"],
+                            created_at, "2024/01/01")
+
+    return make
@@ -0,0 +1,117 @@
+"""Tests for the Python API session."""
+
+import asyncio
+import importlib.util
+import threading
+
+import pytest
+from uindex.api import UIndexResult, UIndexSession
+from uindex.core import PaperRecord
+from uindex.corpus import Corpus
+from uindex.standin import StandInServer
+
+
+def test_compute_returns_typed_result(tmp_path, pubmed, openalex):
+    """compute returns a UIndexResult holding PaperRecords."""
+    session = UIndexSession(tmp_path, pubmed=pubmed, openalex=openalex)
+
+    result = session.compute("Smith John")
+
+    assert isinstance(result, UIndexResult)
+    assert result.author == "Smith John"
+    assert result.u_index == 1
+    assert result.qualifying_count == 2
+    assert [p.citations for p in result.qualifying_papers] == [10]
+    assert [p.pmid for p in result.unmatched_papers] == ["Smith John-2"]
+    assert result.pmids == ["Smith John-1", "Smith John-2"]
+
+
+def test_session_reuses_cache(tmp_path, pubmed, openalex):
+    """Repeated calls are answered from the session's cache."""
+    with UIndexSession(tmp_path, pubmed=pubmed, openalex=openalex) as session:
+        first = session.compute("Smith John")
+        second = session.compute("Smith John")
+
+    assert first == second
+    assert [call["author"] for call in pubmed.calls] == ["Smith John"]
+    assert pubmed.closed
+
+
+def test_no_cache(tmp_path, pubmed, openalex):
+    """use_cache=False fetches every time and writes no cache."""
+    session = UIndexSession(tmp_path / "cache", use_cache=False, pubmed=pubmed, openalex=openalex)
+    session.compute("Smith John")
+    session.compute("Smith John")
+
+    assert session.cache is None
+    assert len(pubmed.calls) == 2
+    assert not (tmp_path / "cache").exists()
+
+
+def test_compute_many_keeps_order(tmp_path, pubmed, openalex):
+    """compute_many returns results in input order."""
+    session = UIndexSession(tmp_path, pubmed=pubmed, openalex=openalex)
+    authors = ["Smith John", "Doe Jane", "Roe Richard", "Poe Edgar", "Li Wei"]
+
+    results = session.compute_many(authors, max_workers=3)
+
+    assert [r.author for r in results] == authors
+    assert [r.u_index for r in results] == [1, 1, 1, 1, 1]
+
+
+def test_async_counterparts(tmp_path, pubmed, openalex):
+    """acompute and acompute_many match their sync versions."""
+    session = UIndexSession(tmp_path, use_cache=False, pubmed=pubmed, openalex=openalex)
+
+    async def run():
+        one = await session.acompute("Smith John")
+        many = await session.acompute_many(["Doe Jane", "Smith John"], max_concurrency=2)
+        return one, many
+
+    one, many = asyncio.run(run())
+
+    assert one.qualifying_papers[0].citations == 10
+    assert [r.author for r in many] == ["Doe Jane", "Smith John"]
+    assert many[1].u_index == one.u_index
+
+
+def test_result_dict_round_trip():
+    """to_dict gives the JSON-ready form and from_dict reverses it."""
+    result = UIndexResult("Smith John", 1, 3, 2, 1, [PaperRecord("1", "A", "10.1/a", "2020", "first", 5)],
+                          [PaperRecord("2", "B", None, "2021", "last")], ["1", "2", "3"], 1.0, "2024/01/01")
+
+    assert UIndexResult.from_dict(result.to_dict()) == result
+    assert result.to_dict()["qualifying_papers"][0]["citations"] == 5
+
+
+def test_result_from_old_cached_dict():
+    """Results cached before qualifying_count existed still load."""
+    data = {"author": "Smith John", "u_index": 0, "unmatched_count": 1,
+            "qualifying_papers": [], "unmatched_papers": [{"pmid": "1", "title": "A"}]}
+
+    assert UIndexResult.from_dict(data).qualifying_count == 1
+
+
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_without_h2(tmp_path):
+    """Asking for HTTP/2 without h2 fails when the session is built."""
+    with pytest.raises(ImportError, match="uindex\\[http2\\]"):
+        UIndexSession(tmp_path, http2=True)
+
+
+def test_session_builds_clients_from_environment(monkeypatch, tmp_path):
+    """Sessions build real clients that honor the stand-in URLs."""
+    corpus = Corpus()
+    corpus.add("101", "Lead paper", [("Smith", "John"), ("Doe", "Jane")], "10.1000/a", "2020", 10)
+    corpus.add("102", "Other lead", [("Doe", "Jane"), ("Smith", "John")], "10.1000/b", "2021", 4)
+    server = StandInServer(("127.0.0.1", 0), corpus)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("UINDEX_PUBMED_URL", server.pubmed_url)
+    monkeypatch.setenv("UINDEX_OPENALEX_URL", server.openalex_url)
+
+    with UIndexSession(tmp_path) as session:
+        results = session.compute_many(["Smith John", "Doe Jane"])
+    server.shutdown()
+    server.server_close()
+
+    assert [r.u_index for r in results] == [2, 2]
@@ -0,0 +1,149 @@
+"""Tests for batch mode."""
+
+import csv
+import io
+import json
+
+from click.testing import CliRunner
+from pytest_httpx import HTTPXMock
+from uindex.batch import merge_ndjson, read_authors, select_shard, shard_of
+from uindex.cache import Cache
+from uindex.cli import main
+from uindex.core import PaperRecord, UIndexResult
+from uindex.store import ResultStore
+
+
+ESEARCH_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<eSearchResult><IdList><Id>12345678</Id></IdList></eSearchResult>"""
+
+EFETCH_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>12345678</PMID>
+            <Article>
+                <ArticleTitle>Important Research Paper</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Test</LastName><ForeName>Author</ForeName></Author>
+                    <Author><LastName>Other</LastName><ForeName>Person</ForeName></Author>
+                </AuthorList>
+                <ELocationID EIdType="doi">10.1000/test1</ELocationID>
+            </Article>
+            <DateCompleted><Year>2023</Year></DateCompleted>
+        </MedlineCitation>
+    </PubmedArticle>
+</PubmedArticleSet>"""
+
+OPENALEX_RESPONSE = {
+    "results": [{"doi": "https://doi.org/10.1000/test1", "cited_by_count": 25}]
+}
+
+
+def test_read_authors(tmp_path):
+    """Author files skip blanks, comments and duplicates."""
+    path = tmp_path / "authors.txt"
+    path.write_text("Test Author\n\n# comment\nOther Person\nTest Author\n")
+    assert read_authors(path) == ["Test Author", "Other Person"]
+
+
+def test_batch_writes_ndjson_and_metrics(httpx_mock: HTTPXMock, tmp_path):
+    """Batch mode writes one NDJSON record per author and dumps metrics."""
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+    httpx_mock.add_response(text=EFETCH_RESPONSE)
+    httpx_mock.add_response(json=OPENALEX_RESPONSE)
+
+    authors = tmp_path / "authors.txt"
+    authors.write_text("Test Author\n")
+    output = tmp_path / "out.ndjson"
+    metrics = tmp_path / "metrics.prom"
+
+    runner = CliRunner()
+    result = runner.invoke(main, [
+        "batch", str(authors), "-o", str(output),
+        "--cache-dir", str(tmp_path), "--metrics-file", str(metrics),
+    ])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert records[0]["author"] == "Test Author"
+    assert records[0]["u_index"] == 1
+    assert "uindex_authors_computed_total" in metrics.read_text()
+    assert 'uindex_upstream_requests_total{upstream="pubmed",status="200"}' in metrics.read_text()
+
+
+def test_shards_partition_authors():
+    """Shards are disjoint, cover every author and do not depend on order."""
+    authors = [f"Author {i}" for i in range(100)]
+    shards = [select_shard(authors, i, 4) for i in range(1, 5)]
+
+    assert sorted(a for shard in shards for a in shard) == sorted(authors)
+    assert all(shards)
+    assert select_shard(reversed(authors), 2, 4) == list(reversed(shards[1]))
+    assert shard_of("Author 7", 4) == shard_of("Author 7", 4)
+
+
+def test_merge_ndjson_keeps_newest(tmp_path):
+    """Merging keeps the newest record per author and prefers successes."""
+    one = tmp_path / "one.ndjson"
+    two = tmp_path / "two.ndjson"
+    one.write_text(
+        json.dumps({"author": "A", "u_index": 1, "created_at": 1.0}) + "\n"
+        + json.dumps({"author": "B", "u_index": 5, "created_at": 1.0}) + "\n"
+    )
+    two.write_text(
+        json.dumps({"author": "A", "u_index": 2, "created_at": 2.0}) + "\n"
+        + json.dumps({"author": "B", "error": "boom", "created_at": 3.0}) + "\n"
+    )
+
+    out = io.StringIO()
+    summary = merge_ndjson([one, two], out)
+
+    records = {r["author"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert summary == {"read": 4, "written": 2}
+    assert records["A"]["u_index"] == 2
+    assert records["B"]["u_index"] == 5
+
+
+def test_merge_command_combines_caches(tmp_path):
+    """The merge command folds shard caches into the target cache."""
+    shard = Cache(tmp_path / "shard" / "cache.db")
+    shard.set("author:A", {"u_index": 3})
+    target = Cache(tmp_path / "main" / "cache.db")
+    target.set("author:B", {"u_index": 4})
+
+    runner = CliRunner()
+    result = runner.invoke(main, [
+        "merge", "--cache-db", str(shard.db_path), "--cache-dir", str(tmp_path / "main"),
+    ])
+
+    assert result.exit_code == 0
+    assert target.get("author:A") == {"u_index": 3}
+    assert target.get("author:B") == {"u_index": 4}
+
+
+def test_merged_shard_stores_are_exported(tmp_path):
+    """Authors computed on other shards appear in the export after merge."""
+    def result(author, u_index, created_at):
+        papers = [PaperRecord(f"{author}{i}", "Paper", None, "2020", "first", u_index, created_at)
+                  for i in range(u_index)]
+        return UIndexResult(author, u_index, u_index, u_index, 0, papers, [], [p.pmid for p in papers],
+                            created_at, "2024/01/01")
+
+    ResultStore(tmp_path / "main" / "cache.db").save(result("A", 1, 100.0))
+    Cache(tmp_path / "shard" / "cache.db")
+    shard = ResultStore(tmp_path / "shard" / "cache.db")
+    shard.save(result("B", 1, 100.0))
+    shard.save(result("A", 2, 200.0))
+
+    runner = CliRunner()
+    merged = runner.invoke(main, ["merge", "--cache-db", str(shard.db_path),
+                                  "--cache-dir", str(tmp_path / "main")])
+    exported = runner.invoke(main, ["export", str(tmp_path / "out"), "--format", "csv",
+                                    "--cache-dir", str(tmp_path / "main")])
+
+    assert merged.exit_code == 0
+    assert "2 stored authors" in merged.output
+    assert exported.exit_code == 0
+    with open(tmp_path / "out" / "authors.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["author"], row["u_index"]) for row in rows] == [("A", "2"), ("B", "1")]
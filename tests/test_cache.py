@@ -1,5 +1,6 @@
 """Tests for SQLite-based cache with TTL support."""
 
+import threading
 import time
 from pathlib import Path
 from uindex.cache import Cache
@@ -32,3 +33,75 @@ def test_cache_overwrite(tmp_path):
     cache.set("key1", {"old": "data"})
     cache.set("key1", {"new": "data"})
     assert cache.get("key1") == {"new": "data"}
+
+
+def test_cache_merge_keeps_newest(tmp_path):
+    """Merging another cache keeps the newest entry per key."""
+    older = Cache(tmp_path / "older.db")
+    newer = Cache(tmp_path / "newer.db")
+    older.set("shared", {"v": "old"})
+    newer.set("shared", {"v": "new"})
+    newer.set("only-new", {"v": 1})
+    older.set("only-old", {"v": 2})
+
+    assert older.merge_from(newer.db_path) == 2
+    assert older.get("shared") == {"v": "new"}
+    assert older.get("only-new") == {"v": 1}
+    assert older.get("only-old") == {"v": 2}
+
+    assert newer.merge_from(older.db_path) == 1
+    assert newer.get("shared") == {"v": "new"}
+
+
+def test_cache_get_allow_expired(tmp_path):
+    """Expired entries can still be read when explicitly allowed."""
+    cache = Cache(tmp_path / "test.db", ttl_seconds=0)
+    cache.set("key1", {"data": "value"})
+    time.sleep(0.01)
+    assert cache.get("key1", allow_expired=True) == {"data": "value"}
+    assert cache.get("key1") is None
+
+
+def test_get_or_set(tmp_path):
+    """get_or_set computes and stores on a miss, then reads the cache."""
+    cache = Cache(tmp_path / "test.db")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"data": "value"}
+
+    assert cache.get_or_set("key1", compute) == {"data": "value"}
+    assert cache.get_or_set("key1", compute) == {"data": "value"}
+    assert cache.get("key1") == {"data": "value"}
+    assert len(calls) == 1
+
+
+def test_get_or_set_coalesces_concurrent_misses(tmp_path):
+    """Concurrent misses for one key share a single fill."""
+    cache = Cache(tmp_path / "test.db")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return {"data": "value"}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_set("key1", slow)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_set("key1", slow)))
+                 for _ in range(3)]
+    for t in followers:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert results == [{"data": "value"}] * 4
+    assert len(calls) == 1
@@ -0,0 +1,158 @@
+"""Tests for the record/replay cassette transport."""
+
+import threading
+
+import httpx
+import pytest
+from click.testing import CliRunner
+from pytest_httpx import HTTPXMock
+from uindex.cassette import CassetteMissError, CassetteTransport
+from uindex.cli import main
+from uindex.corpus import Corpus
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from uindex.standin import StandInServer
+from uindex.transport import build_transport
+
+
+WORKS = {"results": [{"doi": "https://doi.org/10.1000/a", "cited_by_count": 3}], "meta": {"count": 1}}
+
+
+def openalex_client(cassette, **kwargs):
+    return OpenAlexClient(transport=build_transport("openalex", pool=cassette, **kwargs))
+
+
+def test_records_then_replays(httpx_mock: HTTPXMock, tmp_path):
+    """The first run records to disk; later runs replay without the network."""
+    httpx_mock.add_response(json=WORKS)
+    path = tmp_path / "cassette.jsonl.gz"
+
+    client = openalex_client(CassetteTransport(path))
+    assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 3}
+    client.close()
+
+    cassette = CassetteTransport(path, mode="replay")
+    client = openalex_client(cassette)
+    assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 3}
+    client.close()
+    assert len(httpx_mock.get_requests()) == 1
+    assert len(cassette.records) == 1
+
+
+def test_replay_miss(httpx_mock: HTTPXMock, tmp_path):
+    """Replay mode fails fast on requests that were not recorded."""
+    httpx_mock.add_response(json=WORKS)
+    path = tmp_path / "cassette.jsonl.gz"
+    client = openalex_client(CassetteTransport(path))
+    client.get_citations_by_dois(["10.1000/a"])
+    client.close()
+
+    client = openalex_client(CassetteTransport(path, mode="replay"))
+    with pytest.raises(CassetteMissError):
+        client.get_citations_by_dois(["10.1000/b"])
+    with pytest.raises(FileNotFoundError):
+        CassetteTransport(tmp_path / "missing.jsonl.gz", mode="replay")
+
+
+def test_post_bodies_are_told_apart(httpx_mock: HTTPXMock, tmp_path):
+    """POSTs to the same URL are matched on their body."""
+    httpx_mock.add_response(text="one")
+    httpx_mock.add_response(text="two")
+    path = tmp_path / "cassette.jsonl.gz"
+    with httpx.Client(transport=CassetteTransport(path)) as client:
+        client.post("https://example.org/efetch.fcgi", data={"id": "1"})
+        client.post("https://example.org/efetch.fcgi", data={"id": "2"})
+
+    with httpx.Client(transport=CassetteTransport(path, mode="replay")) as client:
+        assert client.post("https://example.org/efetch.fcgi", data={"id": "2"}).text == "two"
+        assert client.post("https://example.org/efetch.fcgi", data={"id": "1"}).text == "one"
+
+
+def test_repeated_requests_replay_in_order(httpx_mock: HTTPXMock, tmp_path):
+    """A recorded 429 and its retry replay in order, then the last response repeats."""
+    httpx_mock.add_response(status_code=429, headers={"Retry-After": "2"})
+    httpx_mock.add_response(json=WORKS)
+    path = tmp_path / "cassette.jsonl.gz"
+    client = openalex_client(CassetteTransport(path), sleep=lambda s: None)
+    client.get_citations_by_dois(["10.1000/a"])
+    client.close()
+
+    delays = []
+    client = openalex_client(CassetteTransport(path, mode="replay"), sleep=delays.append)
+    for _ in range(2):
+        assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 3}
+    client.close()
+    assert delays == [2.0]
+
+
+def test_simulated_latency(httpx_mock: HTTPXMock, tmp_path):
+    """Replayed responses wait for the configured latency; recording does not."""
+    httpx_mock.add_response(json=WORKS)
+    path = tmp_path / "cassette.jsonl.gz"
+    slept = []
+    client = openalex_client(CassetteTransport(path, latency=0.25, sleep=slept.append))
+    client.get_citations_by_dois(["10.1000/a"])
+    client.close()
+    assert slept == []
+
+    client = openalex_client(CassetteTransport(path, latency=0.25, sleep=slept.append))
+    client.get_citations_by_dois(["10.1000/a"])
+    client.close()
+    assert slept == [0.25]
+
+
+def test_record_mode_rewrites(httpx_mock: HTTPXMock, tmp_path):
+    """Record mode forwards every request and replaces the cassette."""
+    httpx_mock.add_response(json=WORKS)
+    httpx_mock.add_response(json={"results": [], "meta": {"count": 0}})
+    path = tmp_path / "cassette.jsonl.gz"
+    client = openalex_client(CassetteTransport(path))
+    client.get_citations_by_dois(["10.1000/a"])
+    client.close()
+
+    client = openalex_client(CassetteTransport(path, mode="record"))
+    assert client.get_citations_by_dois(["10.1000/a"]) == {}
+    client.close()
+
+    assert len(CassetteTransport(path).records) == 1
+    client = openalex_client(CassetteTransport(path, mode="replay"))
+    assert client.get_citations_by_dois(["10.1000/a"]) == {}
+    client.close()
+
+
+def test_cli_records_and_replays_both_clients(monkeypatch, tmp_path):
+    """UINDEX_CASSETTE records a CLI run against the stand-in and replays it offline."""
+    corpus = Corpus()
+    corpus.add("101", "Lead paper", [("Smith", "John"), ("Doe", "Jane")], "10.1000/a", "2020", 10)
+    corpus.add("102", "No DOI paper", [("Smith", "John")], None, "2023", 3)
+    server = StandInServer(("127.0.0.1", 0), corpus)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("UINDEX_PUBMED_URL", server.pubmed_url)
+    monkeypatch.setenv("UINDEX_OPENALEX_URL", server.openalex_url)
+    monkeypatch.setenv("UINDEX_CASSETTE", str(tmp_path / "smith.jsonl.gz"))
+    args = ["Smith John", "--no-cache", "--cache-dir", str(tmp_path)]
+
+    recorded = CliRunner().invoke(main, args)
+    server.shutdown()
+    server.server_close()
+    replayed = CliRunner().invoke(main, args)
+
+    assert recorded.exit_code == 0
+    assert replayed.exit_code == 0
+    assert replayed.output == recorded.output
+    assert "U-index: 2" in replayed.output
+    # esearch, efetch, works by DOI and by PMID
+    assert len(CassetteTransport(tmp_path / "smith.jsonl.gz").records) == 4
+
+
+def test_pubmed_client_replay(httpx_mock: HTTPXMock, tmp_path):
+    """The PubMed client works over a cassette like over a pool."""
+    httpx_mock.add_response(text="<eSearchResult><IdList></IdList></eSearchResult>")
+    path = tmp_path / "cassette.jsonl.gz"
+    client = PubMedClient(transport=build_transport("pubmed", pool=CassetteTransport(path)))
+    assert client.fetch_author_papers("Smith John") == []
+    client.close()
+
+    client = PubMedClient(transport=build_transport("pubmed", pool=CassetteTransport(path, mode="replay")))
+    assert client.fetch_author_papers("Smith John") == []
+    client.close()
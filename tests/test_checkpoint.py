@@ -0,0 +1,156 @@
+"""Tests for resumable batch checkpoints."""
+
+import io
+import json
+import sqlite3
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from uindex.batch import drop_superseded_errors, merge_ndjson, run_batch
+from uindex.checkpoint import Checkpoint, unit_key
+from uindex.core import UIndexResult
+from uindex.pubmed import PubMedClient
+
+
+ESEARCH_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<eSearchResult><IdList><Id>12345678</Id></IdList></eSearchResult>"""
+
+EFETCH_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>12345678</PMID>
+            <Article>
+                <ArticleTitle>Checkpointed Paper</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Test</LastName><ForeName>Author</ForeName></Author>
+                </AuthorList>
+            </Article>
+        </MedlineCitation>
+    </PubmedArticle>
+</PubmedArticleSet>"""
+
+
+class CrashingService:
+    """Fake service that crashes on a given author."""
+
+    def __init__(self, crash_on: str | None = None, fail_on: str | None = None):
+        self.crash_on = crash_on
+        self.fail_on = fail_on
+        self.computed = []
+
+    def compute(self, author, refresh=False, full_refresh=False):
+        if author == self.crash_on:
+            raise KeyboardInterrupt
+        if author == self.fail_on:
+            raise httpx.ConnectError("upstream down")
+        self.computed.append(author)
+        return UIndexResult(author, 1, 1, 1, 0, [], [], ["1"], 100.0, "2024/01/01")
+
+
+def test_unit_key_is_stable():
+    """Unit keys hash list parts deterministically."""
+    assert unit_key("efetch", "A", ["1", "2"]) == unit_key("efetch", "A", ["1", "2"])
+    assert unit_key("efetch", "A", ["1", "2"]) != unit_key("efetch", "A", ["1", "3"])
+
+
+def test_checkpoint_jobs_are_isolated(tmp_path):
+    """Clearing one job keeps the progress of others."""
+    one = Checkpoint(tmp_path / "cache.db", "one")
+    two = Checkpoint(tmp_path / "cache.db", "two")
+    one.mark_author_done("Test Author")
+    two.mark_author_done("Other Author")
+
+    one.clear()
+
+    assert one.completed_authors() == set()
+    assert two.completed_authors() == {"Other Author"}
+
+
+def test_resume_skips_completed_authors(tmp_path):
+    """A resumed batch only computes authors not finished before the crash."""
+    checkpoint = Checkpoint(tmp_path / "cache.db", "job")
+    authors = ["One Author", "Two Author", "Three Author"]
+
+    first = io.StringIO()
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(CrashingService(crash_on="Two Author"), authors, first, checkpoint=checkpoint)
+
+    service = CrashingService()
+    second = io.StringIO()
+    summary = run_batch(service, authors, second, checkpoint=checkpoint)
+
+    assert service.computed == ["Two Author", "Three Author"]
+    assert summary == {"computed": 2, "failed": 0, "skipped": 1}
+    assert [json.loads(line)["author"] for line in second.getvalue().splitlines()] == service.computed
+
+
+def test_checkpoint_cleared_after_clean_run(tmp_path):
+    """A run without failures clears the job's checkpoint; one with failures keeps it."""
+    checkpoint = Checkpoint(tmp_path / "cache.db", "job")
+    checkpoint.set(unit_key("efetch", "One Author", ["1"]), [{"pmid": "1"}])
+    authors = ["One Author", "Two Author"]
+
+    run_batch(CrashingService(fail_on="Two Author"), authors, io.StringIO(), checkpoint=checkpoint)
+    assert checkpoint.completed_authors() == {"One Author"}
+
+    run_batch(CrashingService(), authors, io.StringIO(), checkpoint=checkpoint)
+    assert checkpoint.completed_authors() == set()
+    assert checkpoint.get(unit_key("efetch", "One Author", ["1"])) is None
+
+
+def test_any_author_error_is_recorded(tmp_path):
+    """Errors other than HTTP failures are recorded per author and the run goes on."""
+
+    class BrokenService(CrashingService):
+        def compute(self, author, refresh=False, full_refresh=False):
+            if author == "One Author":
+                raise sqlite3.OperationalError("database is locked")
+            return super().compute(author, refresh, full_refresh)
+
+    out = io.StringIO()
+    summary = run_batch(BrokenService(), ["One Author", "Two Author"], out)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert summary == {"computed": 1, "failed": 1, "skipped": 0}
+    assert records[0]["error"] == "OperationalError: database is locked"
+    assert (records[1]["author"], records[1]["u_index"]) == ("Two Author", 1)
+
+
+def test_resumed_output_drops_superseded_errors(tmp_path):
+    """Errors retried successfully on resume are removed from the appended output and merges."""
+    checkpoint = Checkpoint(tmp_path / "cache.db", "job")
+    authors = ["One Author", "Two Author", "Three Author"]
+    output = tmp_path / "out.ndjson"
+
+    with open(output, "w") as out:
+        run_batch(CrashingService(fail_on="Two Author"), authors, out, checkpoint=checkpoint)
+    with open(output, "a") as out:
+        run_batch(CrashingService(), authors, out, checkpoint=checkpoint)
+
+    assert drop_superseded_errors(output) == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["author"] for r in records] == ["One Author", "Three Author", "Two Author"]
+    assert all("error" not in r for r in records)
+    assert drop_superseded_errors(output) == 0
+
+    merged = io.StringIO()
+    merge_ndjson([output], merged)
+    assert all("error" not in json.loads(line) for line in merged.getvalue().splitlines())
+
+
+def test_efetch_batch_reused_from_checkpoint(httpx_mock: HTTPXMock, tmp_path):
+    """Finished efetch batches are not requested again."""
+    checkpoint = Checkpoint(tmp_path / "cache.db", "job")
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+    httpx_mock.add_response(text=EFETCH_RESPONSE)
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+
+    client = PubMedClient(checkpoint=checkpoint)
+    first = client.fetch_author_papers("Test Author")
+    second = client.fetch_author_papers("Test Author")
+
+    assert first == second
+    assert second[0].title == "Checkpointed Paper"
+    assert len(httpx_mock.get_requests()) == 3
@@ -46,6 +46,24 @@ def test_cli_basic(httpx_mock: HTTPXMock, tmp_path):
     assert "Important Research Paper" in result.output
 
 
+def test_cli_format_and_top(httpx_mock: HTTPXMock, tmp_path):
+    """--format picks a machine-readable output and --top limits the listing."""
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+    httpx_mock.add_response(text=EFETCH_RESPONSE)
+    httpx_mock.add_response(json=OPENALEX_RESPONSE)
+
+    runner = CliRunner()
+    as_csv = runner.invoke(main, ["Test Author", "--cache-dir", str(tmp_path), "--format", "csv"])
+    as_json = runner.invoke(main, ["Test Author", "--cache-dir", str(tmp_path), "--format", "json",
+                                   "--top", "0"])
+
+    assert as_csv.exit_code == 0
+    assert as_csv.output.splitlines()[1].startswith("Test Author,12345678,Important Research Paper,")
+    assert as_json.exit_code == 0
+    assert '"u_index": 1' in as_json.output
+    assert '"qualifying_papers": []' in as_json.output
+
+
 def test_cli_no_cache(httpx_mock: HTTPXMock, tmp_path):
     """CLI with --no-cache skips caching."""
     httpx_mock.add_response(text=ESEARCH_RESPONSE)
@@ -178,3 +196,22 @@ def test_doi_case_insensitive_matching(httpx_mock: HTTPXMock, tmp_path):
     # Verify links are present
     assert "https://pubmed.ncbi.nlm.nih.gov/" in result.output
     assert "https://openalex.org/works/" in result.output
+
+
+def test_cli_incremental_refresh(httpx_mock: HTTPXMock, tmp_path):
+    """--refresh only searches for new papers when cached citations are fresh."""
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+    httpx_mock.add_response(text=EFETCH_RESPONSE)
+    httpx_mock.add_response(json=OPENALEX_RESPONSE)
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)  # no new PMIDs since last sync
+
+    runner = CliRunner()
+    first = runner.invoke(main, ["Test Author", "--cache-dir", str(tmp_path)])
+    second = runner.invoke(main, ["Test Author", "--refresh", "--cache-dir", str(tmp_path)])
+
+    assert first.exit_code == 0
+    assert second.exit_code == 0
+    assert "U-index: 1" in second.output
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 4
+    assert "mindate=" in str(requests[-1].url)
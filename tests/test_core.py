@@ -1,17 +1,21 @@
 """Tests for core U-index calculation logic."""
 
-from uindex.core import calculate_u_index
+from uindex.core import (
+    PaperRecord,
+    UIndexResult,
+    calculate_u_index,
+    compute_author,
+    refresh_author,
+)
+
+
+def cited(*counts):
+    return [PaperRecord(str(i), "", None, "", "first", count) for i, count in enumerate(counts)]
 
 
 def test_calculate_u_index_basic():
     """U=3 when 3 papers have >= 3 citations each."""
-    papers = [
-        {"citations": 10},
-        {"citations": 5},
-        {"citations": 3},
-        {"citations": 1},
-    ]
-    assert calculate_u_index(papers) == 3
+    assert calculate_u_index(cited(10, 5, 3, 1)) == 3
 
 
 def test_calculate_u_index_empty():
@@ -21,15 +25,138 @@ def test_calculate_u_index_empty():
 
 def test_calculate_u_index_no_citations():
     """U=0 when all papers have 0 citations."""
-    papers = [{"citations": 0}, {"citations": 0}]
-    assert calculate_u_index(papers) == 0
+    assert calculate_u_index(cited(0, 0)) == 0
 
 
 def test_calculate_u_index_all_high():
     """U equals paper count when all have enough citations."""
+    assert calculate_u_index(cited(100, 50, 30)) == 3
+
+
+def test_calculate_u_index_unsorted():
+    """Papers are ranked by citations before counting."""
+    assert calculate_u_index(cited(1, 4, 2, 3)) == 2
+
+
+def test_paper_record_dict_round_trip():
+    """Records convert to and from JSON-ready dicts."""
+    record = PaperRecord("1", "Title", "10.1000/x", "2020", "first", citations=7)
+    assert record.to_dict() == {
+        "pmid": "1", "title": "Title", "doi": "10.1000/x", "year": "2020",
+        "position": "first", "citations": 7,
+    }
+    assert PaperRecord.from_dict(record.to_dict()) == record
+    assert "citations" not in PaperRecord("2", "T", None, "", "last").to_dict()
+
+
+def test_compute_author_returns_result(pubmed, openalex):
+    """compute_author builds a UIndexResult whose dict form survives a round trip."""
     papers = [
-        {"citations": 100},
-        {"citations": 50},
-        {"citations": 30},
+        PaperRecord("1", "T", "10.1000/t", "2020", "first"),
+        PaperRecord("2", "U", None, "2021", "last"),
+        PaperRecord("3", "M", None, "2022", None),
+    ]
+    pubmed.papers = papers
+    openalex.citations = {"10.1000/t": 3}
+    result = compute_author("A", pubmed, openalex)
+
+    assert isinstance(result, UIndexResult)
+    assert (result.u_index, result.total_papers, result.qualifying_count, result.unmatched_count) == (1, 3, 2, 1)
+    data = result.to_dict()
+    assert data["qualifying_papers"][0]["citations"] == 3
+    assert UIndexResult.from_dict(data) == result
+
+
+def test_refresh_author_fetches_only_new_and_stale(pubmed, openalex):
+    """Incremental refresh fetches new PMIDs and only stale citation counts."""
+    old = PaperRecord("1", "Old", "10.1000/old", "2020", "first")
+    pubmed.papers = [old]
+    openalex.citations = {"10.1000/old": 5}
+    previous = compute_author("Test Author", pubmed, openalex)
+    assert previous.u_index == 1
+
+    new = PaperRecord("2", "New", "10.1000/NEW", "2024", "last")
+    middle = PaperRecord("3", "Middle", "10.1000/mid", "2024", None)
+    pubmed.papers = [old, new, middle]
+    pubmed.calls.clear()
+    openalex.citations["10.1000/new"] = 9
+    openalex.requested.clear()
+
+    results = refresh_author(previous, pubmed, openalex)
+
+    assert pubmed.calls == [{"author": "Test Author", "since": previous.synced_on, "exclude": {"1"}}]
+    assert openalex.requested == [["10.1000/new"]]
+    assert results.total_papers == 3
+    assert results.qualifying_count == 2
+    assert results.u_index == 2
+    assert results.pmids == ["1", "2", "3"]
+
+
+def test_refresh_author_refetches_stale_citations(pubmed, openalex):
+    """Citation counts older than the max age are fetched again."""
+    pubmed.papers = [PaperRecord("1", "Old", "10.1000/old", "2020", "first")]
+    openalex.citations = {"10.1000/old": 5}
+    previous = compute_author("Test Author", pubmed, openalex)
+
+    openalex.citations["10.1000/old"] = 50
+    results = refresh_author(previous, pubmed, openalex, max_citation_age=-1)
+
+    assert results.qualifying_papers[0].citations == 50
+
+
+def test_refresh_author_without_sync_info_recomputes(pubmed, openalex):
+    """Results lacking sync information are recomputed from scratch."""
+    pubmed.papers = [PaperRecord("1", "Old", None, "2020", "first")]
+    previous = UIndexResult("Test Author", 0, 0, 0, 0, [], [], [])
+
+    results = refresh_author(previous, pubmed, openalex)
+
+    assert pubmed.calls == [{"author": "Test Author", "since": None, "exclude": set()}]
+    assert results.unmatched_count == 1
+
+
+def test_doi_spelling_variants_share_one_lookup(pubmed, openalex):
+    """Papers whose DOIs differ only in spelling are looked up once and both matched."""
+    pubmed.papers = [
+        PaperRecord("1", "A", "doi:10.1000/ABC.", "2020", "first"),
+        PaperRecord("2", "B", "https://doi.org/10.1000/abc", "2021", "last"),
     ]
-    assert calculate_u_index(papers) == 3
+    openalex.citations = {"10.1000/abc": 4}
+
+    results = compute_author("Test Author", pubmed, openalex)
+
+    assert openalex.requested == [["10.1000/abc"]]
+    assert [p.citations for p in results.qualifying_papers] == [4, 4]
+    assert results.unmatched_count == 0
+
+
+def test_pmid_fallback_for_papers_without_matched_doi(pubmed, openalex):
+    """DOI-less and DOI-unmatched papers are looked up by PMID in one batch."""
+    pubmed.papers = [
+        PaperRecord("1", "Has DOI", "10.1000/known", "2020", "first"),
+        PaperRecord("2", "No DOI", None, "2021", "last"),
+        PaperRecord("3", "Unknown DOI", "10.1000/unknown", "2022", "first"),
+        PaperRecord("4", "Nowhere", None, "2023", "last"),
+    ]
+    openalex.citations = {"10.1000/known": 10}
+    openalex.pmid_citations = {"2": 7, "3": 5}
+
+    results = compute_author("Test Author", pubmed, openalex)
+
+    assert openalex.requested_pmids == [["2", "3", "4"]]
+    assert [(p.pmid, p.citations) for p in results.qualifying_papers] == [("1", 10), ("2", 7), ("3", 5)]
+    assert [p.pmid for p in results.unmatched_papers] == ["4"]
+    assert results.u_index == 3
+
+
+def test_pmid_matches_are_kept_on_refresh(pubmed, openalex):
+    """Citation counts found by PMID are reused like DOI matches."""
+    pubmed.papers = [PaperRecord("2", "No DOI", None, "2021", "last")]
+    openalex.pmid_citations = {"2": 7}
+    previous = compute_author("Test Author", pubmed, openalex)
+
+    openalex.requested_pmids.clear()
+    results = refresh_author(previous, pubmed, openalex)
+
+    assert openalex.requested_pmids == []
+    assert results.qualifying_papers[0].citations == 7
@@ -0,0 +1,155 @@
+"""Tests for the synthetic corpus generator."""
+
+import json
+import threading
+import xml.etree.ElementTree as ET
+
+import pytest
+from click.testing import CliRunner
+from uindex.core import compute_author
+from uindex.corpus import RESEARCHERS, SyntheticCorpus, main
+from uindex.index import AuthorshipIndex, CitationIndex
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from uindex.standin import StandInServer
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(corpus):
+        server = StandInServer(("127.0.0.1", 0), corpus)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def citations(corpus, pmids):
+    return [corpus.work_by_pmid(pmid)["cited_by_count"] for pmid in pmids]
+
+
+def h_index(counts):
+    counts = sorted(counts, reverse=True)
+    return sum(1 for i, c in enumerate(counts) if c >= i + 1)
+
+
+def test_deterministic():
+    """The same seed gives the same corpus; another seed does not."""
+    first = SyntheticCorpus(background_papers=10, seed=1)
+    second = SyntheticCorpus(background_papers=10, seed=1)
+    other = SyntheticCorpus(background_papers=10, seed=2)
+
+    assert list(first.iter_articles()) == list(second.iter_articles())
+    assert list(first.iter_articles()) != list(other.iter_articles())
+
+
+def test_researchers_have_profile_h_index():
+    """Each researcher's papers give exactly the profile's h-index."""
+    corpus = SyntheticCorpus(researchers_per_profile=2, consortium_size=(20, 30))
+
+    assert len(corpus.researchers) == 2 * len(RESEARCHERS)
+    for researcher in corpus.researchers:
+        assert h_index(citations(corpus, corpus.search(researcher["name"]))) == researcher["h"]
+
+
+def test_compute_author_matches_profile_u_index(start_server):
+    """compute_author against the stand-in finds each profile's U-index."""
+    corpus = SyntheticCorpus(doi_missing_rate=0.2, consortium_size=(20, 30))
+    server = start_server(corpus)
+    pubmed = PubMedClient(base_url=server.pubmed_url)
+    openalex = OpenAlexClient(base_url=server.openalex_url)
+
+    for researcher in corpus.researchers:
+        results = compute_author(researcher["name"], pubmed, openalex)
+
+        assert results.u_index == researcher["u"], researcher["profile"]
+        assert results.total_papers == researcher["lead_papers"] + researcher["middle_papers"]
+        assert results.unmatched_count == 0
+    pubmed.close()
+    openalex.close()
+
+
+def test_doi_missing_rate():
+    """Roughly doi_missing_rate of the papers have no DOI."""
+    corpus = SyntheticCorpus(background_papers=2000, doi_missing_rate=0.25)
+    missing = sum(1 for work in corpus.iter_works() if work["doi"] is None)
+
+    assert 0.2 < missing / len(corpus) < 0.3
+
+
+def test_consortium_author_lists():
+    """Collaborative profiles get consortium-sized author lists."""
+    corpus = SyntheticCorpus(consortium_size=(500, 600))
+    consortium = next(r for r in corpus.researchers if r["profile"] == "Dr. Consortium")
+    sizes = [
+        len(ET.fromstring(corpus.article_xml(pmid)).findall(".//Author"))
+        for pmid in corpus.search(consortium["name"])
+    ]
+
+    assert max(sizes) >= 500
+    solo = next(r for r in corpus.researchers if r["profile"] == "Dr. Solo")
+    assert all(len(ET.fromstring(corpus.article_xml(pmid)).findall(".//Author")) <= 12
+               for pmid in corpus.search(solo["name"]))
+
+
+def test_background_authors_are_not_searchable():
+    """Background papers never match a researcher search."""
+    corpus = SyntheticCorpus(background_papers=500)
+    researcher_pmids = {pmid for r in corpus.researchers for pmid in corpus.search(r["name"])}
+
+    assert len(corpus) == len(researcher_pmids) + 500
+    assert list(corpus.pmids())[-500:] == sorted(set(corpus.pmids()) - researcher_pmids)
+    assert corpus.search("Nobody Anna") == []
+    assert corpus.article_xml("1") is None
+
+
+def test_work_by_doi():
+    """Works are found by generated DOI, but not by a DOI of another PMID."""
+    corpus = SyntheticCorpus(doi_missing_rate=0)
+    pmid = next(corpus.pmids())
+    doi = corpus.work_by_pmid(pmid)["doi"].removeprefix("https://doi.org/")
+
+    assert corpus.work_by_doi(doi)["ids"]["pmid"].endswith(pmid)
+    assert corpus.work_by_doi("10.1000/synthetic." + pmid) is None
+
+
+def test_written_files_round_trip_through_indexes(tmp_path):
+    """Written PubMed and OpenAlex files ingest into the offline indexes."""
+    corpus = SyntheticCorpus(background_papers=100, consortium_size=(20, 30))
+    researcher = corpus.researchers[0]
+
+    pubmed_files = corpus.write_pubmed(tmp_path / "pubmed", articles_per_file=200)
+    openalex_files = corpus.write_openalex(tmp_path / "openalex", works_per_file=200)
+    authorship = AuthorshipIndex(tmp_path / "pubmed.db")
+    for path in pubmed_files:
+        authorship.ingest(path)
+    citation_index = CitationIndex(tmp_path / "openalex.db")
+    for path in openalex_files:
+        citation_index.ingest(path)
+
+    assert len(pubmed_files) == len(openalex_files) == -(-len(corpus) // 200)
+    assert len(authorship) == len(corpus)
+    assert len(citation_index) == sum(1 for work in corpus.iter_works() if work["doi"])
+    papers = authorship.author_papers(researcher["name"])
+    assert {p.pmid for p in papers} <= set(corpus.search(researcher["name"]))
+    assert citation_index.get_citations_by_pmids([papers[0].pmid]) == {
+        papers[0].pmid: corpus.work_by_pmid(papers[0].pmid)["cited_by_count"]
+    }
+
+
+def test_cli_writes_corpus(tmp_path):
+    """python -m uindex.corpus writes the roster and both file sets."""
+    result = CliRunner().invoke(main, [str(tmp_path), "--researchers-per-profile", "1",
+                                       "--background-papers", "10"])
+
+    assert result.exit_code == 0
+    roster = [json.loads(line) for line in (tmp_path / "researchers.ndjson").read_text().splitlines()]
+    assert [r["u"] for r in roster] == [p["u"] for p in RESEARCHERS]
+    assert list((tmp_path / "pubmed").glob("*.xml.gz"))
+    assert list((tmp_path / "openalex").glob("*.gz"))
@@ -0,0 +1,34 @@
+"""Tests for DOI canonicalization."""
+
+import pytest
+from uindex.doi import normalize_doi
+
+
+@pytest.mark.parametrize("raw", [
+    "10.1000/abc",
+    "10.1000/ABC",
+    " 10.1000/abc ",
+    "doi:10.1000/abc",
+    "DOI: 10.1000/abc",
+    "https://doi.org/10.1000/abc",
+    "http://dx.doi.org/10.1000/ABC",
+    "doi.org/10.1000/abc",
+    "10.1000/abc.",
+    "10.1000/abc;",
+    "10.1000/abc)",
+])
+def test_normalize_doi_variants(raw):
+    """Case, prefixes, URL forms and trailing punctuation are normalized away."""
+    assert normalize_doi(raw) == "10.1000/abc"
+
+
+def test_normalize_doi_keeps_balanced_brackets():
+    """Parentheses that belong to the DOI are kept."""
+    doi = "10.1002/(SICI)1097-4636(199603)"
+    assert normalize_doi(doi) == doi.lower()
+
+
+@pytest.mark.parametrize("raw", [None, "", "   ", "not a doi", "doi:"])
+def test_normalize_doi_rejects_non_dois(raw):
+    """Values that are not DOIs normalize to None."""
+    assert normalize_doi(raw) is None
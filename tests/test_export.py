@@ -0,0 +1,119 @@
+"""Tests for columnar export of results."""
+
+import csv
+import importlib.util
+import json
+
+import pytest
+from click.testing import CliRunner
+from uindex.cli import main
+from uindex.core import UIndexResult
+from uindex.export import export_results, read_ndjson_results
+from uindex.store import ResultStore
+
+
+needs_pyarrow = pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None,
+                                   reason="pyarrow is not installed")
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export(tmp_path, make_result):
+    """CSV tables hold one row per author and per first/last-author paper."""
+    paths = export_results([make_result(), make_result("Doe Jane")], tmp_path, "csv", row_group_size=2)
+
+    authors = read_csv(paths["authors"])
+    papers = read_csv(paths["papers"])
+    assert [row["author"] for row in authors] == ["Smith John", "Doe Jane"]
+    assert authors[0]["u_index"] == "2"
+    assert authors[0]["leadership_share"] == "0.75"
+    assert len(papers) == 6
+    assert [row["pmid"] for row in papers[:3]] == ["1", "2", "3"]
+    assert papers[2]["citations"] == ""
+
+
+@needs_pyarrow
+def test_parquet_export_in_row_groups(tmp_path, make_result):
+    """Parquet tables are written one row group per row_group_size rows, with typed columns."""
+    import pyarrow.parquet as pq
+
+    results = [make_result(f"Author {i}") for i in range(5)]
+    paths = export_results(results, tmp_path, "parquet", row_group_size=4)
+
+    papers = pq.ParquetFile(paths["papers"])
+    assert papers.metadata.num_rows == 15
+    assert papers.metadata.num_row_groups == 4
+    table = papers.read()
+    assert table.column("citations").to_pylist()[:3] == [9, 2, None]
+    assert str(table.schema.field("citations").type) == "int64"
+    assert pq.read_table(paths["authors"]).column("author").to_pylist()[-1] == "Author 4"
+
+
+@needs_pyarrow
+def test_arrow_export_memory_maps(tmp_path, make_result):
+    """Arrow IPC files can be memory-mapped and read without copying."""
+    import pyarrow as pa
+
+    paths = export_results([make_result()], tmp_path, "arrow")
+
+    with pa.memory_map(str(paths["authors"])) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.column("u_index").to_pylist() == [2]
+
+
+def test_empty_export(tmp_path):
+    """No results still writes tables with a header."""
+    paths = export_results([], tmp_path, "csv")
+
+    assert paths["authors"].read_text().strip() == (
+        "author,u_index,total_papers,qualifying_count,unmatched_count,leadership_share,created_at,synced_on")
+
+
+def test_read_ndjson_results_skips_errors(tmp_path, make_result):
+    """Batch error records are skipped when reading results back."""
+    path = tmp_path / "batch.ndjson"
+    path.write_text(json.dumps(make_result().to_dict()) + "\n"
+                    + json.dumps({"author": "Doe Jane", "error": "HTTP 500"}) + "\n\n")
+
+    assert list(read_ndjson_results([path])) == [make_result()]
+
+
+def test_export_from_store(tmp_path, make_result):
+    """Stored results stream into the export."""
+    store = ResultStore(tmp_path / "cache.db")
+    store.save(make_result("Smith John"))
+    store.save(make_result("Doe Jane"))
+    store.save(UIndexResult("Roe Richard", 0, 0, 0, 0, [], [], [], 100.0, "2024/01/01"))
+
+    assert [r.author for r in store.results()] == ["Doe Jane", "Roe Richard", "Smith John"]
+    paths = export_results(store.results(), tmp_path / "out", "csv")
+    assert [row["author"] for row in read_csv(paths["authors"])] == ["Doe Jane", "Roe Richard", "Smith John"]
+    assert len(read_csv(paths["papers"])) == 6
+
+
+def test_cli_export(tmp_path, make_result):
+    """uindex export writes tables from the result store or NDJSON files."""
+    ResultStore(tmp_path / "cache.db").save(make_result())
+    ndjson = tmp_path / "batch.ndjson"
+    ndjson.write_text(json.dumps(make_result("Doe Jane").to_dict()) + "\n")
+    runner = CliRunner()
+
+    from_store = runner.invoke(main, ["export", str(tmp_path / "a"), "--format", "csv",
+                                      "--cache-dir", str(tmp_path)])
+    from_ndjson = runner.invoke(main, ["export", str(tmp_path / "b"), "--format", "csv",
+                                       "--from-ndjson", str(ndjson)])
+
+    assert from_store.exit_code == 0
+    assert read_csv(tmp_path / "a" / "authors.csv")[0]["author"] == "Smith John"
+    assert from_ndjson.exit_code == 0
+    assert read_csv(tmp_path / "b" / "authors.csv")[0]["author"] == "Doe Jane"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow is installed")
+def test_parquet_without_pyarrow(tmp_path, make_result):
+    """Asking for Parquet without pyarrow fails with an install hint."""
+    with pytest.raises(ImportError, match="uindex\\[parquet\\]"):
+        export_results([make_result()], tmp_path, "parquet")
@@ -0,0 +1,284 @@
+"""Tests for local indexes built from offline dumps."""
+
+import gzip
+import json
+
+from click.testing import CliRunner
+from pytest_httpx import HTTPXMock
+from uindex.cli import main
+from uindex.index import AuthorshipIndex, CitationIndex, ingest_openalex, ingest_pubmed
+from uindex.pubmed import PubMedClient
+
+
+BASELINE = """<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>11111111</PMID>
+            <Article>
+                <ArticleTitle>First Author Paper</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Müller</LastName><ForeName>Anna</ForeName><Initials>A</Initials></Author>
+                    <Author><LastName>Jones</LastName><ForeName>Jane</ForeName><Initials>J</Initials></Author>
+                    <Author><CollectiveName>Big Consortium</CollectiveName></Author>
+                </AuthorList>
+                <ELocationID EIdType="doi">10.1000/one</ELocationID>
+            </Article>
+            <DateCompleted><Year>2021</Year></DateCompleted>
+        </MedlineCitation>
+    </PubmedArticle>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>22222222</PMID>
+            <Article>
+                <ArticleTitle>Middle Author Paper</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Jones</LastName><ForeName>Jane</ForeName></Author>
+                    <Author><LastName>Muller</LastName><ForeName>Anna</ForeName></Author>
+                    <Author><LastName>Doe</LastName><ForeName>Bob</ForeName></Author>
+                </AuthorList>
+            </Article>
+            <DateCompleted><Year>2022</Year></DateCompleted>
+        </MedlineCitation>
+    </PubmedArticle>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>33333333</PMID>
+            <Article>
+                <ArticleTitle>Last Author Paper</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Doe</LastName><ForeName>Bob</ForeName></Author>
+                    <Author><LastName>Müller</LastName><ForeName>Anna</ForeName></Author>
+                </AuthorList>
+                <ELocationID EIdType="doi">10.1000/three</ELocationID>
+            </Article>
+            <PubDate><Year>2023</Year></PubDate>
+        </MedlineCitation>
+    </PubmedArticle>
+</PubmedArticleSet>"""
+
+UPDATE = """<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>11111111</PMID>
+            <Article>
+                <ArticleTitle>First Author Paper (revised)</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Müller</LastName><ForeName>Anna</ForeName></Author>
+                    <Author><LastName>Jones</LastName><ForeName>Jane</ForeName></Author>
+                </AuthorList>
+                <ELocationID EIdType="doi">10.1000/one</ELocationID>
+            </Article>
+            <DateCompleted><Year>2021</Year></DateCompleted>
+        </MedlineCitation>
+    </PubmedArticle>
+    <DeleteCitation>
+        <PMID Version="1">33333333</PMID>
+    </DeleteCitation>
+</PubmedArticleSet>"""
+
+
+WORKS = [
+    {"id": "https://openalex.org/W1", "doi": "https://doi.org/10.1000/one", "cited_by_count": 5},
+    {"id": "https://openalex.org/W2", "doi": None, "cited_by_count": 99,
+     "ids": {"pmid": "https://pubmed.ncbi.nlm.nih.gov/22222222"}},
+    {"id": "https://openalex.org/W3", "doi": "https://doi.org/10.1000/THREE", "cited_by_count": 3},
+]
+
+WORKS_UPDATE = [
+    {"id": "https://openalex.org/W1", "doi": "https://doi.org/10.1000/one", "cited_by_count": 8},
+]
+
+
+def write_jsonl_gz(path, works):
+    return write_gz(path, "".join(json.dumps(work) + "\n" for work in works))
+
+
+def write_gz(path, text):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def test_ingest_baseline(tmp_path):
+    """Baseline articles are indexed with author positions."""
+    index = AuthorshipIndex(tmp_path / "index.db")
+    count = index.ingest(write_gz(tmp_path / "pubmed25n0001.xml.gz", BASELINE))
+
+    assert count == 3
+    assert len(index) == 3
+
+    papers = {p.pmid: p for p in index.author_papers("Muller Anna")}
+    assert set(papers) == {"11111111", "22222222", "33333333"}
+    assert papers["11111111"].position == "first"
+    assert papers["11111111"].doi == "10.1000/one"
+    assert papers["22222222"].position is None
+    assert papers["33333333"].position == "last"
+    assert papers["33333333"].year == "2023"
+
+
+def test_author_papers_classify_middle_and_exclude(tmp_path):
+    """Middle positions are reported on request and excluded PMIDs dropped."""
+    index = AuthorshipIndex(tmp_path / "index.db")
+    index.ingest(write_gz(tmp_path / "baseline.xml.gz", BASELINE))
+
+    papers = {p.pmid: p for p in index.author_papers("Müller A", classify_middle=True,
+                                                       exclude={"33333333"})}
+    assert set(papers) == {"11111111", "22222222"}
+    assert papers["22222222"].position == "middle"
+
+
+SAME_INITIAL = """<?xml version="1.0" encoding="UTF-8"?>
+<PubmedArticleSet>
+""" + "".join(f"""
+    <PubmedArticle>
+        <MedlineCitation>
+            <PMID>{pmid}</PMID>
+            <Article>
+                <ArticleTitle>Paper by {fore} Smith</ArticleTitle>
+                <AuthorList>
+                    <Author><LastName>Smith</LastName><ForeName>{fore}</ForeName><Initials>J</Initials></Author>
+                    <Author><LastName>Doe</LastName><ForeName>Bob</ForeName></Author>
+                </AuthorList>
+            </Article>
+        </MedlineCitation>
+    </PubmedArticle>""" for pmid, fore in [("1", "John"), ("2", "Jane"), ("3", "James")]) + """
+</PubmedArticleSet>"""
+
+
+def test_author_papers_same_surname_and_initial(tmp_path):
+    """Authors sharing a surname and first initial do not get each other's papers."""
+    index = AuthorshipIndex(tmp_path / "index.db")
+    index.ingest(write_gz(tmp_path / "baseline.xml.gz", SAME_INITIAL))
+
+    assert [(p.pmid, p.position) for p in index.author_papers("Smith John")] == [("1", "first")]
+    assert [p.pmid for p in index.author_papers("Smith Jane")] == ["2"]
+    assert [p.pmid for p in index.author_papers("Smith J")] == ["1", "2", "3"]
+
+
+def test_ingest_updates_replace_and_delete(tmp_path):
+    """Update files revise articles and apply DeleteCitation entries."""
+    index = AuthorshipIndex(tmp_path / "index.db")
+    ingest_pubmed(index, [
+        write_gz(tmp_path / "baseline.xml.gz", BASELINE),
+        write_gz(tmp_path / "update.xml.gz", UPDATE),
+    ])
+
+    assert len(index) == 2
+    papers = {p.pmid: p for p in index.author_papers("Muller Anna")}
+    assert set(papers) == {"11111111", "22222222"}
+    assert papers["11111111"].title == "First Author Paper (revised)"
+
+
+def test_ingest_plain_xml(tmp_path):
+    """Uncompressed files are accepted too."""
+    path = tmp_path / "baseline.xml"
+    path.write_text(BASELINE, encoding="utf-8")
+    index = AuthorshipIndex(tmp_path / "index.db")
+
+    assert index.ingest(path) == 3
+
+
+def test_pubmed_client_uses_index_without_network(httpx_mock: HTTPXMock, tmp_path):
+    """PubMedClient answers from the index with zero HTTP requests."""
+    index = AuthorshipIndex(tmp_path / "index.db")
+    index.ingest(write_gz(tmp_path / "baseline.xml.gz", BASELINE))
+    client = PubMedClient(index=index)
+
+    papers = client.fetch_author_papers("Müller Anna", since="2024/01/01")
+    client.close()
+
+    assert {p.pmid for p in papers} == {"11111111", "22222222", "33333333"}
+    assert httpx_mock.get_requests() == []
+
+
+def test_cli_ingest_and_compute_offline(httpx_mock: HTTPXMock, tmp_path):
+    """ingest-pubmed builds the index; compute then only calls OpenAlex."""
+    baseline = write_gz(tmp_path / "baseline.xml.gz", BASELINE)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["ingest-pubmed", str(baseline), "--cache-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    assert (tmp_path / "pubmed-index.db").exists()
+
+    httpx_mock.add_response(json={"results": [
+        {"doi": "https://doi.org/10.1000/one", "cited_by_count": 5},
+        {"doi": "https://doi.org/10.1000/three", "cited_by_count": 3},
+    ]})
+    result = runner.invoke(main, [
+        "Muller Anna", "--no-cache", "--cache-dir", str(tmp_path),
+        "--pubmed-index", str(tmp_path / "pubmed-index.db"),
+    ])
+
+    assert result.exit_code == 0
+    assert "U-index: 2" in result.output
+    assert all(r.url.host == "api.openalex.org" for r in httpx_mock.get_requests())
+
+
+def test_citation_index_ingest_and_lookup(tmp_path):
+    """Works with a DOI are indexed; lookups ignore DOI case."""
+    index = CitationIndex(tmp_path / "citations.db")
+    count = index.ingest(write_jsonl_gz(tmp_path / "part_000.gz", WORKS))
+
+    assert count == 3
+    assert len(index) == 2
+    assert index.get_citations_by_dois(["10.1000/ONE", "10.1000/three", "10.1000/missing"]) == {
+        "10.1000/one": 5,
+        "10.1000/three": 3,
+    }
+
+
+def test_citation_index_pmid_lookup(tmp_path):
+    """Works are also indexed by PMID for the DOI-less fallback."""
+    index = CitationIndex(tmp_path / "citations.db")
+    index.ingest(write_jsonl_gz(tmp_path / "part_000.gz", WORKS))
+
+    assert index.get_citations_by_pmids(["22222222", "99999999"]) == {"22222222": 99}
+
+
+def test_citation_index_newer_partition_wins(tmp_path):
+    """Later snapshot partitions overwrite earlier counts."""
+    index = CitationIndex(tmp_path / "citations.db")
+    ingest_openalex(index, [
+        write_jsonl_gz(tmp_path / "old.gz", WORKS),
+        write_jsonl_gz(tmp_path / "new.gz", WORKS_UPDATE),
+    ])
+
+    assert index.get_citations_by_dois(["10.1000/one"]) == {"10.1000/one": 8}
+
+
+def test_citation_index_many_dois(tmp_path):
+    """Lookups beyond one SQL batch are split."""
+    index = CitationIndex(tmp_path / "citations.db")
+    works = [{"doi": f"https://doi.org/10.1/{i}", "cited_by_count": i} for i in range(1200)]
+    index.ingest(write_jsonl_gz(tmp_path / "part.gz", works))
+
+    results = index.get_citations_by_dois([f"10.1/{i}" for i in range(1200)])
+    assert len(results) == 1200
+    assert results["10.1/1199"] == 1199
+
+
+def test_cli_fully_offline(httpx_mock: HTTPXMock, tmp_path):
+    """With both indexes, compute makes no HTTP requests."""
+    runner = CliRunner()
+    result = runner.invoke(main, [
+        "ingest-pubmed", str(write_gz(tmp_path / "baseline.xml.gz", BASELINE)),
+        "--cache-dir", str(tmp_path),
+    ])
+    assert result.exit_code == 0
+    result = runner.invoke(main, [
+        "ingest-openalex", str(write_jsonl_gz(tmp_path / "part_000.gz", WORKS)),
+        "--cache-dir", str(tmp_path),
+    ])
+    assert result.exit_code == 0
+
+    result = runner.invoke(main, [
+        "Muller Anna", "--no-cache", "--cache-dir", str(tmp_path),
+        "--pubmed-index", str(tmp_path / "pubmed-index.db"),
+        "--openalex-index", str(tmp_path / "openalex-index.db"),
+    ])
+
+    assert result.exit_code == 0
+    assert "U-index: 2" in result.output
+    assert httpx_mock.get_requests() == []
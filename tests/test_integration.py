@@ -103,6 +103,8 @@ def test_full_uindex_calculation(httpx_mock: HTTPXMock, tmp_path):
     httpx_mock.add_response(text=ESEARCH_MULTI)
     httpx_mock.add_response(text=EFETCH_MULTI)
     httpx_mock.add_response(json=OPENALEX_MULTI)
+    # PMID fallback for paper 5: not in OpenAlex either
+    httpx_mock.add_response(json={"results": []})
 
     runner = CliRunner()
     result = runner.invoke(main, ["Target Author", "--cache-dir", str(tmp_path)])
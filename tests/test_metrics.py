@@ -0,0 +1,86 @@
+"""Tests for Prometheus-style metrics."""
+
+import pytest
+from pytest_httpx import HTTPXMock
+from uindex.cache import Cache
+from uindex.metrics import (
+    BYTES_PARSED,
+    CACHE_REQUESTS,
+    UPSTREAM_RATE_LIMITED,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+from uindex.openalex import OpenAlexClient
+from uindex.transport import build_transport
+
+
+def test_counter_render():
+    """Counters render with HELP/TYPE headers and labels."""
+    registry = Registry()
+    counter = registry.register(Counter("test_total", "A test counter", ("kind",)))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+
+    text = registry.render()
+    assert "# HELP test_total A test counter" in text
+    assert "# TYPE test_total counter" in text
+    assert 'test_total{kind="a"} 3' in text
+
+
+def test_counter_rejects_wrong_labels():
+    """Label names must match the declared ones."""
+    counter = Counter("test_total", "A test counter", ("kind",))
+    with pytest.raises(ValueError):
+        counter.inc(other="a")
+
+
+def test_histogram_buckets_are_cumulative():
+    """Histogram buckets, sum and count follow the exposition format."""
+    histogram = Histogram("test_seconds", "A test histogram", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    text = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_seconds_sum 5.55" in text
+    assert "test_seconds_count 3" in text
+
+
+def test_gauge_function():
+    """Gauges can be computed when rendered."""
+    gauge = Gauge("test_ratio", "A test gauge")
+    gauge.set_function(lambda: 0.5)
+    assert "test_ratio 0.5" in gauge.render()
+
+
+def test_cache_records_hits_and_misses(tmp_path):
+    """Cache lookups are counted by result."""
+    hits = CACHE_REQUESTS.value(result="hit")
+    misses = CACHE_REQUESTS.value(result="miss")
+
+    cache = Cache(tmp_path / "test.db")
+    cache.get("key1")
+    cache.set("key1", {"data": "value"})
+    cache.get("key1")
+
+    assert CACHE_REQUESTS.value(result="hit") == hits + 1
+    assert CACHE_REQUESTS.value(result="miss") == misses + 1
+
+
+def test_client_records_bytes_and_rate_limits(httpx_mock: HTTPXMock):
+    """Client requests record parsed bytes and 429 responses."""
+    httpx_mock.add_response(status_code=429)
+    httpx_mock.add_response(json={"results": []})
+    parsed = BYTES_PARSED.value(upstream="openalex")
+    limited = UPSTREAM_RATE_LIMITED.value(upstream="openalex")
+
+    client = OpenAlexClient(transport=build_transport("openalex", sleep=lambda s: None))
+    client.get_citations_by_dois(["10.1000/test1"])
+
+    assert BYTES_PARSED.value(upstream="openalex") > parsed
+    assert UPSTREAM_RATE_LIMITED.value(upstream="openalex") == limited + 1
@@ -0,0 +1,54 @@
+"""Tests for author name matching."""
+
+from uindex.names import AuthorNameMatcher, fold, name_tokens
+
+
+def test_fold_strips_diacritics():
+    """Folding lowercases and removes combining marks."""
+    assert fold("Müller") == "muller"
+    assert fold("Ñúñez") == "nunez"
+    assert fold("Smith") == "smith"
+
+
+def test_name_tokens_split_hyphens():
+    """Hyphenated names split into separate tokens."""
+    assert name_tokens("García-López, María") == ["garcia", "lopez", "maria"]
+
+
+def test_exact_match():
+    """Full last and fore name match."""
+    assert AuthorNameMatcher("Smith John").matches("Smith", "John")
+
+
+def test_diacritics_insensitive():
+    """Accented and unaccented spellings match each other."""
+    assert AuthorNameMatcher("Muller Jurgen").matches("Müller", "Jürgen")
+    assert AuthorNameMatcher("Müller Jürgen").matches("Muller", "Jurgen")
+
+
+def test_initials():
+    """Initials in the query or the record match full fore names."""
+    assert AuthorNameMatcher("Smith J").matches("Smith", "John")
+    assert AuthorNameMatcher("Smith John").matches("Smith", "J")
+    assert AuthorNameMatcher("Smith JA").matches("Smith", "John Andrew")
+    assert AuthorNameMatcher("Smith JA").matches("Smith", "John", initials="JA")
+
+
+def test_no_substring_false_matches():
+    """Name parts must match whole tokens, not substrings."""
+    assert not AuthorNameMatcher("Smith John").matches("Smithson", "Johnny")
+    assert not AuthorNameMatcher("Li Wei").matches("Lin", "Weiwei")
+
+
+def test_different_author():
+    """Different names do not match."""
+    assert not AuthorNameMatcher("Smith John").matches("Jones", "Jane")
+    assert not AuthorNameMatcher("Smith J").matches("Smith", "Anna")
+
+
+def test_same_initial_different_fore_name():
+    """A shared first initial does not make a full fore name match another one."""
+    assert not AuthorNameMatcher("Smith John").matches("Smith", "Jane", "J")
+    assert not AuthorNameMatcher("Smith John").matches("Smith", "Jane")
+    assert not AuthorNameMatcher("Smith John").matches("Smith", "James", "J")
+    assert AuthorNameMatcher("Smith John").matches("Smith", "J A", "JA")
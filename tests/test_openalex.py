@@ -1,5 +1,9 @@
 """Tests for OpenAlex API client."""
 
+import threading
+import time
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 from uindex.openalex import OpenAlexClient
@@ -59,3 +63,122 @@ def test_get_citations_batching(httpx_mock: HTTPXMock):
 
     assert len(citations) == 51
     assert citations["10.1000/test50"] == 50
+
+
+def test_get_citations_dedupes_doi_variants(httpx_mock: HTTPXMock):
+    """Spelling variants of one DOI are sent once, in canonical form."""
+    httpx_mock.add_response(json={
+        "results": [{"doi": "https://doi.org/10.1000/abc", "cited_by_count": 3}]
+    })
+
+    client = OpenAlexClient()
+    citations = client.get_citations_by_dois(["10.1000/ABC", "doi:10.1000/abc.", "https://doi.org/10.1000/abc"])
+
+    assert citations == {"10.1000/abc": 3}
+    request = httpx_mock.get_request()
+    assert request.url.params["filter"] == "doi:10.1000/abc"
+
+
+def test_get_citations_by_pmids(httpx_mock: HTTPXMock):
+    """Looks up PMIDs with a pipe-joined ids.pmid filter."""
+    httpx_mock.add_response(json={
+        "results": [
+            {"ids": {"pmid": "https://pubmed.ncbi.nlm.nih.gov/111"}, "cited_by_count": 4},
+            {"ids": {"pmid": "https://pubmed.ncbi.nlm.nih.gov/222"}, "cited_by_count": 9},
+        ]
+    })
+
+    client = OpenAlexClient()
+    citations = client.get_citations_by_pmids(["111", "222", "333", "111"])
+
+    assert citations == {"111": 4, "222": 9}
+    request = httpx_mock.get_request()
+    assert request.url.params["filter"] == "ids.pmid:111|222|333"
+    assert request.url.params["select"] == "ids,cited_by_count"
+
+
+def test_works_follow_cursor_pagination(httpx_mock: HTTPXMock):
+    """Pages are followed until every matching work was seen."""
+    httpx_mock.add_response(json={
+        "meta": {"count": 3, "next_cursor": "page2"},
+        "results": [{"doi": f"https://doi.org/10.1000/p{i}", "cited_by_count": i} for i in (1, 2)],
+    })
+    httpx_mock.add_response(json={
+        "meta": {"count": 3, "next_cursor": "page3"},
+        "results": [{"doi": "https://doi.org/10.1000/p3", "cited_by_count": 3}],
+    })
+
+    client = OpenAlexClient()
+    citations = client.get_citations_by_dois(["10.1000/p1", "10.1000/p2", "10.1000/p3"])
+
+    assert citations == {"10.1000/p1": 1, "10.1000/p2": 2, "10.1000/p3": 3}
+    cursors = [r.url.params["cursor"] for r in httpx_mock.get_requests()]
+    assert cursors == ["*", "page2"]
+
+
+def test_long_dois_split_batches(httpx_mock: HTTPXMock):
+    """Batches are split before the filter overflows the URL."""
+    dois = [f"10.1000/{'x' * 200}.{i}" for i in range(20)]
+    httpx_mock.add_response(json={"results": []}, is_reusable=True)
+
+    client = OpenAlexClient()
+    client.get_citations_by_dois(dois)
+
+    requests = httpx_mock.get_requests()
+    assert len(requests) > 1
+    assert all(len(str(r.url)) <= 2048 for r in requests)
+    sent = [d for r in requests for d in r.url.params["filter"].removeprefix("doi:").split("|")]
+    assert sent == dois
+
+
+def test_dois_with_query_characters_are_encoded(httpx_mock: HTTPXMock):
+    """DOIs containing '#', '&' or ';' reach OpenAlex intact."""
+    dois = ["10.1000/a#b", "10.1000/c&select=x", "10.1002/(sici)1097;2-3"]
+    httpx_mock.add_response(json={"results": [{"doi": "https://doi.org/10.1000/a#b", "cited_by_count": 4}]})
+
+    client = OpenAlexClient()
+    assert client.get_citations_by_dois(dois) == {"10.1000/a#b": 4}
+
+    request = httpx_mock.get_requests()[0]
+    assert request.url.params["filter"] == "doi:" + "|".join(dois)
+    assert request.url.params["select"] == "doi,cited_by_count"
+    assert not request.url.fragment
+
+
+def test_concurrent_identical_batches_share_one_request():
+    """Threads asking for the same DOI batch at once wait on a single request."""
+    started = threading.Event()
+    release = threading.Event()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        started.set()
+        release.wait(timeout=5)
+        return httpx.Response(200, json=OPENALEX_RESPONSE)
+
+    client = OpenAlexClient(transport=httpx.MockTransport(handler))
+    dois = ["10.1000/test1", "10.1000/test2"]
+    results = []
+    leader = threading.Thread(target=lambda: results.append(client.get_citations_by_dois(dois)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(client.get_citations_by_dois(dois)))
+                 for _ in range(3)]
+    for t in followers:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert results == [{"10.1000/test1": 42, "10.1000/test2": 17}] * 4
+    assert len(requests) == 1
+
+
+def test_base_url_override_is_per_client():
+    """A custom base URL applies to its client without changing the class default."""
+    client = OpenAlexClient(base_url="http://127.0.0.1:9000/")
+
+    assert client.base_url == "http://127.0.0.1:9000"
+    assert OpenAlexClient().base_url == OpenAlexClient.BASE_URL == "https://api.openalex.org"
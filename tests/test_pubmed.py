@@ -1,7 +1,13 @@
 """Tests for PubMed API client."""
 
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
+from uindex.names import AuthorNameMatcher
 from uindex.pubmed import PubMedClient
 
 
@@ -64,29 +70,55 @@ def test_fetch_author_papers(httpx_mock: HTTPXMock):
     assert len(papers) == 2
 
     # First paper: Smith is first author
-    assert papers[0]["pmid"] == "12345678"
-    assert papers[0]["title"] == "Test Paper One"
-    assert papers[0]["doi"] == "10.1000/test1"
-    assert papers[0]["position"] == "first"
-    assert papers[0]["year"] == "2023"
+    assert papers[0].pmid == "12345678"
+    assert papers[0].title == "Test Paper One"
+    assert papers[0].doi == "10.1000/test1"
+    assert papers[0].position == "first"
+    assert papers[0].year == "2023"
 
     # Second paper: Smith is last author
-    assert papers[1]["pmid"] == "87654321"
-    assert papers[1]["position"] == "last"
+    assert papers[1].pmid == "87654321"
+    assert papers[1].position == "last"
 
 
 def test_fetch_author_papers_middle_author(httpx_mock: HTTPXMock):
-    """Middle author position is identified."""
+    """Middle author position is identified when requested."""
     httpx_mock.add_response(text=ESEARCH_RESPONSE)
     httpx_mock.add_response(text=EFETCH_RESPONSE)
 
     client = PubMedClient()
-    papers = client.fetch_author_papers("Jones Jane")
+    papers = client.fetch_author_papers("Jones Jane", classify_middle=True)
 
     # Jones is middle author on paper 1, not on paper 2
     assert len(papers) == 2
-    assert papers[0]["position"] == "middle"
-    assert papers[1]["position"] is None  # Not an author
+    assert papers[0].position == "middle"
+    assert papers[1].position is None  # Not an author
+
+
+def test_middle_author_skipped_by_default(httpx_mock: HTTPXMock):
+    """Only first/last positions are resolved unless middle classification is requested."""
+    httpx_mock.add_response(text=ESEARCH_RESPONSE)
+    httpx_mock.add_response(text=EFETCH_RESPONSE)
+
+    client = PubMedClient()
+    papers = client.fetch_author_papers("Jones Jane")
+
+    assert [p.position for p in papers] == [None, None]
+
+
+def test_consortium_paper_positions():
+    """First/last detection on a large author list inspects only the ends."""
+    authors = "".join(
+        f"<Author><LastName>Member{i}</LastName><ForeName>Consortium</ForeName></Author>"
+        for i in range(5000)
+    )
+    article = ET.fromstring(f"<Article><AuthorList>{authors}</AuthorList></Article>")
+
+    client = PubMedClient()
+    assert client._get_author_position(article, AuthorNameMatcher("Member0 Consortium")) == "first"
+    assert client._get_author_position(article, AuthorNameMatcher("Member4999 Consortium")) == "last"
+    assert client._get_author_position(article, AuthorNameMatcher("Member2500 Consortium")) is None
+    assert client._get_author_position(article, AuthorNameMatcher("Member2500 Consortium"), classify_middle=True) == "middle"
 
 
 def test_single_author_paper(httpx_mock: HTTPXMock):
@@ -112,4 +144,86 @@ def test_single_author_paper(httpx_mock: HTTPXMock):
     client = PubMedClient()
     papers = client.fetch_author_papers("Solo Han")
 
-    assert papers[0]["position"] == "first"  # Single author counts as first
+    assert papers[0].position == "first"  # Single author counts as first
+
+
+def test_fetch_author_papers_since(httpx_mock: HTTPXMock):
+    """Incremental fetches filter by Entrez date and skip known PMIDs."""
+    httpx_mock.add_response(
+        url="https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term=Smith%20John%5Bfull%5D&retmax=1000&retmode=xml&datetype=edat&mindate=2024%2F01%2F31&maxdate=3000",
+        text=ESEARCH_RESPONSE,
+    )
+    httpx_mock.add_response(
+        url="https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?db=pubmed&id=87654321&retmode=xml",
+        text=EFETCH_RESPONSE,
+    )
+
+    client = PubMedClient()
+    papers = client.fetch_author_papers("Smith John", since="2024/01/31", exclude={"12345678"})
+
+    # The mocked URLs check the date filter and that only the unknown PMID is fetched
+    assert papers
+
+
+def test_efetch_switches_to_post_for_long_id_lists(httpx_mock: HTTPXMock):
+    """ID lists that would overflow the URL are sent as a POST form body."""
+    pmids = [str(10000000 + i) for i in range(400)]
+    httpx_mock.add_response(method="POST", text=EFETCH_RESPONSE)
+
+    client = PubMedClient()
+    client.EFETCH_BATCH_SIZE = 400
+    papers = client._fetch_papers(pmids, AuthorNameMatcher("Smith John"))
+
+    request = httpx_mock.get_request()
+    assert request.url == "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+    assert b"id=" + ",".join(pmids).encode().replace(b",", b"%2C") in request.content
+    assert len(papers) == 2
+
+
+def test_efetch_short_id_lists_use_get(httpx_mock: HTTPXMock):
+    """Default-sized batches stay GET requests."""
+    httpx_mock.add_response(method="GET", text=EFETCH_RESPONSE)
+
+    client = PubMedClient()
+    client._fetch_papers([str(10000000 + i) for i in range(client.EFETCH_BATCH_SIZE)],
+                         AuthorNameMatcher("Smith John"))
+
+    assert httpx_mock.get_request().method == "GET"
+
+
+def test_concurrent_fetches_for_one_author_share_requests():
+    """Concurrent fetches of one author share esearch and efetch, but not paper records."""
+    gates = {"esearch.fcgi": (threading.Event(), threading.Event()),
+             "efetch.fcgi": (threading.Event(), threading.Event())}
+    requests = []
+
+    def handler(request):
+        endpoint = request.url.path.rsplit("/", 1)[1]
+        requests.append(endpoint)
+        started, release = gates[endpoint]
+        started.set()
+        release.wait(timeout=5)
+        return httpx.Response(200, text=ESEARCH_RESPONSE if endpoint == "esearch.fcgi" else EFETCH_RESPONSE)
+
+    client = PubMedClient(transport=httpx.MockTransport(handler))
+    results = []
+
+    def fetch():
+        results.append(client.fetch_author_papers("Smith John"))
+
+    threads = [threading.Thread(target=fetch)]
+    threads[0].start()
+    for started, release in gates.values():
+        started.wait(timeout=5)
+        if len(threads) == 1:
+            threads += [threading.Thread(target=fetch) for _ in range(3)]
+            for t in threads[1:]:
+                t.start()
+        time.sleep(0.1)
+        release.set()
+    for t in threads:
+        t.join()
+
+    assert requests == ["esearch.fcgi", "efetch.fcgi"]
+    assert all(papers == results[0] for papers in results)
+    assert len({id(papers[0]) for papers in results}) == 4
@@ -0,0 +1,91 @@
+"""Tests for report rendering."""
+
+import csv
+import io
+import json
+
+from uindex.core import PaperRecord, UIndexResult
+from uindex.report import write_report
+
+
+def make_result():
+    qualifying = [
+        PaperRecord(str(i), f"Paper {i}", f"10.1000/{i}", "2020", "first", 10 - i, 100.0) for i in range(5)
+    ]
+    unmatched = [PaperRecord("9", "No DOI", None, "2022", "last")]
+    return UIndexResult("Smith John", 4, 7, 6, 1, qualifying, unmatched, [str(i) for i in range(7)],
+                        100.0, "2024/01/01")
+
+
+def render(format, top=None):
+    out = io.StringIO()
+    write_report(make_result(), out, format, top)
+    return out.getvalue()
+
+
+def test_text_report():
+    """The text report lists every paper with links."""
+    text = render("text")
+
+    assert text.startswith("Author: Smith John\nQualifying papers (first/last author): 6\n\nU-index: 4\n")
+    assert "5. Paper 4\n   Year: 2020 | Position: first author | Citations: 6\n" in text
+    assert "   OpenAlex: https://openalex.org/works/https://doi.org/10.1000/0\n" in text
+    assert "UNMATCHED PAPERS (no citation data)" in text
+    assert "more" not in text
+
+
+def test_text_report_top():
+    """--top cuts the listings but not the summary counts."""
+    text = render("text", top=2)
+
+    assert "Papers with citation data: 5\n" in text
+    assert "2. Paper 1" in text
+    assert "3. Paper 2" not in text
+    assert "... and 3 more\n" in text
+    assert "1. No DOI" in text
+
+
+def test_json_report():
+    """JSON output is the result record, with listings cut to --top."""
+    data = json.loads(render("json", top=1))
+
+    assert data["u_index"] == 4
+    assert data["qualifying_count"] == 6
+    assert [p["pmid"] for p in data["qualifying_papers"]] == ["0"]
+    assert len(data["pmids"]) == 7
+
+
+def test_ndjson_report():
+    """NDJSON output has one object per paper, cited papers first."""
+    lines = [json.loads(line) for line in render("ndjson").splitlines()]
+
+    assert len(lines) == 6
+    assert lines[0] == {"author": "Smith John", "pmid": "0", "title": "Paper 0", "doi": "10.1000/0",
+                        "year": "2020", "position": "first", "citations": 10, "cited_at": 100.0}
+    assert lines[-1]["citations"] is None
+
+
+def test_csv_report():
+    """CSV output has a header and one row per paper, limited by --top."""
+    rows = list(csv.DictReader(io.StringIO(render("csv", top=3))))
+
+    assert [row["pmid"] for row in rows] == ["0", "1", "2", "9"]
+    assert rows[0]["citations"] == "10"
+
+
+def test_large_report_is_written_in_chunks():
+    """Thousands of papers reach the stream in a few large writes."""
+    writes = []
+
+    class Stream(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    papers = [PaperRecord(str(i), f"Paper {i}", f"10.1000/{i}", "2020", "last", i) for i in range(5000)]
+    result = UIndexResult("Smith John", 100, 5000, 5000, 0, papers, [], [], 0.0, "2024/01/01")
+    out = Stream()
+    write_report(result, out, "text")
+
+    assert out.getvalue().count("Citations:") == 5000
+    assert len(writes) < 20
@@ -0,0 +1,197 @@
+"""Tests for the HTTP/JSON service mode."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+
+import httpx
+import pytest
+from uindex.cache import Cache
+from uindex.core import PaperRecord, UIndexResult
+from uindex.server import UIndexServer, UIndexService
+
+
+PAPERS = [
+    PaperRecord("1", "Paper One", "10.1000/p1", "2023", "first"),
+    PaperRecord("2", "Paper Two", "10.1000/p2", "2022", None),
+]
+
+
+@pytest.fixture
+def pubmed(pubmed):
+    pubmed.papers = PAPERS
+    return pubmed
+
+
+@pytest.fixture
+def openalex(openalex):
+    openalex.citations = {"10.1000/p1": 12}
+    return openalex
+
+
+@pytest.fixture
+def server(tmp_path, pubmed, openalex):
+    service = UIndexService(pubmed, openalex, Cache(tmp_path / "cache.db"))
+    server = UIndexServer(("127.0.0.1", 0), service, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def test_get_u_index(server):
+    """GET /u-index returns results for the author."""
+    with urllib.request.urlopen(_url(server, "/u-index?author=Test%20Author")) as response:
+        body = json.load(response)
+
+    assert body["author"] == "Test Author"
+    assert body["u_index"] == 1
+    assert body["qualifying_count"] == 1
+
+
+def test_get_uses_warm_cache(server):
+    """Repeated requests are answered from the cache."""
+    for _ in range(3):
+        urllib.request.urlopen(_url(server, "/u-index?author=Test%20Author")).close()
+
+    assert len(server.service.pubmed.calls) == 1
+
+
+def test_get_missing_author(server):
+    """Missing author parameter is a client error."""
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(_url(server, "/u-index"))
+    assert exc.value.code == 400
+
+
+def test_post_batch(server):
+    """POST /u-index computes a batch of authors."""
+    request = urllib.request.Request(
+        _url(server, "/u-index"),
+        data=json.dumps({"authors": ["One Author", "Two Author"]}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        body = json.load(response)
+
+    assert [r["author"] for r in body["results"]] == ["One Author", "Two Author"]
+
+
+def test_concurrent_requests_coalesced(pubmed, openalex):
+    """Concurrent requests for the same author trigger a single upstream fetch."""
+    gate = pubmed.gate = threading.Event()
+    service = UIndexService(pubmed, openalex, cache=None)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.compute("Test Author")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(pubmed.calls) == 1
+    assert len(results) == 5
+    assert all(r.u_index == 1 for r in results)
+
+
+def test_post_batch_reports_failures_per_author(server, pubmed):
+    """A failing author gets an error entry; the other authors' results are kept."""
+    fetch = pubmed.fetch_author_papers
+
+    def fetch_author_papers(author_name, **kwargs):
+        if author_name == "Down Author":
+            raise httpx.ConnectError("upstream down")
+        if author_name == "Broken Author":
+            raise ET.ParseError("not well-formed")
+        return fetch(author_name, **kwargs)
+
+    pubmed.fetch_author_papers = fetch_author_papers
+    request = urllib.request.Request(
+        _url(server, "/u-index"),
+        data=json.dumps({"authors": ["Down Author", "One Author", "Broken Author"]}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        body = json.load(response)
+
+    down, one, broken = body["results"]
+    assert down == {"author": "Down Author", "error": "upstream request failed: upstream down"}
+    assert one["u_index"] == 1
+    assert broken == {"author": "Broken Author", "error": "internal error: ParseError"}
+
+
+def test_service_caches_result_dict(tmp_path, pubmed, openalex):
+    """The service returns UIndexResults and caches their dict form."""
+    cache = Cache(tmp_path / "cache.db")
+    service = UIndexService(pubmed, openalex, cache)
+
+    fetched = service.compute("Test Author")
+    cached = service.compute("Test Author")
+
+    assert isinstance(fetched, UIndexResult)
+    assert cached == fetched
+    assert cache.get("author:Test Author") == fetched.to_dict()
+    assert len(pubmed.calls) == 1
+
+
+def test_unexpected_error_is_json_500(pubmed, openalex):
+    """Errors other than upstream HTTP failures still get a JSON response."""
+
+    def fetch_author_papers(author_name):
+        raise ET.ParseError("not well-formed")
+
+    pubmed.fetch_author_papers = fetch_author_papers
+    server = UIndexServer(("127.0.0.1", 0), UIndexService(pubmed, openalex), quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(_url(server, "/u-index?author=Test%20Author"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert exc.value.code == 500
+    assert json.load(exc.value) == {"error": "internal error: ParseError"}
+
+
+def test_full_refresh_not_coalesced_with_incremental(pubmed, openalex):
+    """A full refresh does not settle for an incremental refresh already in flight."""
+    gate = pubmed.gate = threading.Event()
+    service = UIndexService(pubmed, openalex, cache=None)
+
+    threads = [
+        threading.Thread(target=service.compute, args=("Test Author",), kwargs={"refresh": True}),
+        threading.Thread(target=service.compute, args=("Test Author",), kwargs={"full_refresh": True}),
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(pubmed.calls) == 2
+
+
+def test_metrics_endpoint(server):
+    """GET /metrics exposes Prometheus text."""
+    urllib.request.urlopen(_url(server, "/u-index?author=Test%20Author")).close()
+    with urllib.request.urlopen(_url(server, "/metrics")) as response:
+        text = response.read().decode()
+
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert "# TYPE uindex_authors_computed_total counter" in text
+    assert "uindex_server_in_flight_requests" in text
@@ -0,0 +1,87 @@
+"""Tests for single-flight call coalescing."""
+
+import threading
+import time
+
+import pytest
+from uindex.singleflight import SingleFlight
+
+
+def test_sequential_calls_run_each_time():
+    """Calls that do not overlap are not coalesced."""
+    flight = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do("key", lambda: next(counter)) == 0
+    assert flight.do("key", lambda: next(counter)) == 1
+
+
+def test_error_propagates_to_caller():
+    """Exceptions from the call are raised to the caller."""
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_concurrent_calls_share_result():
+    """Overlapping calls for one key share a single execution."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+        for _ in range(3)
+    ]
+    for t in followers:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_share_applies_to_waiters_only():
+    """Waiters get share(result); the leading caller gets the result itself."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    value = ["paper"]
+
+    def slow():
+        started.set()
+        release.wait(timeout=5)
+        return value
+
+    results = {}
+    leader = threading.Thread(target=lambda: results.update(leader=flight.do("key", slow, share=list)))
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=lambda: results.update(follower=flight.do("key", slow, share=list)))
+    follower.start()
+    time.sleep(0.1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results["leader"] is value
+    assert results["follower"] == value
+    assert results["follower"] is not value
@@ -0,0 +1,144 @@
+"""Tests for the local PubMed/OpenAlex stand-in server."""
+
+import threading
+import time
+
+import httpx
+import pytest
+from click.testing import CliRunner
+from uindex.cli import main
+from uindex.core import compute_author
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from uindex.corpus import Corpus
+from uindex.standin import StandInServer, TokenBucket
+from uindex.transport import build_transport
+
+
+def build_corpus():
+    corpus = Corpus()
+    corpus.add("101", "Lead paper", [("Smith", "John"), ("Doe", "Jane")], "10.1000/a", "2020", 10)
+    corpus.add("102", "Senior paper", [("Doe", "Jane"), ("Smith", "John")], "10.1000/B", "2021", 4)
+    corpus.add("103", "Middle paper", [("Doe", "Jane"), ("Smith", "John"), ("Roe", "Rick")],
+               "10.1000/c", "2022", 50)
+    corpus.add("104", "No DOI paper", [("Smith", "John")], None, "2023", 3)
+    corpus.add("105", "Someone else", [("Smith", "Anna")], "10.1000/e", "2023", 99)
+    return corpus
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(corpus=None, **kwargs):
+        server = StandInServer(("127.0.0.1", 0), corpus or build_corpus(), **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_compute_author_against_standin(start_server):
+    """Clients pointed at the stand-in compute a U-index end to end."""
+    server = start_server()
+    pubmed = PubMedClient(base_url=server.pubmed_url)
+    openalex = OpenAlexClient(base_url=server.openalex_url)
+
+    results = compute_author("Smith John", pubmed, openalex)
+
+    assert results.total_papers == 4
+    assert [p.citations for p in results.qualifying_papers] == [10, 4, 3]
+    assert results.u_index == 3
+    assert server.requests["esearch.fcgi", 200] == 1
+    assert server.requests["efetch.fcgi", 200] == 1
+    # DOI pass, then the PMID fallback for the DOI-less paper
+    assert server.requests["works", 200] == 2
+    pubmed.close()
+    openalex.close()
+
+
+def test_efetch_post(start_server):
+    """efetch accepts the ID list as a POST form body."""
+    server = start_server()
+    response = httpx.post(f"{server.pubmed_url}/efetch.fcgi", data={"db": "pubmed", "id": "101,104"})
+
+    assert response.text.count("<PubmedArticle>") == 2
+
+
+def test_works_pagination(start_server):
+    """/works pages through results with a cursor."""
+    server = start_server()
+    url = f"{server.openalex_url}/works?filter=ids.pmid:101|102|103&per-page=2"
+
+    first = httpx.get(f"{url}&cursor=*").json()
+    second = httpx.get(f"{url}&cursor={first['meta']['next_cursor']}").json()
+
+    assert first["meta"]["count"] == 3
+    assert len(first["results"]) == 2
+    assert len(second["results"]) == 1
+
+
+def test_error_rate(start_server):
+    """Injected 503s reach the client once retries are exhausted."""
+    server = start_server(error_rate=1.0)
+    client = OpenAlexClient(base_url=server.openalex_url,
+                            transport=build_transport("openalex", max_retries=0))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_citations_by_dois(["10.1000/a"])
+    assert server.requests["works", 503] == 1
+    client.close()
+
+
+def test_rate_limit_is_retried(start_server):
+    """429s with Retry-After are absorbed by the retrying transport."""
+    server = start_server(rate_limit=2)
+    delays = []
+
+    def sleep(seconds):
+        delays.append(seconds)
+        time.sleep(seconds)
+
+    client = OpenAlexClient(base_url=server.openalex_url, transport=build_transport("openalex", sleep=sleep))
+    for _ in range(3):
+        assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 10}
+
+    assert server.requests["works", 429] >= 1
+    assert delays and all(d == 1.0 for d in delays)
+    client.close()
+
+
+def test_latency(start_server):
+    """Every request is delayed by the configured latency."""
+    server = start_server(latency=0.05)
+    start = time.perf_counter()
+    httpx.get(f"{server.pubmed_url}/esearch.fcgi?db=pubmed&term=Smith%20John%5Bfull%5D")
+
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_token_bucket():
+    """The bucket allows bursts up to the rate and refills over time."""
+    now = [0.0]
+    bucket = TokenBucket(2, clock=lambda: now[0])
+
+    assert [bucket.take() for _ in range(3)] == [True, True, False]
+    now[0] = 0.5
+    assert bucket.take() is True
+    assert bucket.take() is False
+
+
+def test_cli_uses_standin_urls_from_environment(start_server, monkeypatch, tmp_path):
+    """UINDEX_PUBMED_URL and UINDEX_OPENALEX_URL point the CLI at the stand-in."""
+    server = start_server()
+    monkeypatch.setenv("UINDEX_PUBMED_URL", server.pubmed_url)
+    monkeypatch.setenv("UINDEX_OPENALEX_URL", server.openalex_url)
+
+    result = CliRunner().invoke(main, ["Smith John", "--no-cache", "--cache-dir", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert "U-index: 3" in result.output
@@ -0,0 +1,152 @@
+"""Tests for the normalized SQLite result store."""
+
+import sqlite3
+import time
+
+from uindex.api import UIndexSession
+from uindex.cache import Cache
+from uindex.core import PaperRecord, UIndexResult
+from uindex.store import ResultStore
+
+
+def test_save_load_round_trip(tmp_path, make_result):
+    """Stored results load back unchanged, PMIDs in their original order."""
+    store = ResultStore(tmp_path / "store.db")
+    result = make_result()
+    store.save(result)
+
+    assert store.load("Smith John") == result
+    assert store.load("Doe Jane") is None
+    assert len(store) == 1
+
+
+def test_save_replaces_author(tmp_path, make_result):
+    """Saving an author again replaces their metrics and authorships."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result())
+    newer = UIndexResult("Smith John", 1, 1, 1, 0, [PaperRecord("2", "Less cited", "10.1000/b", "2021", "last", 3, 200.0)],
+                         [], ["2"], 200.0, "2024/02/01")
+    store.save(newer)
+
+    assert store.load("Smith John") == newer
+    assert len(store) == 1
+
+
+def test_coauthors_share_papers(tmp_path, make_result):
+    """A co-author listing a paper by PMID only keeps the stored details."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result())
+    store.save(UIndexResult("Doe Jane", 0, 1, 0, 0, [], [], ["1"], 100.0, "2024/01/01"))
+
+    with sqlite3.connect(tmp_path / "store.db") as conn:
+        assert conn.execute("SELECT title, doi FROM papers WHERE pmid = '1'").fetchone() == \
+            ("Most cited", "10.1000/a")
+        assert conn.execute("SELECT COUNT(*) FROM authorships WHERE pmid = '1'").fetchone()[0] == 2
+
+
+def test_older_citations_do_not_overwrite(tmp_path, make_result):
+    """Citation counts are only replaced by more recently fetched ones."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result())
+    stale = UIndexResult("Doe Jane", 1, 1, 1, 0, [PaperRecord("1", "Most cited", "10.1000/a", "2020", "last", 1, 50.0)],
+                         [], ["1"], 50.0, "2023/01/01")
+    store.save(stale)
+
+    assert store.load("Doe Jane").qualifying_papers[0].citations == 9
+
+
+def test_merge_from_keeps_newest(tmp_path, make_result):
+    """Merging keeps the newest result per author and the newest count per PMID."""
+    store = ResultStore(tmp_path / "main.db")
+    store.save(make_result())
+    store.save(make_result("Doe Jane"))
+    shard = ResultStore(tmp_path / "shard.db")
+    newer = UIndexResult("Smith John", 3, 4, 3, 0, [
+        PaperRecord("1", "Most cited", "10.1000/a", "2020", "first", 9, 100.0),
+        PaperRecord("2", "Less cited", "10.1000/b", "2021", "last", 5, 200.0),
+        PaperRecord("3", "No DOI", None, "2022", "first", 4, 200.0),
+    ], [], ["4", "3", "2", "1"], 200.0, "2024/02/01")
+    shard.save(newer)
+    shard.save(make_result("Doe Jane", u_index=0, created_at=50.0))
+    shard.save(make_result("Roe Richard"))
+
+    assert store.merge_from(shard.db_path) == 2
+    assert store.load("Smith John") == newer
+    assert store.load("Roe Richard") is not None
+    # The older shard result is dropped, but the newer shared counts are recomputed into it
+    doe = store.load("Doe Jane")
+    assert (doe.created_at, doe.u_index, doe.unmatched_count) == (100.0, 3, 0)
+    assert store.merge_from(shard.db_path) == 0
+
+
+def test_merge_from_cache_without_store(tmp_path):
+    """Cache databases without store tables merge nothing."""
+    Cache(tmp_path / "old.db").set("author:A", {"u_index": 3})
+    store = ResultStore(tmp_path / "main.db")
+
+    assert store.merge_from(tmp_path / "old.db") == 0
+    assert len(store) == 0
+
+
+def test_cohort(tmp_path, make_result):
+    """cohort filters and orders author_metrics rows with bound parameters."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result())
+    store.save(make_result("Doe Jane", u_index=0))
+
+    rows = store.cohort("u_index >= ?", (1,))
+    assert [row["name"] for row in rows] == ["Smith John"]
+    assert rows[0]["leadership_share"] == 0.75
+    assert rows[0]["cited_papers"] == 2
+    assert rows[0]["total_citations"] == 11
+    assert rows[0]["max_citations"] == 9
+    assert [row["name"] for row in store.cohort(order_by="u_index")] == ["Doe Jane", "Smith John"]
+
+
+def test_stale_pmids(tmp_path, make_result):
+    """Missing or old citation counts of first/last-author papers are stale."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result(created_at=time.time()))
+
+    # "1" and "2" were fetched at t=100, "3" has no count, "4" is a middle-author paper
+    assert sorted(store.stale_pmids(3600)) == ["1", "2", "3"]
+    store.update_citations({"1": 9, "2": 2})
+    assert store.stale_pmids(3600) == ["3"]
+
+
+def test_update_citations_recomputes_u_index(tmp_path, make_result):
+    """New counts recompute U-index and unmatched counts in SQL."""
+    store = ResultStore(tmp_path / "store.db")
+    store.save(make_result())
+    store.save(make_result("Doe Jane"))
+
+    assert store.update_citations({"2": 5, "3": 4}, fetched_at=300.0) == 2
+
+    result = store.load("Smith John")
+    assert result.u_index == 3
+    assert result.unmatched_count == 0
+    assert [p.citations for p in result.qualifying_papers] == [9, 5, 4]
+    assert store.update_citations({"4": 1}) == 0
+
+
+def test_session_writes_through(tmp_path, pubmed, openalex):
+    """Sessions store computed results next to the cache."""
+    with UIndexSession(tmp_path, pubmed=pubmed, openalex=openalex) as session:
+        result = session.compute("Smith John")
+
+    assert session.store.load("Smith John") == result
+    assert Cache(tmp_path / "cache.db").get("author:Smith John") is not None
+
+
+def test_newer_coauthor_counts_update_earlier_authors(tmp_path):
+    """Saving a co-author with newer shared counts recomputes authors stored earlier."""
+    store = ResultStore(tmp_path / "store.db")
+    papers = [PaperRecord(str(i), f"Paper {i}", f"10.1000/{i}", "2020", "first", 5, 100.0) for i in range(3)]
+    store.save(UIndexResult("Smith John", 3, 3, 3, 0, papers, [], ["0", "1", "2"], 100.0, "2024/01/01"))
+    newer = [PaperRecord(str(i), f"Paper {i}", f"10.1000/{i}", "2020", "last", 0, 200.0) for i in range(3)]
+    store.save(UIndexResult("Doe Jane", 0, 3, 3, 0, newer, [], ["0", "1", "2"], 200.0, "2024/02/01"))
+
+    row = store.cohort("name = ?", ("Smith John",))[0]
+    assert row["u_index"] == 0
+    assert row["total_citations"] == 0
+    assert store.load("Smith John").u_index == 0
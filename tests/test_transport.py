@@ -0,0 +1,157 @@
+"""Tests for the retrying, circuit-breaking HTTP transport."""
+
+import importlib.util
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from uindex.openalex import OpenAlexClient
+from uindex.pubmed import PubMedClient
+from click.testing import CliRunner
+from uindex.cli import main
+from uindex.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    build_transport,
+    connection_pool,
+    split_batches,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_retries_server_errors(httpx_mock: HTTPXMock):
+    """503 responses are retried until the request succeeds."""
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(json={"results": [{"doi": "https://doi.org/10.1000/a", "cited_by_count": 3}]})
+    delays = []
+
+    client = OpenAlexClient(transport=build_transport("openalex", sleep=delays.append))
+    assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 3}
+    assert len(delays) == 2
+    assert all(0 <= d <= 1.0 for d in delays)
+
+
+def test_honors_retry_after(httpx_mock: HTTPXMock):
+    """The Retry-After header sets the delay before retrying a 429."""
+    httpx_mock.add_response(status_code=429, headers={"Retry-After": "7"})
+    httpx_mock.add_response(text="<eSearchResult><IdList></IdList></eSearchResult>")
+    delays = []
+
+    client = PubMedClient(transport=build_transport("pubmed", sleep=delays.append))
+    assert client.fetch_author_papers("Smith John") == []
+    assert delays == [7.0]
+
+
+def test_gives_up_after_max_retries(httpx_mock: HTTPXMock):
+    """The final error response is returned once retries are exhausted."""
+    for _ in range(3):
+        httpx_mock.add_response(status_code=503)
+
+    client = OpenAlexClient(transport=build_transport("openalex", max_retries=2, sleep=lambda s: None))
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_citations_by_dois(["10.1000/a"])
+
+
+def test_circuit_opens_and_fails_fast(httpx_mock: HTTPXMock):
+    """An open circuit rejects requests without contacting the upstream."""
+    for _ in range(2):
+        httpx_mock.add_response(status_code=503)
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    client = OpenAlexClient(transport=build_transport(
+        "openalex", max_retries=1, circuit_breaker=breaker, sleep=lambda s: None))
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_citations_by_dois(["10.1000/a"])
+
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        client.get_citations_by_dois(["10.1000/a"])
+
+
+def test_circuit_half_open_trial():
+    """After the reset timeout one trial request decides the circuit state."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    request = httpx.Request("GET", "https://api.openalex.org/works")
+
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(request)
+
+    clock.now = 10
+    breaker.before_request(request)  # trial allowed
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(request)  # only one trial at a time
+
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_request(request)
+
+
+def test_circuit_recovers_after_throttled_trial(httpx_mock: HTTPXMock):
+    """A 429 on the half-open trial re-opens the circuit instead of wedging it."""
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(status_code=429)
+    httpx_mock.add_response(json={"results": [{"doi": "https://doi.org/10.1000/a", "cited_by_count": 3}]})
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    client = OpenAlexClient(transport=build_transport(
+        "openalex", max_retries=0, circuit_breaker=breaker, sleep=lambda s: None))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_citations_by_dois(["10.1000/a"])
+    clock.now = 10
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_citations_by_dois(["10.1000/a"])  # throttled trial
+    assert breaker.is_open
+
+    clock.now = 20
+    assert client.get_citations_by_dois(["10.1000/a"]) == {"10.1000/a": 3}
+    assert not breaker.is_open
+
+
+def test_clients_share_one_pool_and_request_gzip(httpx_mock: HTTPXMock):
+    """Both clients can send through one pool, asking for gzip explicitly."""
+    httpx_mock.add_response(text="<eSearchResult><IdList></IdList></eSearchResult>")
+    httpx_mock.add_response(json={"results": []})
+    pool = connection_pool(max_connections=4)
+
+    pubmed = PubMedClient(transport=build_transport("pubmed", pool=pool))
+    openalex = OpenAlexClient(transport=build_transport("openalex", pool=pool))
+    pubmed.fetch_author_papers("Smith John")
+    openalex.get_citations_by_dois(["10.1000/a"])
+
+    assert pubmed.client._transport.transport.transport is pool
+    assert openalex.client._transport.transport.transport is pool
+    assert [r.headers["Accept-Encoding"] for r in httpx_mock.get_requests()] == ["gzip", "gzip"]
+    pubmed.close()
+    openalex.close()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_without_h2_is_a_usage_error(tmp_path):
+    """--http2 explains how to install the optional dependency."""
+    authors = tmp_path / "authors.txt"
+    authors.write_text("Smith John\n")
+
+    result = CliRunner().invoke(main, ["batch", str(authors), "--http2", "--cache-dir", str(tmp_path)])
+
+    assert result.exit_code == 2
+    assert "uindex[http2]" in result.output
+
+
+def test_split_batches_by_count_and_length():
+    """Batches respect both the item limit and the encoded length limit."""
+    assert list(split_batches(["a", "b", "c"], max_items=2, max_length=100)) == [["a", "b"], ["c"]]
+    # "aaaa|bbbb" encodes to 4 + 3 + 4 characters
+    assert list(split_batches(["aaaa", "bbbb", "cccc"], max_items=10, max_length=11)) == [
+        ["aaaa", "bbbb"], ["cccc"]]
+    assert list(split_batches(["a" * 50, "b"], max_items=10, max_length=10)) == [["a" * 50], ["b"]]